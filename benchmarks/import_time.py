@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Measure how long it takes to import the extension, or some of its modules,
+in a fresh interpreter using `python -X importtime`.
+
+    $ python benchmarks/import_time.py
+    $ python benchmarks/import_time.py chaosgcp chaosgcp.compute.actions
+    $ python benchmarks/import_time.py --discover --top 20
+
+Each module is imported `--runs` times in a new process and the median of
+its cumulative import time is reported, along with the heaviest modules it
+imports directly. With `--discover`, the time to run `chaosgcp.discover()`
+is reported as well, since `chaos discover` imports every activity module.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+DISCOVER_SNIPPET = (
+    "import time; import chaosgcp; s = time.perf_counter(); "
+    "chaosgcp.discover(); print(time.perf_counter() - s)"
+)
+
+
+def import_times(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import `module` in a new interpreter and return its cumulative import
+    time along with the cumulative time of each of the modules it directly
+    imported, all in microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # children are reported before their parent, one level deeper
+    entries: List[Tuple[int, str, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            # header line
+            continue
+        depth = len(name) - len(name.lstrip())
+        entries.append((depth, name.strip(), int(cumulative)))
+
+    for index, (depth, name, cumulative) in enumerate(entries):
+        if name != module:
+            continue
+
+        children = {}
+        for child_depth, child, child_cumulative in reversed(entries[:index]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 2:
+                children[child] = child_cumulative
+        return cumulative, children
+
+    # already imported by the interpreter at startup
+    return 0, {}
+
+
+def discover_time() -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", DISCOVER_SNIPPET],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def report(module: str, runs: int, top: int) -> None:
+    totals: List[int] = []
+    heaviest: Dict[str, List[int]] = {}
+
+    for _ in range(runs):
+        total, modules = import_times(module)
+        totals.append(total)
+        for name, cumulative in modules.items():
+            heaviest.setdefault(name, []).append(cumulative)
+
+    print(f"{module}: {statistics.median(totals) / 1000:.1f}ms")
+
+    ranked = sorted(
+        ((statistics.median(v), k) for k, v in heaviest.items()),
+        reverse=True,
+    )
+    for cumulative, name in ranked[:top]:
+        print(f"    {name:<40} {cumulative / 1000:>8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=["chaosgcp"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--discover", action="store_true")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, args.runs, args.top)
+
+    if args.discover:
+        started = time.perf_counter()
+        timings = [discover_time() for _ in range(args.runs)]
+        print(f"chaosgcp.discover(): {statistics.median(timings) * 1000:.1f}ms")
+        print(f"(benchmark ran in {time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Compare `chaosgcp.parse_interval` with parsing the same values through
+`dateparser`, as it used to be done.
+
+    $ python benchmarks/parse_interval.py
+    $ python benchmarks/parse_interval.py --number 2000
+"""
+
+import argparse
+import timeit
+
+import dateparser
+
+from chaosgcp import parse_interval
+
+CASES = [
+    ("now", "1h"),
+    ("now", "5 minutes"),
+    ("now", "300s"),
+    ("2024-05-01T12:00:00Z", "15 minutes"),
+    ("2024-05-01T12:00:00+02:00", "2 hours"),
+]
+
+
+def dateparser_interval(end_time: str, window: str) -> None:
+    end = dateparser.parse(
+        end_time, settings={"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True}
+    )
+    dateparser.parse(
+        window,
+        settings={
+            "TIMEZONE": "UTC",
+            "RELATIVE_BASE": end,
+            "RETURN_AS_TIMEZONE_AWARE": True,
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    # the first call to dateparser loads its locale data, do not count it
+    dateparser_interval("now", "1h")
+
+    print(
+        f"{'end time':<28} {'window':<12} {'dateparser':>12} {'chaosgcp':>12}"
+    )
+    for end_time, window in CASES:
+        slow = timeit.timeit(
+            lambda: dateparser_interval(end_time, window), number=args.number
+        )
+        fast = timeit.timeit(
+            lambda: parse_interval(end_time, window), number=args.number
+        )
+        print(
+            f"{end_time:<28} {window:<12} "
+            f"{slow / args.number * 1e6:>10.1f}us "
+            f"{fast / args.number * 1e6:>10.1f}us "
+            f"(x{slow / fast:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
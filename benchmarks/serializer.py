@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Compare `chaosgcp.serializer.to_dict` with proto-plus' `Message.to_dict` on
+a time series and a URL map of the given sizes.
+
+    $ python benchmarks/serializer.py
+    $ python benchmarks/serializer.py --points 5000 --rules 1000
+"""
+
+import argparse
+import json
+import timeit
+
+from google.cloud import compute_v1, monitoring_v3
+
+from chaosgcp.serializer import to_dict
+
+
+def time_series(points: int) -> monitoring_v3.TimeSeries:
+    return monitoring_v3.TimeSeries(
+        metric={"type": "loadbalancing.googleapis.com/https/request_count"},
+        resource={"type": "https_lb_rule", "labels": {"url_map_name": "m"}},
+        points=[
+            monitoring_v3.Point(
+                interval={
+                    "start_time": {"seconds": 1714560000 + i * 60},
+                    "end_time": {"seconds": 1714560060 + i * 60},
+                },
+                value={"int64_value": i},
+            )
+            for i in range(points)
+        ],
+    )
+
+
+def url_map(rules: int) -> compute_v1.UrlMap:
+    return compute_v1.UrlMap(
+        name="m",
+        default_service="svc",
+        path_matchers=[
+            compute_v1.PathMatcher(
+                name="pm",
+                path_rules=[
+                    compute_v1.PathRule(paths=[f"/p{i}"], service="svc")
+                    for i in range(rules)
+                ],
+            )
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--points", type=int, default=1440)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        ("time series", time_series(args.points), ["points.value"]),
+        ("url map", url_map(args.rules), ["path_matchers.path_rules.paths"]),
+    ]
+
+    for label, message, fields in cases:
+        variants = [
+            ("proto-plus", lambda: type(message).to_dict(message)),
+            ("chaosgcp", lambda: to_dict(message)),
+            ("omit_defaults", lambda: to_dict(message, omit_defaults=True)),
+            (f"fields={fields}", lambda: to_dict(message, fields=fields)),
+        ]
+
+        print(label)
+        baseline = None
+        for name, func in variants:
+            elapsed = timeit.timeit(func, number=args.number) / args.number
+            baseline = baseline or elapsed
+            size = len(json.dumps(func()))
+            print(
+                f"    {name:<45} {elapsed * 1000:>8.2f}ms "
+                f"(x{baseline / elapsed:.1f}) {size:>9} bytes"
+            )
+
+
+if __name__ == "__main__":
+    main()
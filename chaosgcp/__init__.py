@@ -1,18 +1,15 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import importlib
+import json
 import logging
 import os.path
-import time
+import sys
 from datetime import datetime
 from importlib.metadata import version, PackageNotFoundError
-from typing import Any, Dict, List, Optional, Tuple
-
-import dateparser
-import httplib2
-from chaoslib.discovery.discover import (
-    discover_actions,
-    discover_probes,
-    initialize_discovery_result,
-)
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from chaoslib.discovery.discover import initialize_discovery_result
 from chaoslib.exceptions import ActivityFailed, FailedActivity
 from chaoslib.types import (
     Configuration,
@@ -20,12 +17,30 @@ from chaoslib.types import (
     Discovery,
     Secrets,
 )
-from google.api_core.extended_operation import ExtendedOperation
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import Resource, build
-
+from chaosgcp.auth import credentials_cache
+from chaosgcp.discovery_cache import (
+    get_discovery_cache,
+    get_static_discovery,
+    resource_cache,
+)
+from chaosgcp.instrumentation import AUTH, CLIENT, span
+from chaosgcp.interval import parse_datetime
+from chaosgcp.operations import (
+    OperationTimeout,
+    Waiter,
+    discovery_operation_poller,
+    extended_operation_poller,
+)
+from chaosgcp.ratelimit import request_class
+from chaosgcp.replay import wrap_http
+from chaosgcp.transport import get_http, get_transport_settings, scoped
 from chaosgcp.types import GCPContext
 
+if TYPE_CHECKING:
+    from google.api_core.extended_operation import ExtendedOperation
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import Resource
+
 __all__ = [
     "__version__",
     "client",
@@ -48,17 +63,44 @@ try:
 except PackageNotFoundError:
     __version__ = "unknown"
 
+# heavy dependencies are only imported the first time they are accessed, so
+# that importing the extension does not pay for the services it never uses
+LAZY_ATTRIBUTES = {
+    "Credentials": ("google.oauth2.service_account", "Credentials"),
+    "build": ("googleapiclient.discovery", "build"),
+    "Resource": ("googleapiclient.discovery", "Resource"),
+    "ExtendedOperation": (
+        "google.api_core.extended_operation",
+        "ExtendedOperation",
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    module_name, attr = LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
 
 def get_service(
     service_name: str,
     version: str = "v1",
     configuration: Configuration = None,
     secrets: Secrets = None,
-) -> Resource:
+) -> "Resource":
     """
     Create a client for the given service/version couple.
     """
-    return client(service_name, version=version, secrets=secrets)
+    return client(
+        service_name,
+        version=version,
+        secrets=secrets,
+        configuration=configuration,
+    )
 
 
 def get_context(
@@ -107,51 +149,69 @@ def context_from_parent_path(parent: str) -> GCPContext:
 
 
 def wait_on_operation(
-    operation_service: Any, frequency: int = 1, **kwargs: Dict
+    operation_service: Any,
+    frequency: int = 1,
+    max_frequency: int = 30,
+    deadline: Optional[int] = None,
+    long_poll: bool = False,
+    **kwargs: Dict,
 ) -> Dict[str, Any]:
     """
     Wait until the given operation is completed and return the result.
-    """
-    while True:
-        logger.debug(
-            "Waiting for operation '{}'".format(
-                kwargs.get("operationId", kwargs.get("operation"))
-            )
-        )
 
-        result = operation_service.get(**kwargs).execute()
+    The operation is first polled after `frequency` seconds and then with
+    an exponential backoff, up to every `max_frequency` seconds. When
+    `deadline` is set, `chaosgcp.operations.OperationTimeout` is raised
+    once that many seconds have elapsed.
 
-        if result["status"] == "DONE":
-            return result
-
-        time.sleep(frequency)
+    Set `long_poll` when the API offers a `wait` method on its operations,
+    like compute does, so the server holds each request until the operation
+    completes.
+    """
+    name = kwargs.get("operationId", kwargs.get("operation"))
+    waiter = Waiter(
+        initial_delay=frequency, max_delay=max_frequency, deadline=deadline
+    )
+    poll = discovery_operation_poller(
+        operation_service, long_poll=long_poll, **kwargs
+    )
+    return waiter.wait(poll, name=name)
 
 
 def wait_on_extended_operation(
-    operation: ExtendedOperation, frequency: int = 1, timeout: int = 60
+    operation: "ExtendedOperation",
+    frequency: int = 1,
+    timeout: int = 60,
+    max_frequency: int = 10,
+    long_poll: bool = False,
 ) -> None:
+    """
+    Wait until the given extended operation is completed. It is cancelled
+    when `timeout` seconds have elapsed.
+
+    Polling uses an exponential backoff from `frequency` up to
+    `max_frequency` seconds. With `long_poll`, compute operations are
+    awaited through their `wait` endpoint instead, falling back to polling
+    should `google-api-core` internals it relies on change.
+    """
     # note that extended operations return nothing and set theyr result payload
     # to None
-    start = time.time()
-
-    while True:
-        logger.debug(
-            "Waiting for extended operation '{}'".format(operation.name)
-        )
-
-        if operation.done():
-            logger.debug(f"Extended operation '{operation.name}' is done")
-            return None
+    waiter = Waiter(
+        initial_delay=frequency, max_delay=max_frequency, deadline=timeout
+    )
+    poll = extended_operation_poller(operation, long_poll=long_poll)
 
-        time.sleep(frequency)
+    try:
+        waiter.wait(poll, name=operation.name)
+        logger.debug(f"Extended operation '{operation.name}' is done")
+    except OperationTimeout:
+        logger.debug(f"Cancelling extended operation '{operation.name}'")
+        operation.cancel()
 
-        if (start + timeout) < time.time():
-            logger.debug(f"Cancelling extended operation '{operation.name}'")
-            operation.cancel()
-            return None
+    return None
 
 
-def load_credentials(secrets: Secrets = None) -> Optional[Credentials]:
+def load_credentials(secrets: Secrets = None) -> Optional["Credentials"]:
     """
     Load GCP credentials from the experiment secrets. When no credentials could
     be located, this returns `None` so that the GCP client underneath can
@@ -198,6 +258,14 @@ def load_credentials(secrets: Secrets = None) -> Optional[Credentials]:
     Make sure your service account has enough permissions for the activities
     you wish to conduct (though do not give it too wide permissions either).
 
+    Credentials are cached for the lifetime of the process, keyed on the
+    service account file path and modification time, or on the content of
+    the service account info. All activities therefore share the same
+    credentials, and their access token, which is refreshed in the background
+    shortly before it expires. See `chaosgcp.auth`. They are scoped before
+    being cached so that clients and pooled transports use them as-is,
+    rather than scoped copies the background refresh would not reach.
+
     See: https://developers.google.com/api-client-library/python/auth/service-accounts
     Also: http://google-auth.readthedocs.io/en/latest/reference/google.oauth2.service_account.html
     """  # noqa: E501
@@ -226,30 +294,96 @@ def load_credentials(secrets: Secrets = None) -> Optional[Credentials]:
         logger.debug(
             "Using GCP credentials from file: {}".format(service_account_file)
         )
-        credentials = Credentials.from_service_account_file(
-            service_account_file
+        stat = os.stat(service_account_file)
+        key = (
+            "file",
+            os.path.abspath(service_account_file),
+            stat.st_mtime_ns,
+            stat.st_size,
         )
+        credentials_cls = lazy("Credentials")
+        with span("auth.load_credentials", AUTH):
+            credentials = credentials_cache.get(
+                key,
+                lambda: scoped(
+                    credentials_cls.from_service_account_file(
+                        service_account_file
+                    )
+                ),
+            )
     elif service_account_info and isinstance(service_account_info, dict):
         logger.debug("Using GCP credentials embedded into secrets")
-        credentials = Credentials.from_service_account_info(
-            service_account_info
-        )
-
-    if credentials is not None and credentials.expired:
-        logger.debug("GCP credentials need to be refreshed as they expired")
-        credentials.refresh(httplib2.Http())
+        digest = hashlib.sha256(
+            json.dumps(service_account_info, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        key = ("info", digest)
+        credentials_cls = lazy("Credentials")
+        with span("auth.load_credentials", AUTH):
+            credentials = credentials_cache.get(
+                key,
+                lambda: scoped(
+                    credentials_cls.from_service_account_info(
+                        service_account_info
+                    )
+                ),
+            )
 
     return credentials
 
 
 def client(
-    service_name: str, version: str = "v1", secrets: Secrets = None
-) -> Resource:
+    service_name: str,
+    version: str = "v1",
+    secrets: Secrets = None,
+    configuration: Configuration = None,
+) -> "Resource":
     """
     Create a client for the given service.
+
+    Resources are built once per thread, service, version and credentials
+    and then reused. Their discovery documents are cached in memory and, when
+    the `gcp_discovery_cache_dir` configuration key is set, on disk. Set the
+    `gcp_static_discovery` configuration key to `false` to fetch documents
+    from the network rather than use those shipped with the library.
+
+    Set the `gcp_http_transport` configuration key to `pooled` for resources
+    to share a pool of keep-alive connections instead of each using its own
+    `httplib2` transport. See `chaosgcp.transport.get_transport_settings`.
     """
     credentials = load_credentials(secrets=secrets)
-    return build(service_name, version=version, credentials=credentials)
+    static_discovery = get_static_discovery(configuration)
+    transport_settings = get_transport_settings(configuration)
+    key = (
+        service_name,
+        version,
+        id(credentials) if credentials is not None else None,
+        static_discovery,
+        transport_settings,
+    )
+
+    def build_resource() -> "Resource":
+        build = lazy("build")
+        options = {
+            "cache": get_discovery_cache(configuration),
+            "static_discovery": static_discovery,
+            "requestBuilder": request_class(),
+        }
+        if transport_settings.pooled:
+            # the transport authorizes the requests, googleapiclient refuses
+            # to be given credentials as well
+            options["http"] = get_http(credentials, transport_settings)
+        else:
+            options["credentials"] = credentials
+
+        http = wrap_http(options.get("http"), credentials)
+        if http is not None:
+            options.pop("credentials", None)
+            options["http"] = http
+
+        with span("client.build", CLIENT, method=f"{service_name}.{version}"):
+            return build(service_name, version=version, **options)
+
+    return resource_cache.get(key, build_resource)
 
 
 def discover(discover_system: bool = True) -> Discovery:
@@ -291,27 +425,36 @@ def get_parent(
     return parent
 
 
-def to_dict(response: Any) -> dict:
-    return response.__class__.to_dict(response)
+def to_dict(
+    response: Any,
+    fields: Optional[List[str]] = None,
+    omit_defaults: bool = False,
+) -> dict:
+    """
+    Serialize a protobuf message into a dictionary.
+
+    See `chaosgcp.serializer.to_dict`.
+    """
+    from chaosgcp.serializer import to_dict as serialize
+
+    return serialize(response, fields=fields, omit_defaults=omit_defaults)
 
 
 def parse_interval(
     end_time: str = "now", window: str = "1h"
 ) -> Tuple[datetime, datetime]:
-    end_time = dateparser.parse(
-        end_time, settings={"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True}
-    )
+    """
+    Turn an end time and a window into a `(start, end)` couple of timezone
+    aware UTC datetimes. The window is counted backwards from the end time.
+
+    Common forms, such as `now`, ISO-8601 timestamps or `5 minutes`, are
+    parsed directly. Others are handed to `dateparser`.
+    """
+    end_time = parse_datetime(end_time)
     if not end_time:
         raise ActivityFailed("unparsable end time value")
 
-    start_time = dateparser.parse(
-        window,
-        settings={
-            "TIMEZONE": "UTC",
-            "RELATIVE_BASE": end_time,
-            "RETURN_AS_TIMEZONE_AWARE": True,
-        },
-    )
+    start_time = parse_datetime(window, relative_base=end_time)
     if not start_time:
         raise ActivityFailed("unparsable window value")
 
@@ -321,27 +464,24 @@ def parse_interval(
 ###############################################################################
 # Private functions
 ###############################################################################
+def lazy(name: str) -> Any:
+    """
+    Resolve a lazily imported attribute through the module so that it can be
+    patched like any other module attribute.
+    """
+    return getattr(sys.modules[__name__], name)
+
+
 def load_exported_activities() -> List[DiscoveredActivities]:
     """
     Extract metadata from actions and probes exposed by this extension.
+
+    The manifest shipped with the package is served when it matches the
+    code, otherwise all activity modules are introspected.
     """
-    activities = []
-    activities.extend(discover_actions("chaosgcp.gke.nodepool.actions"))
-    activities.extend(discover_probes("chaosgcp.gke.nodepool.probes"))
-    activities.extend(discover_actions("chaosgcp.sql.actions"))
-    activities.extend(discover_probes("chaosgcp.sql.probes"))
-    activities.extend(discover_probes("chaosgcp.storage.probes"))
-    activities.extend(discover_actions("chaosgcp.cloudbuild.actions"))
-    activities.extend(discover_probes("chaosgcp.cloudbuild.probes"))
-    activities.extend(discover_actions("chaosgcp.cloudrun.actions"))
-    activities.extend(discover_probes("chaosgcp.cloudrun.probes"))
-    activities.extend(discover_probes("chaosgcp.monitoring.probes"))
-    activities.extend(discover_probes("chaosgcp.cloudlogging.probes"))
-    activities.extend(discover_probes("chaosgcp.artifact.probes"))
-    activities.extend(discover_actions("chaosgcp.lb.actions"))
-    activities.extend(discover_actions("chaosgcp.lb.probes"))
-    activities.extend(discover_probes("chaosgcp.neg.probes"))
-    activities.extend(discover_actions("chaosgcp.neg.actions"))
-    activities.extend(discover_actions("chaosgcp.compute.actions"))
-    activities.extend(discover_actions("chaosgcp.dns.actions"))
+    from chaosgcp.manifest import discover_activities, load_manifest
+
+    activities = load_manifest()
+    if activities is None:
+        activities = discover_activities()
     return activities
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Type
+
+from google.auth.credentials import Credentials
+
+from chaosgcp.instrumentation import CLIENT, span
+
+__all__ = ["get_client", "close_clients", "to_async"]
+logger = logging.getLogger("chaostoolkit")
+
+
+def get_client(
+    client_cls: Type[Any], credentials: Optional[Credentials] = None, **kwargs
+) -> Any:
+    """
+    Return a shared instance of the google-cloud async client `client_cls`
+    for the given credentials, creating it if needed.
+
+    Async clients hold gRPC channels bound to the event loop they were
+    created in, so they are shared per running event loop rather than
+    process-wide like those of `chaosgcp.clients`.
+
+    ```python
+    from google.cloud import monitoring_v3
+
+    from chaosgcp import load_credentials
+    from chaosgcp.aio import get_client
+
+    client = get_client(
+        monitoring_v3.MetricServiceAsyncClient, load_credentials(secrets)
+    )
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    extra = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+    creds_id = id(credentials) if credentials is not None else None
+    key = (client_cls, creds_id, extra)
+
+    with clients_lock:
+        loop_clients = registry.setdefault(loop, {})
+        entry = loop_clients.get(key)
+        if entry is not None:
+            return entry[1]
+
+        name = getattr(client_cls, "__name__", repr(client_cls))
+        logger.debug(f"Creating new async client '{name}'")
+        with span("client.create", CLIENT, method=name):
+            c = client_cls(credentials=credentials, **kwargs)
+        # the entry holds the credentials so their identity is not reused
+        loop_clients[key] = (credentials, c)
+        return c
+
+
+async def close_clients() -> None:
+    """
+    Close the async clients shared in the running event loop. Call it
+    before the loop is closed.
+    """
+    loop = asyncio.get_running_loop()
+    with clients_lock:
+        loop_clients = registry.pop(loop, {})
+
+    for _, c in loop_clients.values():
+        transport = getattr(c, "transport", None)
+        close = getattr(transport, "close", None)
+        if not callable(close):
+            continue
+        try:
+            await close()
+        except Exception:
+            logger.debug("Failed to close async client", exc_info=True)
+
+
+def to_async(
+    func: Callable[..., Any],
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Turn a synchronous activity into a coroutine function running it in
+    the default executor of the event loop.
+
+    This is for APIs without async clients, such as Compute Engine whose
+    library only talks REST, so that they can still be awaited alongside
+    the others.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+###############################################################################
+# Private functions
+###############################################################################
+clients_lock = threading.Lock()
+registry: "weakref.WeakKeyDictionary[Any, Dict[Hashable, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
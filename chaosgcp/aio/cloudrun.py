@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Dict, List
+
+from chaoslib.exceptions import ActivityFailed
+from chaoslib.types import Configuration, Secrets
+from google.cloud import run_v2
+
+from chaosgcp import load_credentials
+from chaosgcp.aio import get_client
+from chaosgcp.aio.operations import AsyncWaiter, lro_poller
+from chaosgcp.serializer import to_dict, to_dicts
+
+__all__ = [
+    "get_service",
+    "list_services",
+    "list_service_revisions",
+    "delete_service",
+]
+
+
+async def get_service(
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    name: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of `chaosgcp.cloudrun.probes.get_service`.
+    """
+    credentials = load_credentials(secrets)
+    parent = service_path(parent, project_id, region, name)
+
+    client = get_client(run_v2.ServicesAsyncClient, credentials)
+    request = run_v2.GetServiceRequest(name=parent)
+    return to_dict(await client.get_service(request=request))
+
+
+async def list_services(
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.cloudrun.probes.list_services`.
+    """
+    credentials = load_credentials(secrets)
+
+    if not parent and not project_id and not region:
+        raise ActivityFailed("set the parent or (project_id, region) arguments")
+
+    if not parent:
+        parent = f"projects/{project_id}/locations/{region}"
+
+    client = get_client(run_v2.ServicesAsyncClient, credentials)
+    request = run_v2.ListServicesRequest(parent=parent)
+    pager = await client.list_services(request=request)
+    return to_dicts([svc async for svc in pager])
+
+
+async def list_service_revisions(
+    parent: str,
+    project_id: str = None,
+    region: str = None,
+    name: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.cloudrun.probes.list_service_revisions`.
+    """
+    credentials = load_credentials(secrets)
+    parent = service_path(parent, project_id, region, name)
+
+    client = get_client(run_v2.RevisionsAsyncClient, credentials)
+    request = run_v2.ListRevisionsRequest(parent=parent)
+    pager = await client.list_revisions(request=request)
+    return to_dicts([revision async for revision in pager])
+
+
+async def delete_service(
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    name: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of `chaosgcp.cloudrun.actions.delete_service`. The
+    deletion is awaited without blocking the event loop.
+    """
+    credentials = load_credentials(secrets)
+    parent = service_path(parent, project_id, region, name)
+
+    client = get_client(run_v2.ServicesAsyncClient, credentials)
+    request = run_v2.DeleteServiceRequest(name=parent)
+    operation = await client.delete_service(request=request)
+
+    response = await AsyncWaiter().wait(lro_poller(operation), name=parent)
+    return to_dict(response)
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def service_path(
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    name: str = None,
+) -> str:
+    if parent:
+        return parent
+
+    if not project_id and not region and not name:
+        raise ActivityFailed(
+            "set the parent or (project_id, region, name) arguments"
+        )
+
+    return f"projects/{project_id}/locations/{region}/services/{name}"
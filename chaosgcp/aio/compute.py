@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from chaosgcp.aio import to_async
+from chaosgcp.compute import actions
+
+__all__ = [
+    "set_instance_tags",
+    "suspend_vm_instance",
+    "resume_vm_instance",
+    "suspend_vm_instances",
+    "resume_vm_instances",
+]
+
+# google-cloud-compute has no async clients, these run in the executor of
+# the event loop
+set_instance_tags = to_async(actions.set_instance_tags)
+suspend_vm_instance = to_async(actions.suspend_vm_instance)
+resume_vm_instance = to_async(actions.resume_vm_instance)
+suspend_vm_instances = to_async(actions.suspend_vm_instances)
+resume_vm_instances = to_async(actions.resume_vm_instances)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from chaosgcp.aio import to_async
+from chaosgcp.lb import actions, probes
+
+__all__ = [
+    "get_backend_service_health",
+    "get_fault_injection_traffic_policy",
+    "inject_traffic_delay",
+    "inject_traffic_faults",
+    "remove_fault_injection_traffic_policy",
+    "add_latency_to_endpoint",
+    "remove_latency_from_endpoint",
+    "set_status_code_on_endpoint",
+    "reset_status_code_on_endpoint",
+]
+
+# google-cloud-compute has no async clients, these run in the executor of
+# the event loop
+get_backend_service_health = to_async(probes.get_backend_service_health)
+get_fault_injection_traffic_policy = to_async(
+    probes.get_fault_injection_traffic_policy
+)
+inject_traffic_delay = to_async(actions.inject_traffic_delay)
+inject_traffic_faults = to_async(actions.inject_traffic_faults)
+remove_fault_injection_traffic_policy = to_async(
+    actions.remove_fault_injection_traffic_policy
+)
+add_latency_to_endpoint = to_async(actions.add_latency_to_endpoint)
+remove_latency_from_endpoint = to_async(actions.remove_latency_from_endpoint)
+set_status_code_on_endpoint = to_async(actions.set_status_code_on_endpoint)
+reset_status_code_on_endpoint = to_async(actions.reset_status_code_on_endpoint)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from chaoslib.types import Configuration, Secrets
+from google.cloud import monitoring_v3
+
+from chaosgcp import get_context, load_credentials
+from chaosgcp.aio import get_client
+from chaosgcp.monitoring.probes import (
+    parse_whole_interval,
+    slo_ratio_verdict,
+)
+from chaosgcp.serializer import to_dicts
+
+__all__ = [
+    "get_slo_health",
+    "get_slo_burn_rate",
+    "get_slo_budget",
+    "valid_slo_ratio_during_window",
+    "query_time_series",
+]
+logger = logging.getLogger("chaostoolkit")
+
+
+async def get_slo_health(
+    name: str,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    alignment_period: int = 60,
+    per_series_aligner: str = "ALIGN_MEAN",
+    cross_series_reducer: int = "REDUCE_COUNT",
+    group_by_fields: Optional[Union[str, List[str]]] = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.monitoring.probes.get_slo_health`.
+    """
+    results = await list_slo_health(
+        name,
+        end_time,
+        window,
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+        project_id,
+        region,
+        configuration,
+        secrets,
+    )
+
+    return to_dicts(results)
+
+
+async def get_slo_burn_rate(
+    name: str,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    loopback_period: str = "300s",
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.monitoring.probes.get_slo_burn_rate`.
+    """
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+    start, end = parse_whole_interval(end_time, window)
+
+    slo = await get_service_level_objective(name, credentials)
+
+    request = monitoring_v3.ListTimeSeriesRequest(
+        name=f"projects/{context.project_id}",
+        filter=f'select_slo_burn_rate("{slo.name}", "{loopback_period}")',
+        interval=monitoring_v3.TimeInterval(start_time=start, end_time=end),
+    )
+
+    return to_dicts(await list_time_series(request, credentials))
+
+
+async def get_slo_budget(
+    name: str,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.monitoring.probes.get_slo_budget`.
+    """
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+    start, end = parse_whole_interval(end_time, window)
+
+    slo = await get_service_level_objective(name, credentials)
+
+    request = monitoring_v3.ListTimeSeriesRequest(
+        name=f"projects/{context.project_id}",
+        filter=f'select_slo_budget("{slo.name}")',
+        interval=monitoring_v3.TimeInterval(start_time=start, end_time=end),
+    )
+
+    return to_dicts(await list_time_series(request, credentials))
+
+
+async def valid_slo_ratio_during_window(
+    name: str,
+    expected_ratio: float = 0.90,
+    min_level: Union[float, int, bool, str] = 0.90,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    alignment_period: int = 60,
+    per_series_aligner: str = "ALIGN_MEAN",
+    cross_series_reducer: int = "REDUCE_COUNT",
+    group_by_fields: Optional[Union[str, List[str]]] = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> bool:
+    """
+    Async variant of
+    `chaosgcp.monitoring.probes.valid_slo_ratio_during_window`.
+    """
+    results = await list_slo_health(
+        name,
+        end_time,
+        window,
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+        project_id,
+        region,
+        configuration,
+        secrets,
+    )
+    verdict = slo_ratio_verdict(results, expected_ratio, min_level)
+
+    logger.debug(f"SLO ratio verdict: {verdict}")
+
+    return verdict["ok"]
+
+
+async def query_time_series(
+    mql_query: str,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.monitoring.probes.query_time_series`.
+    """
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+
+    client = get_client(monitoring_v3.QueryServiceAsyncClient, credentials)
+    request = monitoring_v3.QueryTimeSeriesRequest(
+        name=f"projects/{context.project_id}",
+        query=mql_query,
+    )
+
+    pager = await client.query_time_series(request=request)
+    return to_dicts([ts async for ts in pager])
+
+
+###############################################################################
+# Private functions
+###############################################################################
+async def list_slo_health(
+    name: str,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    alignment_period: int = 60,
+    per_series_aligner: str = "ALIGN_MEAN",
+    cross_series_reducer: int = "REDUCE_COUNT",
+    group_by_fields: Optional[Union[str, List[str]]] = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[monitoring_v3.TimeSeries]:
+    psa = monitoring_v3.Aggregation.Aligner[per_series_aligner]
+    csr = monitoring_v3.Aggregation.Reducer[cross_series_reducer]
+
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+    start, end = parse_whole_interval(end_time, window)
+
+    slo = await get_service_level_objective(name, credentials)
+
+    if isinstance(group_by_fields, str):
+        group_by_fields = group_by_fields.split(",")
+
+    request = monitoring_v3.ListTimeSeriesRequest(
+        name=f"projects/{context.project_id}",
+        filter=f'select_slo_health("{slo.name}")',
+        interval=monitoring_v3.TimeInterval(start_time=start, end_time=end),
+        aggregation=monitoring_v3.Aggregation(
+            alignment_period={"seconds": alignment_period},
+            per_series_aligner=psa,
+            cross_series_reducer=csr,
+            group_by_fields=group_by_fields or None,
+        ),
+    )
+
+    return await list_time_series(request, credentials)
+
+
+async def get_service_level_objective(
+    name: str, credentials: Any
+) -> monitoring_v3.ServiceLevelObjective:
+    client = get_client(
+        monitoring_v3.ServiceMonitoringServiceAsyncClient, credentials
+    )
+    request = monitoring_v3.GetServiceLevelObjectiveRequest(name=name)
+    return await client.get_service_level_objective(request=request)
+
+
+async def list_time_series(
+    request: monitoring_v3.ListTimeSeriesRequest, credentials: Any
+) -> List[monitoring_v3.TimeSeries]:
+    client = get_client(monitoring_v3.MetricServiceAsyncClient, credentials)
+    pager = await client.list_time_series(request=request)
+    return [ts async for ts in pager]
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from chaoslib.exceptions import ActivityFailed
+from chaoslib.types import Configuration, Secrets
+from google.cloud import container_v1
+
+from chaosgcp import (
+    context_from_parent_path,
+    get_parent,
+    load_credentials,
+    to_dict,
+)
+from chaosgcp.aio import get_client
+from chaosgcp.aio.operations import AsyncWaiter, gke_operation_poller
+from chaosgcp.operations import OperationResult, OperationTimeout
+
+__all__ = [
+    "list_nodepools",
+    "get_nodepool",
+    "resize_nodepool",
+    "resize_nodepools",
+]
+logger = logging.getLogger("chaostoolkit")
+
+
+async def list_nodepools(
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of `chaosgcp.gke.nodepool.probes.list_nodepools`.
+    """
+    parent = get_parent(
+        parent,
+        configuration=configuration,
+        project_id=project_id,
+        region=region,
+    )
+    client = cluster_manager(secrets)
+    response = await client.list_node_pools(parent=parent)
+    return to_dict(response)
+
+
+async def get_nodepool(
+    node_pool_id: str = None,
+    parent: str = None,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of `chaosgcp.gke.nodepool.probes.get_nodepool`.
+    """
+    parent = get_parent(
+        parent,
+        node_pool_id=node_pool_id,
+        configuration=configuration,
+        project_id=project_id,
+        region=region,
+    )
+    client = cluster_manager(secrets)
+    response = await client.get_node_pool(name=parent)
+    return to_dict(response)
+
+
+async def resize_nodepool(
+    pool_size: int = 1,
+    node_pool_id: str = None,
+    parent: str = None,
+    wait_until_complete: bool = True,
+    timeout: int = 0,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of `chaosgcp.gke.nodepool.actions.resize_nodepool`. The
+    resize is awaited, for at most `timeout` seconds when set, without
+    blocking the event loop.
+    """
+    if not parent and not node_pool_id:
+        raise ActivityFailed("you must pass `node_pool_id` or `parent`")
+
+    parent = get_parent(
+        parent,
+        node_pool_id=node_pool_id,
+        configuration=configuration,
+        project_id=project_id,
+        region=region,
+    )
+    client = cluster_manager(secrets)
+    request = container_v1.SetNodePoolSizeRequest(
+        name=parent,
+        node_count=pool_size,
+    )
+    response = await client.set_node_pool_size(request=request)
+
+    logger.debug("NodePool resize: {}".format(str(response)))
+
+    if wait_until_complete:
+        response = await wait_on_operation(client, response, parent, timeout)
+
+    return to_dict(response)
+
+
+async def resize_nodepools(
+    node_pool_ids: List[str],
+    pool_size: int,
+    wait_until_complete: bool = True,
+    timeout: int = 0,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of `chaosgcp.gke.nodepool.actions.resize_nodepools`. All
+    the resizes are requested and awaited concurrently from the event loop.
+    A failed resize does not prevent the others from being awaited, its
+    error is reported in its result.
+    """
+
+    async def resize(node_pool_id: str) -> OperationResult:
+        if node_pool_id.startswith("projects/"):
+            parent, name = node_pool_id, None
+        else:
+            parent, name = None, node_pool_id
+
+        try:
+            result = await resize_nodepool(
+                pool_size,
+                node_pool_id=name,
+                parent=parent,
+                wait_until_complete=wait_until_complete,
+                timeout=timeout,
+                project_id=project_id,
+                region=region,
+                configuration=configuration,
+                secrets=secrets,
+            )
+        except Exception as x:
+            logger.debug(f"Resizing '{node_pool_id}' failed", exc_info=True)
+            return OperationResult(node_pool_id, error=x)
+        return OperationResult(node_pool_id, result=result)
+
+    results = await asyncio.gather(*map(resize, node_pool_ids))
+
+    for r in results:
+        if not r.ok:
+            logger.error(f"Resizing nodepool '{r.name}' failed: {r.error}")
+
+    return [r.to_dict() for r in results]
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def cluster_manager(
+    secrets: Secrets = None,
+) -> container_v1.ClusterManagerAsyncClient:
+    credentials = load_credentials(secrets)
+    return get_client(container_v1.ClusterManagerAsyncClient, credentials)
+
+
+async def wait_on_operation(
+    client: container_v1.ClusterManagerAsyncClient,
+    op: container_v1.Operation,
+    parent: str,
+    timeout: int = 0,
+) -> container_v1.Operation:
+    name = context_from_parent_path(parent).get_operation_parent(op.name)
+    waiter = AsyncWaiter(deadline=timeout if timeout > 0 else None)
+
+    try:
+        return await waiter.wait(gke_operation_poller(client, name), name=name)
+    except OperationTimeout:
+        raise ActivityFailed("operation failed in the given allowed timeout")
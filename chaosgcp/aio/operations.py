@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from chaosgcp.instrumentation import OPERATION, span
+from chaosgcp.operations import OperationTimeout, Waiter, WaitStats, emit
+
+__all__ = ["AsyncWaiter", "gke_operation_poller", "lro_poller"]
+logger = logging.getLogger("chaostoolkit")
+
+# an async poller is awaited with the time remaining before the deadline, if
+# any, and returns whether the operation is done along with its latest state
+AsyncPoller = Callable[[Optional[float]], Awaitable[Tuple[bool, Any]]]
+
+
+class AsyncWaiter(Waiter):
+    """
+    Wait for an operation to complete without blocking the event loop.
+
+    It polls with the same exponential backoff, jitter and deadline as
+    `chaosgcp.operations.Waiter`, and reports its `WaitStats` to the same
+    listeners, but sleeps with `asyncio.sleep` so that many operations can
+    be awaited concurrently from a single thread.
+    """
+
+    async def wait(self, poll: AsyncPoller, name: str = "operation") -> Any:
+        with span("operation.wait", OPERATION, method=name) as s:
+            started = time.monotonic()
+            delay = self.initial_delay
+            polls = 0
+
+            while True:
+                elapsed = time.monotonic() - started
+                remaining = None
+                if self.deadline is not None:
+                    remaining = max(0.0, self.deadline - elapsed)
+
+                polls += 1
+                done, result = await poll(remaining)
+                elapsed = time.monotonic() - started
+
+                if done:
+                    s.attributes["polls"] = polls
+                    emit(WaitStats(name, polls, elapsed, True))
+                    return result
+
+                if self.deadline is not None and elapsed >= self.deadline:
+                    s.attributes["polls"] = polls
+                    emit(WaitStats(name, polls, elapsed, False))
+                    raise OperationTimeout(
+                        f"operation '{name}' did not complete within "
+                        f"{self.deadline}s"
+                    )
+
+                logger.debug(f"Waiting for operation '{name}'")
+
+                pause = self.jittered(delay)
+                if self.deadline is not None:
+                    pause = min(pause, self.deadline - elapsed)
+                await asyncio.sleep(max(0.0, pause))
+
+                delay = self.next_delay(delay)
+
+
+def gke_operation_poller(client: Any, name: str) -> AsyncPoller:
+    """
+    Poll a GKE `container_v1.Operation` by its full name with a
+    `ClusterManagerAsyncClient`
+    """
+    from google.cloud import container_v1
+
+    async def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        response = await client.get_operation(name=name)
+        logger.debug(f"Operation {name} => {response.status}")
+        return response.status == container_v1.Operation.Status.DONE, response
+
+    return poll
+
+
+def lro_poller(operation: Any) -> AsyncPoller:
+    """
+    Poll a `google.api_core.operation_async.AsyncOperation` and return its
+    result once done
+    """
+
+    async def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        if not await operation.done():
+            return False, None
+        return True, await operation.result()
+
+    return poll
@@ -15,15 +15,16 @@
 import logging
 from typing import Dict, Any, List, Generator, Optional
 
-from google.cloud import compute_v1, apphub_v1
+from google.cloud import apphub_v1
 from google.cloud import resourcemanager_v3
 
 from chaoslib.types import Configuration, Secrets
+from chaosgcp.lb import list_all_url_maps
 from chaosgcp.lb.actions import (
     inject_traffic_faults,
     remove_fault_injection_traffic_policy,
 )
-from chaosgcp import get_context, load_credentials
+from chaosgcp import clients, get_context, load_credentials
 from chaoslib.exceptions import ActivityFailed
 
 
@@ -60,14 +61,14 @@ def apphub_app_list_services(
     try:
         name_app = f"projects/{host_project_id}/locations/{location}/applications/{application_id}"
         credentials = load_credentials(secrets)
-        client = apphub_v1.AppHubClient(credentials=credentials)
+        client = clients.get(apphub_v1.AppHubClient, credentials)
         request = apphub_v1.ListServicesRequest(parent=name_app)
         service_uris = []
         updated_uri = None
         logger.info("Getting attached Services of given Application in Apphub")
         for response in client.list_services(request=request):
             uri = response.service_reference.uri.replace(
-                resourcemanager_v3.ProjectsClient(credentials=credentials)
+                clients.get(resourcemanager_v3.ProjectsClient, credentials)
                 .get_project(name="projects/{}".format(project_id))
                 .name,
                 "projects/{}".format(project_id),
@@ -114,12 +115,11 @@ def get_url_map_essentials(
         # request = compute_v1.AggregatedListUrlMapsRequest(project=project_id)
         credentials = load_credentials(secrets)
         context = get_context(configuration, project_id=project_id)
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.AggregatedListUrlMapsRequest(
-            project=context.project_id
+        url_maps = list_all_url_maps(
+            credentials, context.project_id, configuration=configuration
         )
 
-        for response in client.aggregated_list(request=request):
+        for response in url_maps:
             scope, url_maps_scoped_list = response
             region = scope.split("/")[-1] if "/" in scope else "global"
 
@@ -5,7 +5,8 @@ from google.cloud import artifactregistry_v1
 from google.cloud.devtools import containeranalysis_v1
 from grafeas.grafeas_v1 import Severity
 
-from chaosgcp import get_context, load_credentials
+from chaosgcp import clients, get_context, load_credentials
+from chaosgcp.serializer import to_dict, to_dicts
 
 __all__ = [
     "list_docker_image_tags",
@@ -32,7 +33,9 @@ def list_docker_image_tags(
         configuration=configuration, project_id=project_id, region=region
     )
     credentials = load_credentials(secrets)
-    client = artifactregistry_v1.ArtifactRegistryClient(credentials=credentials)
+    client = clients.get(
+        artifactregistry_v1.ArtifactRegistryClient, credentials
+    )
 
     project_id = context.project_id
     region = context.region
@@ -45,12 +48,7 @@ def list_docker_image_tags(
 
     response = client.list_tags(request=request)
 
-    return list(
-        map(
-            lambda p: p.__class__.to_dict(p),
-            response,
-        )
-    )
+    return to_dicts(response)
 
 
 def get_most_recent_docker_image(
@@ -68,7 +66,9 @@ def get_most_recent_docker_image(
         configuration=configuration, project_id=project_id, region=region
     )
     credentials = load_credentials(secrets)
-    client = artifactregistry_v1.ArtifactRegistryClient(credentials=credentials)
+    client = clients.get(
+        artifactregistry_v1.ArtifactRegistryClient, credentials
+    )
 
     project_id = context.project_id
     region = context.region
@@ -81,7 +81,7 @@ def get_most_recent_docker_image(
 
     response = client.list_tags(request=request)
     *_, last = response  # python is nice
-    return last.__class__.to_dict(last)
+    return to_dict(last)
 
 
 def get_docker_image_version_from_tag(
@@ -100,7 +100,9 @@ def get_docker_image_version_from_tag(
         configuration=configuration, project_id=project_id, region=region
     )
     credentials = load_credentials(secrets)
-    client = artifactregistry_v1.ArtifactRegistryClient(credentials=credentials)
+    client = clients.get(
+        artifactregistry_v1.ArtifactRegistryClient, credentials
+    )
 
     project_id = context.project_id
     region = context.region
@@ -110,7 +112,7 @@ def get_docker_image_version_from_tag(
     request = artifactregistry_v1.GetTagRequest(name=name)
 
     response = client.get_tag(request=request)
-    return response.__class__.to_dict(response)
+    return to_dict(response)
 
 
 def get_container_most_recent_image_vulnerabilities_occurences(
@@ -146,12 +148,7 @@ def get_container_most_recent_image_vulnerabilities_occurences(
         parent=project_name, filter=f'kind="{kind}" AND resourceUrl="{url}"'
     )
 
-    return list(
-        map(
-            lambda p: p.__class__.to_dict(p),
-            response,
-        )
-    )
+    return to_dicts(response)
 
 
 def list_severe_or_critical_vulnerabilities_in_most_recent_image(
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+__all__ = [
+    "CredentialsCache",
+    "credentials_cache",
+    "get_credentials_cache_stats",
+    "clear_credentials_cache",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# how long before their expiry we start refreshing tokens in the background
+REFRESH_MARGIN = 300
+
+
+class CredentialsCache:
+    """
+    Process-wide, thread-safe, cache of GCP credentials.
+
+    Entries are keyed by whatever identifies the source of the credentials,
+    typically the path and modification time of a service account file or
+    a digest of the service account info. The first two elements of a key
+    identify the source, the remaining ones its version, so that a source
+    which changed on disk replaces its former entry.
+
+    Handing back the same credentials object means its access token is
+    shared by all activities, rather than each activity performing its own
+    OAuth exchange. Tokens about to expire are refreshed in the background.
+    """
+
+    def __init__(self, refresh_margin: int = REFRESH_MARGIN) -> None:
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Any] = {}
+        self._refreshing = set()
+
+    def get(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """
+        Return the credentials cached under `key`, calling `loader` to
+        create them when they are not cached yet.
+        """
+        with self._lock:
+            credentials = self._entries.get(key)
+            if credentials is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                credentials = loader()
+                for k in [k for k in self._entries if k[:2] == key[:2]]:
+                    del self._entries[k]
+                self._entries[key] = credentials
+
+        self.ensure_fresh(credentials)
+        return credentials
+
+    def ensure_fresh(self, credentials: Any) -> None:
+        """
+        Refresh expired credentials synchronously and schedule a background
+        refresh of those expiring within the refresh margin.
+        """
+        if credentials is None:
+            return
+
+        if credentials.expired:
+            logger.debug("GCP credentials need to be refreshed as they expired")
+            self.refresh(credentials)
+            return
+
+        expiry = getattr(credentials, "expiry", None)
+        if not isinstance(expiry, datetime):
+            return
+
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc)
+        if expiry.tzinfo is None:
+            now = now.replace(tzinfo=None)
+
+        if expiry - self.refresh_margin > now:
+            return
+
+        with self._lock:
+            if id(credentials) in self._refreshing:
+                return
+            self._refreshing.add(id(credentials))
+
+        logger.debug("GCP credentials expire soon, refreshing in background")
+        t = threading.Thread(
+            target=self.refresh,
+            args=(credentials, False),
+            name="chaosgcp-credentials-refresh",
+            daemon=True,
+        )
+        t.start()
+
+    def refresh(self, credentials: Any, raise_on_error: bool = True) -> None:
+        from chaosgcp.instrumentation import AUTH, span
+        from chaosgcp.transport import auth_request
+
+        try:
+            with span("auth.refresh", AUTH):
+                credentials.refresh(auth_request())
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            with self._lock:
+                self.refresh_failures += 1
+            logger.debug("Failed to refresh GCP credentials", exc_info=True)
+            if raise_on_error:
+                raise
+        finally:
+            with self._lock:
+                self._refreshing.discard(id(credentials))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self.hits = self.misses = 0
+            self.refreshes = self.refresh_failures = 0
+
+
+credentials_cache = CredentialsCache()
+
+
+def get_credentials_cache_stats() -> Dict[str, int]:
+    """
+    Hit/miss and refresh counters of the process-wide credentials cache.
+    """
+    return credentials_cache.stats()
+
+
+def clear_credentials_cache() -> None:
+    """
+    Forget all cached credentials and reset the counters.
+    """
+    credentials_cache.clear()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from googleapiclient.http import HttpRequest
+
+__all__ = ["BATCH_LIMIT", "BatchResult", "execute_batch"]
+logger = logging.getLogger("chaostoolkit")
+
+# Google APIs refuse batches of more than 1000 calls, this is also the limit
+# enforced by `googleapiclient.http.BatchHttpRequest`
+BATCH_LIMIT = 1000
+
+
+class BatchResult(NamedTuple):
+    name: str
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "error": str(self.error) if self.error else None,
+            "response": self.response,
+        }
+
+
+def execute_batch(
+    service: "Resource",
+    requests: Iterable[Tuple[str, "HttpRequest"]],
+    batch_size: int = BATCH_LIMIT,
+) -> List[BatchResult]:
+    """
+    Execute many requests of a discovery based `service` with as few round
+    trips as possible.
+
+    `requests` are `(name, request)` pairs, where `request` is what calling
+    a method of the service returns, before `execute()` is called on it. They
+    are sent in batches of up to `batch_size` calls, capped to `BATCH_LIMIT`,
+    and a `BatchResult` is returned for each one of them, in the same order.
+
+    A failing call does not prevent the others from completing, its error is
+    reported in its own result. When a whole batch fails, for instance on a
+    network error, all its calls are reported with that error.
+    """
+    batch_size = max(1, min(batch_size, BATCH_LIMIT))
+    requests = list(requests)
+    results: List[BatchResult] = []
+
+    for start in range(0, len(requests), batch_size):
+        chunk = requests[start : start + batch_size]
+        results.extend(execute_chunk(service, chunk))
+
+    return results
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def execute_chunk(
+    service: "Resource", chunk: List[Tuple[str, "HttpRequest"]]
+) -> List[BatchResult]:
+    results: List[Optional[BatchResult]] = [None] * len(chunk)
+    batch = service.new_batch_http_request()
+
+    for index, (name, request) in enumerate(chunk):
+        batch.add(
+            request,
+            callback=collect(results, index, name),
+            request_id=str(index),
+        )
+
+    logger.debug(f"Sending a batch of {len(chunk)} requests")
+    try:
+        batch.execute()
+    except Exception as e:
+        logger.debug(f"Batch of {len(chunk)} requests failed", exc_info=True)
+        for index, (name, _) in enumerate(chunk):
+            if results[index] is None:
+                results[index] = BatchResult(name, error=e)
+
+    return results
+
+
+def collect(
+    results: List[Optional[BatchResult]], index: int, name: str
+) -> Callable[[str, Any, Optional[BaseException]], None]:
+    def callback(
+        request_id: str, response: Any, exception: Optional[BaseException]
+    ) -> None:
+        if exception is not None:
+            results[index] = BatchResult(name, error=exception)
+        else:
+            results[index] = BatchResult(name, response=response)
+
+    return callback
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from chaoslib.types import Configuration
+
+from chaosgcp import singleflight
+
+__all__ = [
+    "ALL",
+    "CacheKey",
+    "ReadCache",
+    "read_cache",
+    "cached",
+    "invalidate",
+    "clear",
+    "stats",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# how long, in seconds, a read is served from the cache
+DEFAULT_TTL = 30.0
+# how many reads are kept before evicting the least recently used
+MAX_SIZE = 256
+# stands for every resource, as in a list, or every region, as in an
+# aggregated list
+ALL = "*"
+
+
+class CacheKey(NamedTuple):
+    api: str
+    name: str
+    project: Optional[str] = None
+    region: Optional[str] = None
+
+
+class ReadCache:
+    """
+    Process-wide cache of slow-changing resources read from GCP APIs, such
+    as URL maps or backend services, so that activities reading the same
+    resources over and over within an experiment are served locally.
+
+    Entries expire after their TTL and, when the cache is full, the least
+    recently used one is evicted. Values are deep-copied in and out of the
+    cache as activities often modify what they read before sending it back.
+
+    Actions mutating a resource must call `invalidate` so that the next read
+    fetches it again.
+    """
+
+    def __init__(
+        self, max_size: int = MAX_SIZE, ttl: float = DEFAULT_TTL
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # bumped on every invalidation so that a read racing with it is not
+        # cached
+        self._generation = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+
+    def get(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Return a copy of the value cached under `key`, calling `loader` to
+        read it when it is missing or expired.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._entries[key] = (now + ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def invalidate(
+        self,
+        api: str,
+        name: Optional[str] = None,
+        project: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> int:
+        """
+        Drop the entries of `api` which may hold the given resource: the
+        resource itself and the lists it belongs to. A `None` name,
+        project or region matches any of them.
+        """
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                if key.api != api:
+                    continue
+                if name is not None and key.name not in (name, ALL):
+                    continue
+                if project is not None and key.project != project:
+                    continue
+                if region is not None and key.region not in (region, ALL):
+                    continue
+                del self._entries[key]
+                removed += 1
+            self.invalidations += removed
+
+        if removed:
+            logger.debug(f"Invalidated {removed} cached '{api}' read(s)")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+
+read_cache = ReadCache()
+
+
+def cached(
+    key: CacheKey,
+    loader: Callable[[], Any],
+    configuration: Configuration = None,
+    ttl: Optional[float] = None,
+) -> Any:
+    """
+    Read through the process-wide cache. The `gcp_cache_ttl` configuration
+    key sets for how many seconds reads are cached, `0` disables caching.
+    When given, `ttl` is used instead.
+
+    Concurrent reads missing the cache for the same key share a single call
+    to `loader`, see `chaosgcp.singleflight`.
+    """
+    return read_cache.get(
+        key,
+        lambda: singleflight.do(key, loader),
+        ttl=get_ttl(configuration) if ttl is None else ttl,
+    )
+
+
+def invalidate(
+    api: str,
+    name: Optional[str] = None,
+    project: Optional[str] = None,
+    region: Optional[str] = None,
+) -> int:
+    """
+    Forget the cached reads of a resource after it was mutated.
+    """
+    return read_cache.invalidate(api, name, project, region)
+
+
+def clear() -> None:
+    read_cache.clear()
+
+
+def stats() -> Dict[str, int]:
+    return read_cache.stats()
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def get_ttl(configuration: Configuration = None) -> Optional[float]:
+    value = (configuration or {}).get("gcp_cache_ttl")
+    if value is None:
+        return None
+    return float(value)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Type, TypeVar
+
+from google.auth.credentials import Credentials
+
+from chaosgcp import replay
+from chaosgcp.instrumentation import CLIENT, span
+from chaosgcp.ratelimit import api_name, throttle_client
+
+__all__ = ["get", "shutdown", "stats", "set_max_size"]
+logger = logging.getLogger("chaostoolkit")
+
+# how many clients we keep around before evicting the least recently used
+MAX_SIZE = 32
+
+T = TypeVar("T")
+
+
+class ClientRegistry:
+    """
+    Bounded registry of google-cloud clients, shared process-wide.
+
+    Clients are keyed on their class, the identity of their credentials and
+    any extra constructor arguments so that their transports (gRPC channels,
+    HTTP sessions) are reused across activities instead of being rebuilt,
+    and their TLS handshakes performed again, on every call.
+
+    Credentials are cached by `chaosgcp.load_credentials` so their identity
+    is stable for the lifetime of the process. Each entry holds a reference
+    to its client, and therefore to its credentials, which guarantees their
+    identity cannot be reused while the entry lives.
+
+    When full, the least recently used client is evicted. It is not closed
+    explicitely as another thread may still be using it. Its transport is
+    released once it gets garbage collected.
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(
+        self,
+        client_cls: Type[T],
+        credentials: Optional[Credentials] = None,
+        **kwargs: Any,
+    ) -> T:
+        key = make_key(client_cls, credentials, kwargs)
+
+        with self._lock:
+            c = self._clients.get(key)
+            if c is not None:
+                self.hits += 1
+                self._clients.move_to_end(key)
+                return c
+
+            self.misses += 1
+            name = getattr(client_cls, "__name__", repr(client_cls))
+            logger.debug(f"Creating new client '{name}'")
+            with span("client.create", CLIENT, method=name):
+                c = client_cls(
+                    **replay.client_arguments(client_cls, credentials, kwargs)
+                )
+            replay.install_client(c)
+            api = client_api(c)
+            if api:
+                throttle_client(c, api)
+            self._clients[key] = c
+
+            while len(self._clients) > self.max_size:
+                _, evicted = self._clients.popitem(last=False)
+                self.evictions += 1
+                logger.debug(
+                    f"Evicted client '{evicted.__class__.__name__}' from "
+                    "the registry"
+                )
+
+            return c
+
+    def shutdown(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for c in clients:
+            close_client(c)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._clients),
+            }
+
+
+registry = ClientRegistry()
+
+
+def get(
+    client_cls: Type[T], credentials: Optional[Credentials] = None, **kwargs
+) -> T:
+    """
+    Return a shared instance of `client_cls` for the given credentials,
+    creating it if needed. Extra keyword arguments are passed to the
+    client's constructor and are part of the registry key.
+
+    ```python
+    from google.cloud import compute_v1
+
+    from chaosgcp import clients, load_credentials
+
+    credentials = load_credentials(secrets)
+    client = clients.get(compute_v1.UrlMapsClient, credentials)
+    ```
+    """
+    return registry.get(client_cls, credentials, **kwargs)
+
+
+def shutdown() -> None:
+    """
+    Close all clients held by the registry and empty it. This is called
+    at interpreter exit, or at the end of the experiment when the
+    `chaosgcp.controls.clients` control is enabled.
+    """
+    registry.shutdown()
+
+
+def stats() -> Dict[str, int]:
+    """
+    Hit/miss/eviction counters of the registry.
+    """
+    return registry.stats()
+
+
+def set_max_size(max_size: int) -> None:
+    """
+    Change how many clients the registry may hold at once.
+    """
+    registry.max_size = max(1, int(max_size))
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def make_key(
+    client_cls: type, credentials: Optional[Credentials], kwargs: Dict
+) -> Tuple[Hashable, ...]:
+    extra = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+    creds_id = id(credentials) if credentials is not None else None
+    return (client_cls, creds_id, extra)
+
+
+def client_api(c: Any) -> Optional[str]:
+    endpoint = getattr(c, "api_endpoint", None)
+    if not isinstance(endpoint, str):
+        endpoint = getattr(c.__class__, "DEFAULT_ENDPOINT", None)
+    if not isinstance(endpoint, str):
+        return None
+    return api_name(endpoint)
+
+
+def close_client(c: Any) -> None:
+    transport = getattr(c, "transport", None)
+    close = getattr(transport, "close", None)
+    if not callable(close):
+        return
+
+    try:
+        close()
+    except Exception:
+        logger.debug(
+            f"Failed to close client '{c.__class__.__name__}'", exc_info=True
+        )
+
+
+atexit.register(shutdown)
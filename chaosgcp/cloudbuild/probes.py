@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
+from typing import Any, Dict, List
 
 from chaoslib.types import Configuration, Secrets
 
 from chaosgcp import get_context, get_service
+from chaosgcp.batch import BATCH_LIMIT, execute_batch
 
-__all__ = ["list_triggers", "list_trigger_names", "get_trigger"]
+__all__ = ["list_triggers", "list_trigger_names", "get_trigger", "get_triggers"]
 
 
 def list_triggers(
@@ -89,3 +91,46 @@ def get_trigger(
     )
     response = request.execute()
     return response
+
+
+def get_triggers(
+    names: List[str],
+    batch_size: int = BATCH_LIMIT,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Returns information about many BuildTriggers, fetched in batches of up
+    to `batch_size` calls per HTTP request.
+
+    See: https://cloud.google.com/cloud-build/docs/api/reference/rest/v1/projects.triggers/get
+
+    :param names: names of the triggers
+    :param batch_size: how many triggers are fetched per HTTP request
+    :param configuration:
+    :param secrets:
+    :return: the triggers which could be fetched and the errors of the others
+    """  # noqa: E501
+    ctx = get_context(
+        configuration=configuration, project_id=project_id, region=region
+    )
+    service = get_service(
+        "cloudbuild", version="v1", configuration=configuration, secrets=secrets
+    )
+
+    triggers = service.projects().triggers()
+    results = execute_batch(
+        service,
+        [
+            (name, triggers.get(projectId=ctx.project_id, triggerId=name))
+            for name in names
+        ],
+        batch_size=batch_size,
+    )
+
+    return {
+        "triggers": [r.response for r in results if r.ok],
+        "errors": [r.to_dict() for r in results if not r.ok],
+    }
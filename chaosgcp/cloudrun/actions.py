@@ -5,7 +5,8 @@ from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 from google.cloud import run_v2
 
-from chaosgcp import load_credentials
+from chaosgcp import clients, load_credentials
+from chaosgcp.serializer import to_dict
 
 __all__ = ["create_service", "delete_service", "update_service"]
 
@@ -61,7 +62,7 @@ def create_service(
     if max_instance_request_concurrency:
         max_instances = max_instance_request_concurrency
 
-    client = run_v2.ServicesClient(credentials=credentials)
+    client = clients.get(run_v2.ServicesClient, credentials)
     tpl = run_v2.RevisionTemplate(
         max_instance_request_concurrency=max_instances,
         service_account=service_account,
@@ -81,7 +82,7 @@ def create_service(
 
     operation = client.create_service(request=request)
     response = operation.result()
-    return response.__class__.to_dict(response)
+    return to_dict(response)
 
 
 def delete_service(
@@ -116,14 +117,14 @@ def delete_service(
     if not parent:
         parent = f"project/{project_id}/locations/{region}/services/{name}"
 
-    client = run_v2.ServicesClient(credentials=credentials)
+    client = clients.get(run_v2.ServicesClient, credentials)
     request = run_v2.DeleteServiceRequest(
         name=parent,
     )
 
     operation = client.delete_service(request=request)
     response = operation.result()
-    return response.__class__.to_dict(response)
+    return to_dict(response)
 
 
 def update_service(
@@ -211,7 +212,7 @@ def update_service(
     if vpc_access_config:
         vpc_access = vpc_access_config
 
-    client = run_v2.ServicesClient(credentials=credentials)
+    client = clients.get(run_v2.ServicesClient, credentials)
 
     tpl = run_v2.RevisionTemplate(
         max_instance_request_concurrency=max_instance_request_concurrency,
@@ -233,4 +234,4 @@ def update_service(
     operation = client.update_service(request=request)
     response = operation.result()
 
-    return response.__class__.to_dict(response)
+    return to_dict(response)
@@ -5,7 +5,8 @@ from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 from google.cloud import run_v2
 
-from chaosgcp import load_credentials
+from chaosgcp import clients, load_credentials
+from chaosgcp.serializer import to_dict, to_dicts
 
 __all__ = ["get_service", "list_services", "list_service_revisions"]
 
@@ -42,10 +43,10 @@ def get_service(
     if not parent:
         parent = f"project/{project_id}/locations/{region}/services/{name}"
 
-    client = run_v2.ServicesClient(credentials=credentials)
+    client = clients.get(run_v2.ServicesClient, credentials)
     request = run_v2.GetServiceRequest(name=parent)
     response = client.get_service(request=request)
-    return response.__class__.to_dict(response)
+    return to_dict(response)
 
 
 def list_services(
@@ -76,14 +77,9 @@ def list_services(
     if not parent:
         parent = f"project/{project_id}/locations/{region}"
 
-    client = run_v2.ServicesClient(credentials=credentials)
+    client = clients.get(run_v2.ServicesClient, credentials)
     request = run_v2.ListServicesRequest(parent=parent)
-    return list(
-        map(
-            lambda p: p.__class__.to_dict(p),
-            client.list_services(request=request),
-        )
-    )
+    return to_dicts(client.list_services(request=request))
 
 
 def list_service_revisions(
@@ -118,11 +114,6 @@ def list_service_revisions(
     if not parent:
         parent = f"project/{project_id}/locations/{region}/services/{name}"
 
-    client = run_v2.RevisionsClient(credentials=credentials)
+    client = clients.get(run_v2.RevisionsClient, credentials)
     request = run_v2.ListRevisionsRequest(parent=parent)
-    return list(
-        map(
-            lambda p: p.__class__.to_dict(p),
-            client.list_revisions(request=request),
-        )
-    )
+    return to_dicts(client.list_revisions(request=request))
@@ -13,15 +13,16 @@
 # limitations under the License.
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from chaoslib.types import Configuration, Secrets
 from google.cloud import compute_v1
 from google.cloud.compute_v1.types import Tags
 
-from chaosgcp import load_credentials, wait_on_extended_operation
+from chaosgcp import clients, load_credentials, wait_on_extended_operation
+from chaosgcp.operations import OperationTracker
 
-__all__ = ["set_instance_tags"]
+__all__ = ["set_instance_tags", "suspend_vm_instances", "resume_vm_instances"]
 logger = logging.getLogger("chaostoolkit")
 
 
@@ -44,7 +45,7 @@ def set_instance_tags(
     credentials = load_credentials(secrets)
 
     # Create a client
-    client = compute_v1.InstancesClient(credentials=credentials)
+    client = clients.get(compute_v1.InstancesClient, credentials)
 
     request = compute_v1.GetInstanceRequest(
         instance=instance_name,
@@ -87,7 +88,7 @@ def suspend_vm_instance(
     credentials = load_credentials(secrets)
 
     # Create a client
-    client = compute_v1.InstancesClient(credentials=credentials)
+    client = clients.get(compute_v1.InstancesClient, credentials)
 
     # Make the request to delete
     operation = client.suspend(
@@ -117,7 +118,7 @@ def resume_vm_instance(
 
     credentials = load_credentials(secrets)
 
-    client = compute_v1.InstancesClient(credentials=credentials)
+    client = clients.get(compute_v1.InstancesClient, credentials)
 
     operation = client.resume(
         project=project_id, zone=zone, instance=instance_name
@@ -131,3 +132,87 @@ def resume_vm_instance(
         )
     else:
         logger.info("Instance resumed successfully")
+
+
+def suspend_vm_instances(
+    project_id: str,
+    zone: str,
+    instance_names: List[str],
+    concurrency: int = 8,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Suspend many GCE VM instances at once
+
+    All the suspensions are requested first and their operations are then
+    awaited concurrently, by up to `concurrency` threads. An instance which
+    cannot be suspended is reported as failed without stopping the others.
+
+    :param project_id : the project ID in which the GCE VMs are present
+    :param zone: the name of the zone where the GCE VMs are present
+    :param instance_names : the names of the GCE VMs to be suspended
+    :return the outcome of each suspension
+    """
+    credentials = load_credentials(secrets)
+    client = clients.get(compute_v1.InstancesClient, credentials)
+
+    with OperationTracker(max_workers=concurrency) as tracker:
+        for instance_name in instance_names:
+            try:
+                operation = client.suspend(
+                    project=project_id, zone=zone, instance=instance_name
+                )
+            except Exception as x:
+                tracker.add_failure(instance_name, x)
+                continue
+            tracker.add_extended_operation(operation, name=instance_name)
+
+        results = tracker.wait()
+
+    for r in results:
+        if not r.ok:
+            logger.error(f"Error during suspension of '{r.name}': {r.error}")
+
+    return [r.to_dict() for r in results]
+
+
+def resume_vm_instances(
+    project_id: str,
+    zone: str,
+    instance_names: List[str],
+    concurrency: int = 8,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Resume many suspended GCE VM instances at once
+
+    All the resumptions are requested first and their operations are then
+    awaited concurrently, by up to `concurrency` threads. An instance which
+    cannot be resumed is reported as failed without stopping the others.
+
+    :param project_id : the project ID in which the GCE VMs are present
+    :param zone: the name of the zone where the GCE VMs are present
+    :param instance_names : the names of the GCE VMs to be resumed
+    :return the outcome of each resumption
+    """
+    credentials = load_credentials(secrets)
+    client = clients.get(compute_v1.InstancesClient, credentials)
+
+    with OperationTracker(max_workers=concurrency) as tracker:
+        for instance_name in instance_names:
+            try:
+                operation = client.resume(
+                    project=project_id, zone=zone, instance=instance_name
+                )
+            except Exception as x:
+                tracker.add_failure(instance_name, x)
+                continue
+            tracker.add_extended_operation(operation, name=instance_name)
+
+        results = tracker.wait()
+
+    for r in results:
+        if not r.ok:
+            logger.error(f"Error during resumption of '{r.name}': {r.error}")
+
+    return [r.to_dict() for r in results]
@@ -0,0 +1,66 @@
+import logging
+from typing import Any
+
+from chaoslib.types import Configuration, Experiment, Journal, Secrets
+
+from chaosgcp import clients, ratelimit, transport
+from chaosgcp.discovery_cache import resource_cache
+
+__all__ = ["configure_control", "after_experiment_control"]
+logger = logging.getLogger("chaostoolkit")
+
+
+def configure_control(
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Apply the rate limits and quota retry policy of the experiment's
+    configuration to all the GCP clients of the process. See
+    `chaosgcp.ratelimit.configure` for the configuration keys.
+
+    ```json
+    "configuration": {
+        "gcp_rate_limits": {
+            "compute": 20,
+            "monitoring": {"rate": 5, "burst": 10}
+        },
+        "gcp_quota_retries": 5
+    }
+    ```
+    """
+    ratelimit.configure(configuration)
+
+
+def after_experiment_control(
+    context: Experiment,
+    state: Journal,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> None:
+    """
+    Close all the GCP clients, and pooled HTTP transports, shared by the
+    activities of the experiment, and forget their rate limits.
+
+    ```json
+    "controls": [
+        {
+            "name": "gcp-clients",
+            "provider": {
+                "type": "python",
+                "module": "chaosgcp.controls.clients"
+            }
+        }
+    ]
+    ```
+    """
+    logger.debug(f"Closing shared GCP clients: {clients.stats()}")
+    clients.shutdown()
+
+    logger.debug(f"Closing pooled HTTP transports: {transport.stats()}")
+    transport.shutdown()
+    resource_cache.clear()
+
+    logger.debug(f"GCP API rate limiting: {ratelimit.stats()}")
+    ratelimit.reset()
@@ -0,0 +1,249 @@
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from chaoslib.types import (
+    Activity,
+    Configuration,
+    Experiment,
+    Journal,
+    Run,
+    Secrets,
+)
+
+from chaosgcp.instrumentation import (
+    NETWORK,
+    OPERATION,
+    Span,
+    add_exporter,
+    remove_exporter,
+)
+
+try:
+    import resource
+
+    HAS_RESOURCE = True
+except ImportError:  # pragma: no cover
+    HAS_RESOURCE = False
+
+__all__ = [
+    "before_experiment_control",
+    "before_activity_control",
+    "after_activity_control",
+    "after_experiment_control",
+]
+logger = logging.getLogger("chaostoolkit")
+
+JOURNAL_EXTENSION = "chaosgcp-profiler"
+
+
+class ActivityProfile:
+    """
+    Resources consumed by a single activity.
+
+    Wall and CPU times are measured around the activity. The CPU time and
+    peak RSS are those of the whole process, so they also account for
+    activities running in the background at the same time. GCP API calls
+    and operation polls are counted from the spans recorded while the
+    activity ran, see `chaosgcp.instrumentation`.
+    """
+
+    def __init__(self, activity: Activity) -> None:
+        self.name = activity.get("name")
+        self.type = activity.get("type")
+        provider = activity.get("provider") or {}
+        self.target = ".".join(
+            filter(None, [provider.get("module"), provider.get("func")])
+        )
+        self.api_calls = 0
+        self.api_retries = 0
+        self.polls = 0
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._rss = peak_rss()
+        self.wall_time: Optional[float] = None
+        self.cpu_time: Optional[float] = None
+        self.peak_rss_delta: Optional[int] = None
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            if span.category == NETWORK:
+                self.api_calls += 1
+                self.api_retries += span.retries
+            elif span.category == OPERATION:
+                self.polls += span.attributes.get("polls", 0)
+            self.durations[span.category] = self.durations.get(
+                span.category, 0.0
+            ) + (span.duration or 0.0)
+
+    def finish(self) -> None:
+        self.wall_time = time.perf_counter() - self._wall
+        self.cpu_time = time.process_time() - self._cpu
+        rss = peak_rss()
+        if rss is not None and self._rss is not None:
+            self.peak_rss_delta = rss - self._rss
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "type": self.type,
+                "target": self.target,
+                "wall_time": self.wall_time,
+                "cpu_time": self.cpu_time,
+                "peak_rss_delta": self.peak_rss_delta,
+                "api_calls": self.api_calls,
+                "api_retries": self.api_retries,
+                "polls": self.polls,
+                "durations": dict(self.durations),
+            }
+
+
+def before_experiment_control(
+    context: Experiment,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Start profiling the activities of the experiment.
+
+    ```json
+    "controls": [
+        {
+            "name": "gcp-profiler",
+            "provider": {
+                "type": "python",
+                "module": "chaosgcp.controls.profiler"
+            }
+        }
+    ]
+    ```
+
+    Each activity gets an entry with its wall time, CPU time, peak RSS
+    delta (in bytes), how many GCP API calls it made and retried, how many
+    times it polled operations, and the time spent per category of work
+    (auth, client, network, operation, serialization). They are stored in
+    the journal as the `chaosgcp-profiler` extension.
+    """
+    profiler.start()
+
+
+def before_activity_control(
+    context: Activity,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    profiler.start_activity(context)
+
+
+def after_activity_control(
+    context: Activity,
+    state: Run,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    profiler.finish_activity(context)
+
+
+def after_experiment_control(
+    context: Experiment,
+    state: Journal,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    profiles = profiler.stop()
+
+    extensions = state.setdefault("extensions", [])
+    extensions.append(
+        {
+            "name": JOURNAL_EXTENSION,
+            "activities": profiles,
+            "summary": summarize(profiles),
+        }
+    )
+
+
+###############################################################################
+# Private functions
+###############################################################################
+class Profiler:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: Dict[int, ActivityProfile] = {}
+        self._profiles: List[Dict[str, Any]] = []
+        self._started = False
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            running = list(self._running.values())
+        for profile in running:
+            profile.record(span)
+
+    def start(self) -> None:
+        with self._lock:
+            self._running.clear()
+            self._profiles = []
+            if self._started:
+                return
+            self._started = True
+        add_exporter(self)
+
+    def start_activity(self, activity: Activity) -> None:
+        if not self._started:
+            # the control was only declared on the activities
+            self.start()
+
+        with self._lock:
+            self._running[id(activity)] = ActivityProfile(activity)
+
+    def finish_activity(self, activity: Activity) -> None:
+        with self._lock:
+            profile = self._running.pop(id(activity), None)
+        if profile is None:
+            return
+
+        profile.finish()
+        data = profile.to_dict()
+        logger.debug(f"Activity profile: {data}")
+        with self._lock:
+            self._profiles.append(data)
+
+    def stop(self) -> List[Dict[str, Any]]:
+        remove_exporter(self)
+        with self._lock:
+            self._started = False
+            self._running.clear()
+            profiles, self._profiles = self._profiles, []
+        return profiles
+
+
+profiler = Profiler()
+
+
+def peak_rss() -> Optional[int]:
+    if not HAS_RESOURCE:
+        return None
+
+    # kilobytes on Linux, bytes on macOS
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def summarize(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    slowest = sorted(profiles, key=lambda p: p["wall_time"] or 0, reverse=True)
+    return {
+        "activities": len(profiles),
+        "wall_time": sum(p["wall_time"] or 0 for p in profiles),
+        "cpu_time": sum(p["cpu_time"] or 0 for p in profiles),
+        "api_calls": sum(p["api_calls"] for p in profiles),
+        "polls": sum(p["polls"] for p in profiles),
+        "slowest": [p["name"] for p in slowest[:5]],
+    }
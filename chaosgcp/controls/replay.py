@@ -0,0 +1,65 @@
+import logging
+from typing import Any, Dict
+
+from chaoslib.types import Configuration, Experiment, Journal, Secrets
+
+from chaosgcp import replay
+
+__all__ = ["before_experiment_control", "after_experiment_control"]
+logger = logging.getLogger("chaostoolkit")
+
+
+def before_experiment_control(
+    context: Experiment,
+    mode: str = replay.REPLAY,
+    cassette: str = None,
+    latency: float = 0.0,
+    endpoints: Dict[str, str] = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Record the calls the experiment's GCP activities make to the APIs into
+    the `cassette` file, or replay them from it without reaching the network,
+    for instance to benchmark the experiment offline.
+
+    ```json
+    "controls": [
+        {
+            "name": "gcp-replay",
+            "provider": {
+                "type": "python",
+                "module": "chaosgcp.controls.replay",
+                "arguments": {
+                    "mode": "record",
+                    "cassette": "experiment-cassette.json"
+                }
+            }
+        }
+    ]
+    ```
+
+    When replaying, `latency` scales the time each call took when it was
+    recorded, `0` answering them immediately. `endpoints` redirects API
+    hosts to local stand-in servers. See `chaosgcp.replay.start`.
+
+    Clients created beforehand are dropped, declare this control before the
+    `chaosgcp.controls.warmup` one.
+    """
+    replay.start(mode, cassette, latency=latency, endpoints=endpoints)
+
+
+def after_experiment_control(
+    context: Experiment,
+    state: Journal,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Stop recording, or replaying, and save the recorded cassette.
+    """
+    cassette = replay.stop()
+    if cassette is not None:
+        logger.debug(f"GCP API calls cassette: {cassette.stats()}")
@@ -0,0 +1,283 @@
+import importlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from chaoslib.types import Configuration, Experiment, Secrets
+
+from chaosgcp import client, clients, load_credentials
+from chaosgcp.auth import credentials_cache
+
+__all__ = ["before_experiment_control", "warmup"]
+logger = logging.getLogger("chaostoolkit")
+
+MAX_WORKERS = 8
+
+# discovery based services and their version
+DISCOVERY_SERVICES = {
+    "sqladmin": "v1",
+    "cloudbuild": "v1",
+    "dns": "v1",
+    "cloudresourcemanager": "v1",
+}
+
+# google-cloud clients, as `module:class`, shared through `chaosgcp.clients`
+CLIENT_SERVICES = {
+    "compute.instances": "google.cloud.compute_v1:InstancesClient",
+    "compute.urlmaps": "google.cloud.compute_v1:UrlMapsClient",
+    "compute.regionurlmaps": "google.cloud.compute_v1:RegionUrlMapsClient",
+    "compute.backendservices": "google.cloud.compute_v1:BackendServicesClient",
+    "compute.regionbackendservices": (
+        "google.cloud.compute_v1:RegionBackendServicesClient"
+    ),
+    "compute.networkendpointgroups": (
+        "google.cloud.compute_v1:NetworkEndpointGroupsClient"
+    ),
+    "monitoring.metrics": "google.cloud.monitoring_v3:MetricServiceClient",
+    "monitoring.query": "google.cloud.monitoring_v3:QueryServiceClient",
+    "monitoring.slo": (
+        "google.cloud.monitoring_v3:ServiceMonitoringServiceClient"
+    ),
+    "run.services": "google.cloud.run_v2:ServicesClient",
+    "run.revisions": "google.cloud.run_v2:RevisionsClient",
+    "container": "google.cloud.container_v1:ClusterManagerClient",
+    "artifactregistry": (
+        "google.cloud.artifactregistry_v1:ArtifactRegistryClient"
+    ),
+    "apphub": "google.cloud.apphub_v1:AppHubClient",
+    "resourcemanager.projects": (
+        "google.cloud.resourcemanager_v3:ProjectsClient"
+    ),
+}
+
+# services used by the activities and controls of each package
+MODULE_SERVICES = {
+    "chaosgcp.sql": ["sqladmin"],
+    "chaosgcp.cloudbuild": ["cloudbuild"],
+    "chaosgcp.dns": ["dns"],
+    "chaosgcp.iam": ["cloudresourcemanager"],
+    "chaosgcp.compute": ["compute.instances"],
+    "chaosgcp.lb": [
+        "compute.urlmaps",
+        "compute.regionurlmaps",
+        "compute.backendservices",
+        "compute.regionbackendservices",
+    ],
+    "chaosgcp.neg": ["compute.networkendpointgroups"],
+    "chaosgcp.monitoring": [
+        "monitoring.metrics",
+        "monitoring.query",
+        "monitoring.slo",
+        "compute.urlmaps",
+        "compute.regionurlmaps",
+    ],
+    "chaosgcp.cloudrun": ["run.services", "run.revisions"],
+    "chaosgcp.gke": ["container"],
+    "chaosgcp.artifact": ["artifactregistry"],
+    "chaosgcp.apphub": [
+        "apphub",
+        "resourcemanager.projects",
+        "compute.urlmaps",
+    ],
+}
+
+
+def before_experiment_control(
+    context: Experiment,
+    services: List[str] = None,
+    timeout: float = 30.0,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Warm up everything the experiment's GCP activities need before it starts,
+    so that the first probe of the steady-state hypothesis is as fast as the
+    following ones.
+
+    ```json
+    "controls": [
+        {
+            "name": "gcp-warmup",
+            "provider": {
+                "type": "python",
+                "module": "chaosgcp.controls.warmup",
+                "secrets": ["gcp"]
+            }
+        }
+    ]
+    ```
+
+    `services` lists the services to warm up, for instance
+    `["sqladmin", "monitoring.slo"]` (see `DISCOVERY_SERVICES` and
+    `CLIENT_SERVICES`). When not set, they are inferred from the `chaosgcp`
+    modules the experiment's activities and controls use.
+
+    In parallel, the credentials are loaded and their access token fetched,
+    the activity modules are imported, the google-cloud clients are created,
+    with their gRPC channels connected, and the discovery documents are
+    loaded. Discovery resources are then built in the calling thread, as
+    they are cached per thread. This never fails the experiment, errors are
+    only logged. Everything is given at most `timeout` seconds.
+    """
+    modules = sorted(experiment_modules(context))
+    if services is None:
+        services = sorted(services_for_modules(modules))
+
+    warmup(
+        services,
+        modules=modules,
+        timeout=timeout,
+        configuration=configuration,
+        secrets=secrets,
+    )
+
+
+def warmup(
+    services: List[str],
+    modules: Optional[List[str]] = None,
+    timeout: float = 30.0,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Warm up the given services and import the given modules. Return the
+    outcome of each task, `None` when it succeeded or its error otherwise.
+    """
+    started = time.perf_counter()
+    tasks: Dict[str, Callable[[], Any]] = {
+        "credentials": lambda: warm_credentials(secrets)
+    }
+    for module in modules or []:
+        tasks[f"import:{module}"] = lambda m=module: importlib.import_module(m)
+
+    discovery = []
+    for service in services:
+        if service in DISCOVERY_SERVICES:
+            discovery.append(service)
+            tasks[service] = lambda s=service: build_resource(
+                s, configuration, secrets
+            )
+        elif service in CLIENT_SERVICES:
+            tasks[service] = lambda s=service: create_client(
+                s, timeout, secrets
+            )
+        else:
+            logger.warning(f"Unknown GCP service '{service}' to warm up")
+
+    outcomes = run_tasks(tasks, timeout)
+
+    # the resources built by the workers are only cached for their thread
+    for service in discovery:
+        if outcomes[service] is None:
+            outcomes[service] = run_task(
+                lambda s=service: build_resource(s, configuration, secrets)
+            )
+
+    failed = {k: v for k, v in outcomes.items() if v is not None}
+    logger.info(
+        f"Warmed up {len(outcomes) - len(failed)} GCP task(s) in "
+        f"{time.perf_counter() - started:.3f}s"
+    )
+    for task, error in failed.items():
+        logger.warning(f"Failed to warm up '{task}': {error}")
+
+    return outcomes
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def experiment_modules(experiment: Experiment) -> Set[str]:
+    modules = set()
+    for provider in iter_providers(experiment):
+        module = provider.get("module")
+        if provider.get("type") == "python" and module:
+            if module.startswith("chaosgcp."):
+                modules.add(module)
+    return modules
+
+
+def iter_providers(value: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(value, dict):
+        provider = value.get("provider")
+        if isinstance(provider, dict):
+            yield provider
+        for v in value.values():
+            yield from iter_providers(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from iter_providers(v)
+
+
+def services_for_modules(modules: List[str]) -> Set[str]:
+    services = set()
+    for module in modules:
+        for package, names in MODULE_SERVICES.items():
+            if module == package or module.startswith(f"{package}."):
+                services.update(names)
+    return services
+
+
+def warm_credentials(secrets: Secrets) -> None:
+    credentials = load_credentials(secrets)
+    if credentials is not None and not credentials.valid:
+        credentials_cache.refresh(credentials)
+
+
+def build_resource(
+    service: str, configuration: Configuration, secrets: Secrets
+) -> None:
+    client(
+        service,
+        DISCOVERY_SERVICES[service],
+        secrets=secrets,
+        configuration=configuration,
+    )
+
+
+def create_client(service: str, timeout: float, secrets: Secrets) -> None:
+    module_name, cls_name = CLIENT_SERVICES[service].split(":")
+    client_cls = getattr(importlib.import_module(module_name), cls_name)
+    c = clients.get(client_cls, load_credentials(secrets))
+
+    channel = getattr(getattr(c, "transport", None), "grpc_channel", None)
+    if channel is not None:
+        import grpc
+
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+
+
+def run_task(task: Callable[[], Any]) -> Optional[str]:
+    try:
+        task()
+    except Exception as e:
+        logger.debug("GCP warm up task failed", exc_info=True)
+        return str(e) or e.__class__.__name__
+    return None
+
+
+def run_tasks(
+    tasks: Dict[str, Callable[[], Any]], timeout: float
+) -> Dict[str, Optional[str]]:
+    executor = ThreadPoolExecutor(
+        max_workers=MAX_WORKERS, thread_name_prefix="chaosgcp-warmup"
+    )
+    try:
+        futures = {
+            name: executor.submit(run_task, task)
+            for name, task in tasks.items()
+        }
+        deadline = time.monotonic() + timeout
+        outcomes = {}
+        for name, future in futures.items():
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                outcomes[name] = future.result(timeout=remaining)
+            except Exception:
+                outcomes[name] = "timed out"
+        return outcomes
+    finally:
+        # tasks still running are left to complete in the background
+        executor.shutdown(wait=False)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+import os
+import os.path
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from chaoslib.types import Configuration
+from googleapiclient.discovery_cache.base import Cache
+from googleapiclient.version import __version__ as googleapiclient_version
+
+__all__ = [
+    "DiscoveryDocumentCache",
+    "ResourceCache",
+    "discovery_cache",
+    "resource_cache",
+    "get_discovery_cache",
+    "get_static_discovery",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# how long a document stored on disk remains valid, in seconds
+MAX_AGE = 86400
+
+
+class DiscoveryDocumentCache(Cache):
+    """
+    Discovery document cache for `googleapiclient.discovery.build`.
+
+    Documents are kept in memory for the lifetime of the process and, when
+    a directory is set, on disk so that subsequent runs do not need to fetch
+    them again. Files on disk are keyed on the document URL and the version
+    of `google-api-python-client` which fetched them, as the library may
+    not be able to use documents fetched by another version.
+
+    The library only stores documents it fetched from the network, that is
+    when `static_discovery` is disabled. Otherwise, it reads the static
+    documents it ships with.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_age: int = MAX_AGE
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._docs: Dict[str, str] = {}
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            content = self._docs.get(url)
+        if content is not None:
+            return content
+
+        content = self._read(url)
+        if content is not None:
+            with self._lock:
+                self._docs[url] = content
+        return content
+
+    def set(self, url: str, content: str) -> None:
+        with self._lock:
+            self._docs[url] = content
+        self._write(url, content)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+
+    def path_for(self, url: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(
+            self.cache_dir, f"{digest}-{googleapiclient_version}.json"
+        )
+
+    def _read(self, url: str) -> Optional[str]:
+        path = self.path_for(url)
+        if not path or not os.path.isfile(path):
+            return None
+
+        if (time.time() - os.path.getmtime(path)) > self.max_age:
+            logger.debug(f"Discovery document at '{path}' is too old")
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            logger.debug(f"Failed to read '{path}'", exc_info=True)
+            return None
+
+    def _write(self, url: str, content: str) -> None:
+        path = self.path_for(url)
+        if not path:
+            return
+
+        tmp = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except OSError:
+            logger.debug(f"Failed to write '{path}'", exc_info=True)
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+
+class ResourceCache:
+    """
+    Per-thread cache of the `Resource` objects built by
+    `googleapiclient.discovery.build`.
+
+    Building a resource parses its whole discovery document, which is
+    expensive for large APIs such as sqladmin. Resources share an `httplib2`
+    transport which is not thread-safe so each thread gets its own.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._generation = 0
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.resources = {}
+            local.generation = self._generation
+
+        resource = local.resources.get(key)
+        if resource is None:
+            resource = local.resources[key] = builder()
+        return resource
+
+    def clear(self) -> None:
+        """
+        Drop the resources of all threads. They rebuild them on next access.
+        """
+        self._generation += 1
+
+
+discovery_cache = DiscoveryDocumentCache(
+    os.getenv("CHAOSGCP_DISCOVERY_CACHE_DIR")
+)
+resource_cache = ResourceCache()
+
+
+def get_discovery_cache(
+    configuration: Configuration = None,
+) -> DiscoveryDocumentCache:
+    """
+    Return the process-wide discovery document cache, pointing it to the
+    directory set by the `gcp_discovery_cache_dir` configuration key, if any.
+    Otherwise, the `CHAOSGCP_DISCOVERY_CACHE_DIR` environment variable is
+    used. Without either, documents are only cached in memory.
+    """
+    cache_dir = (configuration or {}).get("gcp_discovery_cache_dir")
+    if cache_dir:
+        discovery_cache.cache_dir = os.path.expanduser(cache_dir)
+    return discovery_cache
+
+
+def get_static_discovery(configuration: Configuration = None) -> Optional[bool]:
+    """
+    Read the `gcp_static_discovery` configuration key. When unset, `None` is
+    returned so `googleapiclient` applies its own default, which is to use
+    the documents shipped with the library.
+    """
+    value = (configuration or {}).get("gcp_static_discovery")
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
@@ -9,15 +9,16 @@ Typical usage example in an experiment json file:
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 
 from chaosgcp import client
+from chaosgcp.batch import BATCH_LIMIT, execute_batch
 
 
-__all__ = ["update_dns_record"]
+__all__ = ["update_dns_record", "update_dns_records"]
 
 logger = logging.getLogger("chaostoolkit")
 
@@ -49,22 +50,18 @@ def update_dns_record(
     Returns:
         JSON Response which is in form of dictionary
     """
-    service = client("dns", "v1", secrets=secrets)
+    service = client("dns", "v1", secrets=secrets, configuration=configuration)
 
-    dns_record_body = {
-        "kind": kind,
-        "name": name,
-        "rrdatas": [ip_address],
-        "ttl": ttl,
-        "type": record_type,
-    }
-
-    request = service.resourceRecordSets().patch(
-        project=project_id,
-        managedZone=zone_name,
+    request = patch_record_request(
+        service,
+        project_id,
+        zone_name,
         name=name,
-        type=existing_type,
-        body=dns_record_body,
+        ip_address=ip_address,
+        kind=kind,
+        ttl=ttl,
+        record_type=record_type,
+        existing_type=existing_type,
     )
 
     try:
@@ -78,3 +75,101 @@ def update_dns_record(
         )
 
     return response
+
+
+def update_dns_records(
+    project_id: str,
+    zone_name: str,
+    records: List[Dict[str, Any]],
+    kind: str = "dns#resourceRecordSet",
+    ttl: int = 5,
+    record_type: str = "A",
+    existing_type: str = "A",
+    batch_size: int = BATCH_LIMIT,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """Updates many DNS record entries of a zone, It cannot be undone.
+
+    The records are patched in batches of up to `batch_size` calls per HTTP
+    request. A record which cannot be patched does not prevent the others
+    from being patched.
+
+    Args:
+        project_id : the project ID in which the DNS records are present
+        zone_name: the name of the dns zone name which needs to be changed
+        records: the records to change, each one a mapping with the `name`
+            and `ip_address` of the record. It may also set its own `kind`,
+            `ttl`, `record_type` and `existing_type`, which otherwise
+            default to the values below
+        kind : the type of dns record set
+        ttl: time to live for dns record change
+        record_type: the record type for the name
+        existing_type: the existing type of record
+        batch_size: how many records are patched per HTTP request
+        secrets: authorization token
+    Returns:
+        The outcome of each record update, along with its response
+    """
+    service = client("dns", "v1", secrets=secrets, configuration=configuration)
+
+    requests = []
+    for record in records:
+        requests.append(
+            (
+                record["name"],
+                patch_record_request(
+                    service,
+                    project_id,
+                    zone_name,
+                    name=record["name"],
+                    ip_address=record["ip_address"],
+                    kind=record.get("kind", kind),
+                    ttl=record.get("ttl", ttl),
+                    record_type=record.get("record_type", record_type),
+                    existing_type=record.get("existing_type", existing_type),
+                ),
+            )
+        )
+
+    results = execute_batch(service, requests, batch_size=batch_size)
+
+    for r in results:
+        if not r.ok:
+            logger.error(
+                f"patching DNS recordsets '{r.name}' in zone '{zone_name}' "
+                f"failed: {r.error}"
+            )
+
+    return [r.to_dict() for r in results]
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def patch_record_request(
+    service: Any,
+    project_id: str,
+    zone_name: str,
+    name: str,
+    ip_address: str,
+    kind: str,
+    ttl: int,
+    record_type: str,
+    existing_type: str,
+) -> Any:
+    dns_record_body = {
+        "kind": kind,
+        "name": name,
+        "rrdatas": [ip_address],
+        "ttl": ttl,
+        "type": record_type,
+    }
+
+    return service.resourceRecordSets().patch(
+        project=project_id,
+        managedZone=zone_name,
+        name=name,
+        type=existing_type,
+        body=dns_record_body,
+    )
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from chaoslib.exceptions import ActivityFailed
+from chaoslib.types import Configuration, Secrets
+
+__all__ = [
+    "COLLECT_ALL",
+    "FAIL_FAST",
+    "FanoutResult",
+    "TargetTimeout",
+    "run",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# how many targets are called at once by default
+MAX_WORKERS = 8
+
+# keep calling the remaining targets when one of them fails
+COLLECT_ALL = "collect-all"
+# stop calling new targets as soon as one of them fails or times out
+FAIL_FAST = "fail-fast"
+
+# how often targets that have not started yet are checked for a timeout
+POLL_INTERVAL = 0.5
+
+Target = Union[str, Dict[str, Any]]
+
+
+class TargetTimeout(ActivityFailed):
+    pass
+
+
+class FanoutResult(NamedTuple):
+    target: Target
+    result: Any = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "target": self.target,
+            "ok": self.ok,
+            "skipped": self.skipped,
+            "error": str(self.error) if self.error else None,
+            "result": self.result,
+        }
+
+
+def run(
+    func: Union[str, Callable[..., Any]],
+    targets: Union[Iterable[Target], Callable[..., Iterable[Target]]],
+    concurrency: int = MAX_WORKERS,
+    timeout: Optional[float] = None,
+    policy: str = COLLECT_ALL,
+    argument: str = "name",
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Call the activity `func` once per target, with at most `concurrency`
+    calls in flight at once, and return a consolidated result.
+
+    `func` is either a callable or the dotted name of an activity, such as
+    `chaosgcp.compute.actions.suspend_vm_instance`. `targets` is a list, or
+    a selector called with `configuration` and `secrets` returning it. A
+    target that is a string is passed as the `argument` keyword argument,
+    while a dictionary is passed as keyword arguments. In both cases they
+    complement `kwargs`, which are common to all the calls, along with
+    `configuration` and `secrets`.
+
+    ```python
+    from chaosgcp import fanout
+    from chaosgcp.compute.actions import suspend_vm_instance
+
+    summary = fanout.run(
+        suspend_vm_instance,
+        ["vm-1", "vm-2", "vm-3"],
+        concurrency=2,
+        timeout=120,
+        zone="us-central1-a",
+        configuration=configuration,
+        secrets=secrets,
+    )
+    ```
+
+    When `timeout` is set, a call running for longer than that many seconds
+    is reported with a `TargetTimeout` error. Threads cannot be interrupted
+    so the call keeps running in the background, but its outcome is ignored.
+
+    With the `COLLECT_ALL` policy, a failing target does not prevent the
+    others from being called. With `FAIL_FAST`, the targets not yet started
+    when one fails or times out are skipped, while those already in flight
+    are still waited on.
+
+    The returned dictionary tells whether all the targets succeeded, how
+    many succeeded, failed or were skipped, and the result of each target
+    in the order they were given.
+    """
+    if policy not in (COLLECT_ALL, FAIL_FAST):
+        raise ActivityFailed(
+            f"policy must be '{COLLECT_ALL}' or '{FAIL_FAST}', not '{policy}'"
+        )
+
+    if isinstance(func, str):
+        func = load_activity(func)
+
+    if callable(targets):
+        targets = targets(configuration=configuration, secrets=secrets)
+    targets = list(targets)
+
+    kwargs["configuration"] = configuration
+    kwargs["secrets"] = secrets
+
+    results = call_targets(
+        func, targets, argument, kwargs, concurrency, timeout, policy
+    )
+
+    for r in results:
+        if r.error is not None:
+            logger.error(f"Calling target '{r.target}' failed: {r.error}")
+
+    succeeded = sum(1 for r in results if r.ok)
+    skipped = sum(1 for r in results if r.skipped)
+
+    return {
+        "ok": succeeded == len(results),
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded - skipped,
+        "skipped": skipped,
+        "results": [r.to_dict() for r in results],
+    }
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def load_activity(name: str) -> Callable[..., Any]:
+    module_name, _, func_name = name.rpartition(".")
+    try:
+        module = importlib.import_module(module_name)
+        func = getattr(module, func_name)
+    except (ImportError, AttributeError, ValueError):
+        raise ActivityFailed(f"could not find activity '{name}'")
+
+    if not callable(func):
+        raise ActivityFailed(f"'{name}' is not an activity")
+    return func
+
+
+def call_arguments(
+    target: Target, argument: str, kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    if isinstance(target, dict):
+        return {**kwargs, **target}
+    return {**kwargs, argument: target}
+
+
+def call_targets(
+    func: Callable[..., Any],
+    targets: List[Target],
+    argument: str,
+    kwargs: Dict[str, Any],
+    concurrency: int,
+    timeout: Optional[float],
+    policy: str,
+) -> List[FanoutResult]:
+    results: List[Optional[FanoutResult]] = [None] * len(targets)
+    if not targets:
+        return []
+
+    stop = threading.Event()
+    started: Dict[int, float] = {}
+
+    def call(index: int, target: Target) -> FanoutResult:
+        if stop.is_set():
+            return FanoutResult(target, skipped=True)
+
+        started[index] = time.monotonic()
+        try:
+            result = func(**call_arguments(target, argument, kwargs))
+        except Exception as x:
+            logger.debug(f"Calling target '{target}' failed", exc_info=True)
+            if policy == FAIL_FAST:
+                stop.set()
+            return FanoutResult(target, error=x)
+        return FanoutResult(target, result=result)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(targets))),
+        thread_name_prefix="chaosgcp-fanout",
+    )
+    try:
+        pending: Dict[Future, int] = {
+            executor.submit(call, i, t): i for i, t in enumerate(targets)
+        }
+        while pending:
+            done, _ = wait(
+                pending,
+                timeout=next_check(pending, started, timeout),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                index = pending.pop(future)
+                results[index] = future.result()
+
+            if timeout is None:
+                continue
+
+            now = time.monotonic()
+            for future, index in list(pending.items()):
+                start = started.get(index)
+                if start is None or now - start < timeout:
+                    continue
+                del pending[future]
+                error = TargetTimeout(
+                    f"target '{targets[index]}' did not complete within "
+                    f"{timeout}s"
+                )
+                results[index] = FanoutResult(targets[index], error=error)
+                if policy == FAIL_FAST:
+                    stop.set()
+    finally:
+        # calls that timed out are left to complete in the background
+        executor.shutdown(wait=False)
+
+    return results
+
+
+def next_check(
+    pending: Dict[Future, int],
+    started: Dict[int, float],
+    timeout: Optional[float],
+) -> Optional[float]:
+    if timeout is None:
+        return None
+
+    now = time.monotonic()
+    delay = timeout
+    for index in pending.values():
+        start = started.get(index)
+        if start is None:
+            delay = min(delay, POLL_INTERVAL)
+        else:
+            delay = min(delay, start + timeout - now)
+    return max(0.0, delay)
@@ -1,13 +1,13 @@
 import logging
 import re
-import time
 from typing import Any, Dict
 
 from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 from google.cloud import container_v1
 
-from chaosgcp import load_credentials
+from chaosgcp import clients, load_credentials
+from chaosgcp.operations import OperationTimeout, Waiter, gke_operation_poller
 from chaosgcp.types import GCPContext
 
 logger = logging.getLogger("chaostoolkit")
@@ -17,7 +17,7 @@ def get_client(
     configuration: Configuration = None, secrets: Secrets = None
 ) -> container_v1.ClusterManagerClient:
     credentials = load_credentials(secrets)
-    return container_v1.ClusterManagerClient(credentials=credentials)
+    return clients.get(container_v1.ClusterManagerClient, credentials)
 
 
 def wait_on_operation(
@@ -34,20 +34,16 @@ def wait_on_operation(
     is applied.
     """
     parent = ctx.get_operation_parent(op.name)
-    started = time.time()
-
-    while True:
-        response = client.get_operation(name=parent)
-        if response.status == container_v1.Operation.Status.DONE:
-            return response
-
-        if timeout > 0 and (started + timeout) > time.time():
-            raise ActivityFailed(
-                "operation failed in the given allowed timeout"
-            )
-
-        logger.debug(f"Waiting on operation: {parent} => {response.status}")
-        time.sleep(poll_frequency)
+    waiter = Waiter(
+        initial_delay=poll_frequency,
+        max_delay=max(poll_frequency, 30),
+        deadline=timeout if timeout > 0 else None,
+    )
+
+    try:
+        return waiter.wait(gke_operation_poller(client, parent), name=parent)
+    except OperationTimeout:
+        raise ActivityFailed("operation failed in the given allowed timeout")
 
 
 def convert_nodepool_format(body: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from chaosk8s.node.actions import drain_nodes
 from chaoslib.exceptions import ActivityFailed
@@ -13,6 +13,7 @@ from chaosgcp.gke.nodepool import (
     get_client,
     wait_on_operation,
 )
+from chaosgcp.operations import OperationResult, OperationTracker
 
 __all__ = [
     "create_new_nodepool",
@@ -20,6 +21,7 @@ __all__ = [
     "swap_nodepool",
     "rollback_nodepool",
     "resize_nodepool",
+    "resize_nodepools",
 ]
 logger = logging.getLogger("chaostoolkit")
 
@@ -240,3 +242,78 @@ def resize_nodepool(
         response = wait_on_operation(client, response, ctx)
 
     return response
+
+
+def resize_nodepools(
+    node_pool_ids: List[str],
+    pool_size: int,
+    wait_until_complete: bool = True,
+    concurrency: int = 8,
+    project_id: str = None,
+    region: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Resize many cluster nodepools at once.
+
+    Each nodepool is either its full path
+    `projects/*/locations/*/clusters/*/nodePools/*` or its name. In the
+    latter case, the `project_id`, `region` and cluster are resolved as
+    for `resize_nodepool`.
+
+    All the resizes are requested first and, when `wait_until_complete` is
+    set (the default), their operations are then awaited concurrently by up
+    to `concurrency` threads. A nodepool which cannot be resized is reported
+    as failed without stopping the others.
+    """
+    client = get_client(configuration, secrets)
+
+    # a resize which cannot be requested does not prevent the others
+    operations = []
+    for node_pool_id in node_pool_ids:
+        parent = node_pool_id
+        try:
+            if not node_pool_id.startswith("projects/"):
+                parent = get_parent(
+                    node_pool_id=node_pool_id,
+                    configuration=configuration,
+                    project_id=project_id,
+                    region=region,
+                )
+            request = container_v1.SetNodePoolSizeRequest(
+                parent=parent,
+                node_count=pool_size,
+            )
+            response = client.set_node_pool_size(request=request)
+        except Exception as x:
+            logger.debug(f"Resizing nodepool '{parent}' failed to start: {x}")
+            response = OperationResult(parent, error=x)
+        else:
+            logger.debug("NodePool resize: {}".format(str(response)))
+        operations.append((parent, response))
+
+    if not wait_until_complete:
+        return [
+            response.to_dict()
+            if isinstance(response, OperationResult)
+            else to_dict(response)
+            for _, response in operations
+        ]
+
+    with OperationTracker(max_workers=concurrency) as tracker:
+        for parent, response in operations:
+            if isinstance(response, OperationResult):
+                tracker.add_failure(parent, response.error)
+                continue
+            ctx = context_from_parent_path(parent)
+            tracker.add_gke_operation(
+                client, ctx.get_operation_parent(response.name), name=parent
+            )
+        results = tracker.wait()
+
+    for r in results:
+        if not r.ok:
+            logger.error(f"Resizing nodepool '{r.name}' failed: {r.error}")
+
+    return [r.to_dict() for r in results]
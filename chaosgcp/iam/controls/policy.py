@@ -84,6 +84,7 @@ def before_experiment_control(
             roles_iam_condition,
             "add",
             iam_propogation_sleep_time_in_minutes,
+            configuration=configuration,
             secrets=secrets,
         )
     except Exception as e:
@@ -150,6 +151,7 @@ def after_experiment_control(
             roles_iam_condition,
             "remove",
             iam_propogation_sleep_time_in_minutes,
+            configuration=configuration,
             secrets=secrets,
         )
     except Exception as e:
@@ -166,6 +168,7 @@ def manage_time_bound_temporary_iam_roles(
     roles_iam_condition: Dict[str, str],
     manage_type: str,
     iam_propogation_sleep_time_in_minutes: int = 2,
+    configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> None:
     """Manages temporary, time-bound IAM roles for the specified project and members.
@@ -211,7 +214,9 @@ def manage_time_bound_temporary_iam_roles(
     """
 
     # Initializes service.
-    crm_service = initialize_service(secrets=secrets)
+    crm_service = initialize_service(
+        configuration=configuration, secrets=secrets
+    )
 
     if manage_type == "add":
         logger.info("Adding Conditional Roles..")
@@ -238,6 +243,7 @@ def manage_time_bound_temporary_iam_roles(
 
 
 def initialize_service(
+    configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> Dict:
     """Initializes a Cloud Resource Manager service."""
@@ -248,7 +254,12 @@ def initialize_service(
     # crm_service = googleapiclient.discovery.build(
     #    "cloudresourcemanager", "v1", credentials=credentials
     # )
-    crm_service = client("cloudresourcemanager", "v1", secrets=secrets)
+    crm_service = client(
+        "cloudresourcemanager",
+        "v1",
+        secrets=secrets,
+        configuration=configuration,
+    )
     return crm_service
 
 
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from chaoslib.types import Journal
+
+__all__ = [
+    "Span",
+    "SpanCollector",
+    "OpenTelemetryExporter",
+    "add_exporter",
+    "remove_exporter",
+    "span",
+    "instrumented_request_class",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# categories of spans, so their time can be broken down
+AUTH = "auth"
+CLIENT = "client"
+NETWORK = "network"
+OPERATION = "operation"
+SERIALIZATION = "serialization"
+
+# how many spans an in-memory collector keeps before dropping the oldest
+MAX_SPANS = 10000
+
+JOURNAL_EXTENSION = "chaosgcp-instrumentation"
+
+
+class Span:
+    """
+    A timed unit of work performed on behalf of an activity: loading
+    credentials, building a client, calling an API, polling an operation or
+    serializing a response.
+
+    `start` and `end` are epoch timestamps, in seconds, while `duration` is
+    measured with a monotonic clock. API calls also record the bytes they
+    sent and received and how many times they were retried.
+    """
+
+    __slots__ = (
+        "name",
+        "category",
+        "method",
+        "start",
+        "end",
+        "duration",
+        "bytes_in",
+        "bytes_out",
+        "retries",
+        "error",
+        "attributes",
+        "_started",
+    )
+
+    def __init__(
+        self, name: str, category: str, method: Optional[str] = None
+    ) -> None:
+        self.name = name
+        self.category = category
+        self.method = method
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = {}
+        self._started = time.monotonic()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration = time.monotonic() - self._started
+        self.end = self.start + self.duration
+        if error is not None:
+            self.error = f"{error.__class__.__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "method": self.method,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanCollector:
+    """
+    Keep the spans of the process in memory, up to `max_spans` of them.
+
+    ```python
+    collector = SpanCollector()
+    add_exporter(collector)
+    try:
+        ...
+    finally:
+        remove_exporter(collector)
+    collector.attach(journal)
+    ```
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS) -> None:
+        self._lock = threading.Lock()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Count, total duration, bytes and retries of the spans per category.
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for s in self.spans:
+            entry = summary.setdefault(
+                s.category,
+                {
+                    "count": 0,
+                    "duration": 0.0,
+                    "bytes_in": 0,
+                    "bytes_out": 0,
+                    "retries": 0,
+                    "errors": 0,
+                },
+            )
+            entry["count"] += 1
+            entry["duration"] += s.duration or 0.0
+            entry["bytes_in"] += s.bytes_in
+            entry["bytes_out"] += s.bytes_out
+            entry["retries"] += s.retries
+            entry["errors"] += 1 if s.error else 0
+        return summary
+
+    def to_extension(self) -> Dict[str, Any]:
+        return {
+            "name": JOURNAL_EXTENSION,
+            "summary": self.summary(),
+            "spans": [s.to_dict() for s in self.spans],
+        }
+
+    def attach(self, journal: Journal) -> None:
+        """
+        Store the collected spans, and their summary, as an extension of the
+        journal.
+        """
+        extensions = journal.setdefault("extensions", [])
+        extensions.append(self.to_extension())
+
+
+class OpenTelemetryExporter:
+    """
+    Export spans to OpenTelemetry, through the tracer provider configured
+    by the application. This requires the `opentelemetry-api` package,
+    installed with the `opentelemetry` extra.
+    """
+
+    def __init__(self, tracer_provider: Any = None) -> None:
+        from opentelemetry import trace
+
+        self.tracer = trace.get_tracer(
+            "chaosgcp", tracer_provider=tracer_provider
+        )
+
+    def __call__(self, span: Span) -> None:
+        attributes = {
+            "chaosgcp.category": span.category,
+            "chaosgcp.bytes_in": span.bytes_in,
+            "chaosgcp.bytes_out": span.bytes_out,
+            "chaosgcp.retries": span.retries,
+        }
+        if span.method:
+            attributes["chaosgcp.method"] = span.method
+        for k, v in span.attributes.items():
+            if isinstance(v, (str, bool, int, float)):
+                attributes[f"chaosgcp.{k}"] = v
+
+        otel_span = self.tracer.start_span(
+            span.name,
+            start_time=int(span.start * 1e9),
+            attributes=attributes,
+        )
+        if span.error:
+            from opentelemetry.trace import Status, StatusCode
+
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int(span.end * 1e9))
+
+
+def add_exporter(exporter: Callable[[Span], None]) -> None:
+    """
+    Register a callable receiving every finished span. Spans are only
+    recorded while at least one exporter is registered.
+    """
+    global _exporters
+    with _exporters_lock:
+        _exporters = _exporters + [exporter]
+
+
+def remove_exporter(exporter: Callable[[Span], None]) -> None:
+    global _exporters
+    with _exporters_lock:
+        _exporters = [e for e in _exporters if e is not exporter]
+
+
+@contextmanager
+def span(
+    name: str, category: str, method: Optional[str] = None
+) -> Iterator[Span]:
+    """
+    Time the enclosed block as a span and hand it over to the exporters.
+
+    When no exporter is registered, a throw-away span is given so that
+    instrumented code does not pay for recording.
+    """
+    if not _exporters:
+        yield NullSpan(name, category, method)
+        return
+
+    s = Span(name, category, method)
+    try:
+        yield s
+    except BaseException as e:
+        s.finish(e)
+        export(s)
+        raise
+    s.finish()
+    export(s)
+
+
+@lru_cache(maxsize=1)
+def instrumented_request_class() -> type:
+    """
+    A `googleapiclient.http.HttpRequest` recording each call to a discovery
+    based API as a span, with the bytes it sent and received and the number
+    of times it was retried. Pass it to `build` as its `requestBuilder`.
+    """
+    from googleapiclient.http import HttpRequest
+
+    class InstrumentedHttpRequest(HttpRequest):
+        def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+            with span("api.call", NETWORK, method=self.methodId) as s:
+                s.bytes_out = len(self.body or b"")
+                postproc = self.postproc
+                sleep = self._sleep
+
+                def counting_postproc(resp: Any, content: bytes) -> Any:
+                    s.bytes_in = len(content or b"")
+                    return postproc(resp, content)
+
+                def counting_sleep(seconds: float) -> None:
+                    s.retries += 1
+                    sleep(seconds)
+
+                self.postproc = counting_postproc
+                self._sleep = counting_sleep
+                try:
+                    return super().execute(http=http, num_retries=num_retries)
+                finally:
+                    self.postproc = postproc
+                    self._sleep = sleep
+
+    return InstrumentedHttpRequest
+
+
+###############################################################################
+# Private functions
+###############################################################################
+# replaced, never mutated, so it can be read without holding the lock
+_exporters: List[Callable[[Span], None]] = []
+_exporters_lock = threading.Lock()
+
+
+class NullSpan(Span):
+    __slots__ = ()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+
+def export(s: Span) -> None:
+    for exporter in _exporters:
+        try:
+            exporter(s)
+        except Exception:
+            logger.debug("Span exporter failed", exc_info=True)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+__all__ = ["parse_datetime", "parse_duration"]
+
+# how many distinct inputs we remember the parsing of
+CACHE_SIZE = 256
+
+UNITS = {
+    "s": 1,
+    "sec": 1,
+    "secs": 1,
+    "second": 1,
+    "seconds": 1,
+    "m": 60,
+    "min": 60,
+    "mins": 60,
+    "minute": 60,
+    "minutes": 60,
+    "h": 3600,
+    "hr": 3600,
+    "hrs": 3600,
+    "hour": 3600,
+    "hours": 3600,
+    "d": 86400,
+    "day": 86400,
+    "days": 86400,
+    "w": 604800,
+    "week": 604800,
+    "weeks": 604800,
+}
+
+DURATION_RE = re.compile(
+    r"^(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>[a-z]+)(?:\s+ago)?$", re.IGNORECASE
+)
+ISO_RE = re.compile(
+    r"^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})"
+    r"(?:[T ](?P<hour>\d{2}):(?P<minute>\d{2})"
+    r"(?::(?P<second>\d{2})(?:\.(?P<fraction>\d{1,6}))?)?)?"
+    r"\s*(?P<tz>Z|[+-]\d{2}:?\d{2})?$",
+    re.IGNORECASE,
+)
+
+
+def parse_datetime(
+    value: str, relative_base: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Parse `value` into a timezone aware UTC datetime the way `dateparser`
+    does with the `UTC` timezone setting.
+
+    `now`, ISO-8601 timestamps and durations such as `5 minutes`, `1h` or
+    `300s`, counted backwards from `relative_base` (or now), are parsed
+    directly. Anything else is handed to `dateparser`, which is
+    considerably slower.
+
+    Returns `None` when the value cannot be parsed.
+    """
+    base = relative_base or datetime.now(timezone.utc)
+    text = value.strip()
+
+    if text.lower() == "now":
+        return base
+
+    delta = parse_duration(text)
+    if delta is not None:
+        return base - delta
+
+    timestamp = parse_iso(text)
+    if timestamp is not None:
+        return timestamp
+
+    return parse_with_dateparser(value, relative_base)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_duration(value: str) -> Optional[timedelta]:
+    """
+    Parse durations such as `5 minutes`, `1h`, `1.5 hours ago` or `300s`.
+    Months and years are left to `dateparser` as their length depends on
+    the calendar.
+    """
+    m = DURATION_RE.match(value.strip())
+    if not m:
+        return None
+
+    seconds = UNITS.get(m.group("unit").lower())
+    if seconds is None:
+        return None
+
+    return timedelta(seconds=float(m.group("amount")) * seconds)
+
+
+###############################################################################
+# Private functions
+###############################################################################
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_iso(value: str) -> Optional[datetime]:
+    m = ISO_RE.match(value)
+    if not m:
+        return None
+
+    fraction = (m.group("fraction") or "0").ljust(6, "0")
+    try:
+        timestamp = datetime(
+            int(m.group("year")),
+            int(m.group("month")),
+            int(m.group("day")),
+            int(m.group("hour") or 0),
+            int(m.group("minute") or 0),
+            int(m.group("second") or 0),
+            int(fraction),
+            tzinfo=timezone.utc,
+        )
+    except ValueError:
+        return None
+
+    tz = m.group("tz")
+    if tz and tz.upper() != "Z":
+        sign = -1 if tz[0] == "-" else 1
+        digits = tz[1:].replace(":", "")
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        timestamp = timestamp - sign * offset
+
+    return timestamp
+
+
+def parse_with_dateparser(
+    value: str, relative_base: Optional[datetime] = None
+) -> Optional[datetime]:
+    import dateparser
+
+    settings = {"TIMEZONE": "UTC", "RETURN_AS_TIMEZONE_AWARE": True}
+    if relative_base is not None:
+        settings["RELATIVE_BASE"] = relative_base
+
+    return dateparser.parse(value, settings=settings)
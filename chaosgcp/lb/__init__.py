@@ -1,19 +1,34 @@
 import logging
 import re
-from typing import List, Tuple
+from typing import Any, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from chaoslib.exceptions import ActivityFailed
+from chaoslib.types import Configuration
+from google.cloud import compute_v1
 from google.cloud.compute_v1.types import compute
 
+from chaosgcp import clients
+from chaosgcp.cache import ALL, CacheKey, cached, invalidate
+
 logger = logging.getLogger("chaostoolkit")
 
 __all__ = [
     "get_fault_injection_policy",
     "remove_fault_injection_policy",
     "get_route_action_from_url",
+    "get_url_map",
+    "list_url_maps",
+    "list_all_url_maps",
+    "get_backend_service",
+    "invalidate_url_map",
 ]
 
+URL_MAPS_API = "compute.urlMaps"
+BACKEND_SERVICES_API = "compute.backendServices"
+# the scope of global resources
+GLOBAL = "global"
+
 
 def get_fault_injection_policy(
     urlmap: compute.UrlMap, target_name: str, target_path: str
@@ -36,6 +51,114 @@ def get_fault_injection_policy_from_url(
     return get_route_action_from_url(urlmaps, url)
 
 
+def get_url_map(
+    credentials: Any,
+    project: str,
+    url_map: str,
+    region: Optional[str] = None,
+    configuration: Configuration = None,
+) -> compute.UrlMap:
+    """
+    Read a URL map, regional when `region` is set, through the read cache.
+    """
+
+    def load() -> compute.UrlMap:
+        if region:
+            client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
+            return client.get(
+                request=compute_v1.GetRegionUrlMapRequest(
+                    project=project, url_map=url_map, region=region
+                )
+            )
+
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
+        return client.get(
+            request=compute_v1.GetUrlMapRequest(
+                project=project, url_map=url_map
+            )
+        )
+
+    key = CacheKey(URL_MAPS_API, url_map, project, region or GLOBAL)
+    return cached(key, load, configuration)
+
+
+def list_url_maps(
+    credentials: Any,
+    project: str,
+    region: Optional[str] = None,
+    configuration: Configuration = None,
+) -> List[compute.UrlMap]:
+    """
+    List the URL maps of the project, the regional ones when `region` is
+    set, through the read cache.
+    """
+
+    def load() -> List[compute.UrlMap]:
+        if region:
+            client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
+            request = compute_v1.ListRegionUrlMapsRequest(
+                project=project, region=region
+            )
+        else:
+            client = clients.get(compute_v1.UrlMapsClient, credentials)
+            request = compute_v1.ListUrlMapsRequest(project=project)
+        return list(client.list(request=request))
+
+    key = CacheKey(URL_MAPS_API, ALL, project, region or GLOBAL)
+    return cached(key, load, configuration)
+
+
+def list_all_url_maps(
+    credentials: Any,
+    project: str,
+    configuration: Configuration = None,
+) -> List[Tuple[str, compute.UrlMapsScopedList]]:
+    """
+    List the URL maps of the project across all regions, as
+    `(scope, url maps)` pairs, through the read cache.
+    """
+
+    def load() -> List[Tuple[str, compute.UrlMapsScopedList]]:
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
+        request = compute_v1.AggregatedListUrlMapsRequest(project=project)
+        return list(client.aggregated_list(request=request))
+
+    key = CacheKey(URL_MAPS_API, ALL, project, ALL)
+    return cached(key, load, configuration)
+
+
+def get_backend_service(
+    credentials: Any,
+    project: str,
+    backend_service: str,
+    configuration: Configuration = None,
+) -> compute.BackendService:
+    """
+    Read a global backend service through the read cache.
+    """
+
+    def load() -> compute.BackendService:
+        client = clients.get(compute_v1.BackendServicesClient, credentials)
+        return client.get(
+            request=compute_v1.GetBackendServiceRequest(
+                backend_service=backend_service, project=project
+            )
+        )
+
+    key = CacheKey(BACKEND_SERVICES_API, backend_service, project, GLOBAL)
+    return cached(key, load, configuration)
+
+
+def invalidate_url_map(
+    project: str, url_map: str, region: Optional[str] = None
+) -> None:
+    """
+    Forget the cached reads of a URL map, and of the lists it belongs to,
+    once it was updated.
+    """
+    invalidate(URL_MAPS_API, url_map, project, region or GLOBAL)
+
+
 ###############################################################################
 # Private function
 ###############################################################################
@@ -7,6 +7,7 @@ from chaoslib.types import Configuration, Secrets
 from google.cloud import compute_v1
 
 from chaosgcp import (
+    clients,
     get_context,
     load_credentials,
     wait_on_extended_operation,
@@ -15,7 +16,11 @@ from chaosgcp.lb import (
     get_fault_injection_policy,
     remove_fault_injection_policy,
     get_fault_injection_policy_from_url,
+    get_url_map,
+    invalidate_url_map,
+    list_url_maps,
 )
+from chaosgcp.serializer import to_dict
 
 __all__ = [
     "inject_traffic_delay",
@@ -96,20 +101,17 @@ def inject_traffic_delay(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.GetRegionUrlMapRequest(
-            project=project,
-            url_map=url_map,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.GetUrlMapRequest(
-            project=project,
-            url_map=url_map,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmap = client.get(request=request)
+    urlmap = get_url_map(
+        credentials,
+        project,
+        url_map,
+        region=region if regional else None,
+        configuration=configuration,
+    )
 
     fip = get_fault_injection_policy(urlmap, target_name, target_path)
 
@@ -133,8 +135,9 @@ def inject_traffic_delay(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, url_map, region if regional else None)
 
-    return urlmap.__class__.to_dict(urlmap)
+    return to_dict(urlmap)
 
 
 def inject_traffic_faults(
@@ -198,20 +201,17 @@ def inject_traffic_faults(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.GetRegionUrlMapRequest(
-            project=project,
-            url_map=url_map,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.GetUrlMapRequest(
-            project=project,
-            url_map=url_map,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmap = client.get(request=request)
+    urlmap = get_url_map(
+        credentials,
+        project,
+        url_map,
+        region=region if regional else None,
+        configuration=configuration,
+    )
 
     fip = get_fault_injection_policy(urlmap, target_name, target_path)
 
@@ -234,8 +234,9 @@ def inject_traffic_faults(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, url_map, region if regional else None)
 
-    return urlmap.__class__.to_dict(urlmap)
+    return to_dict(urlmap)
 
 
 def remove_fault_injection_traffic_policy(
@@ -290,20 +291,17 @@ def remove_fault_injection_traffic_policy(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.GetRegionUrlMapRequest(
-            project=project,
-            url_map=url_map,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.GetUrlMapRequest(
-            project=project,
-            url_map=url_map,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmap = client.get(request=request)
+    urlmap = get_url_map(
+        credentials,
+        project,
+        url_map,
+        region=region if regional else None,
+        configuration=configuration,
+    )
 
     remove_fault_injection_policy(urlmap, target_name, target_path)
 
@@ -323,8 +321,9 @@ def remove_fault_injection_traffic_policy(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, url_map, region if regional else None)
 
-    return urlmap.__class__.to_dict(urlmap)
+    return to_dict(urlmap)
 
 
 def add_latency_to_endpoint(
@@ -361,18 +360,13 @@ def add_latency_to_endpoint(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.ListRegionUrlMapsRequest(
-            project=project,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.ListUrlMapsRequest(
-            project=project,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmaps = client.list(request=request)
+    urlmaps = list_url_maps(
+        credentials, project, region=region, configuration=configuration
+    )
     url_map, route_action = get_fault_injection_policy_from_url(urlmaps, url)
 
     urlmap_name = url_map.name
@@ -397,8 +391,9 @@ def add_latency_to_endpoint(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, urlmap_name, region)
 
-    return url_map.__class__.to_dict(url_map)
+    return to_dict(url_map)
 
 
 def remove_latency_from_endpoint(
@@ -428,18 +423,13 @@ def remove_latency_from_endpoint(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.ListRegionUrlMapsRequest(
-            project=project,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.ListUrlMapsRequest(
-            project=project,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmaps = client.list(request=request)
+    urlmaps = list_url_maps(
+        credentials, project, region=region, configuration=configuration
+    )
 
     url_map, route_action = get_fault_injection_policy_from_url(urlmaps, url)
 
@@ -462,8 +452,9 @@ def remove_latency_from_endpoint(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, urlmap_name, region)
 
-    return url_map.__class__.to_dict(url_map)
+    return to_dict(url_map)
 
 
 def set_status_code_on_endpoint(
@@ -498,18 +489,13 @@ def set_status_code_on_endpoint(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.ListRegionUrlMapsRequest(
-            project=project,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.ListUrlMapsRequest(
-            project=project,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmaps = client.list(request=request)
+    urlmaps = list_url_maps(
+        credentials, project, region=region, configuration=configuration
+    )
 
     url_map, route_action = get_fault_injection_policy_from_url(urlmaps, url)
 
@@ -534,8 +520,9 @@ def set_status_code_on_endpoint(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, urlmap_name, region)
 
-    return url_map.__class__.to_dict(url_map)
+    return to_dict(url_map)
 
 
 def reset_status_code_on_endpoint(
@@ -565,18 +552,13 @@ def reset_status_code_on_endpoint(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.ListRegionUrlMapsRequest(
-            project=project,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.ListUrlMapsRequest(
-            project=project,
-        )
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
 
-    urlmaps = client.list(request=request)
+    urlmaps = list_url_maps(
+        credentials, project, region=region, configuration=configuration
+    )
 
     url_map, route_action = get_fault_injection_policy_from_url(urlmaps, url)
 
@@ -599,5 +581,6 @@ def reset_status_code_on_endpoint(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, urlmap_name, region)
 
-    return url_map.__class__.to_dict(url_map)
+    return to_dict(url_map)
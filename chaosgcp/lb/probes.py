@@ -6,8 +6,21 @@ from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 from google.cloud import compute_v1
 
-from chaosgcp import get_context, load_credentials, wait_on_extended_operation
-from chaosgcp.lb import get_fault_injection_policy
+from chaosgcp import (
+    clients,
+    get_context,
+    load_credentials,
+    singleflight,
+    wait_on_extended_operation,
+)
+from chaosgcp.lb import (
+    get_backend_service,
+    get_fault_injection_policy,
+    get_url_map,
+    invalidate_url_map,
+)
+from chaosgcp.serializer import to_dict
+from chaosgcp.singleflight import request_key
 
 
 __all__ = ["get_backend_service_health", "get_fault_injection_traffic_policy"]
@@ -34,16 +47,14 @@ def get_backend_service_health(
 
     health_per_group = []
 
-    client = compute_v1.BackendServicesClient(credentials=credentials)
-
-    request = compute_v1.GetBackendServiceRequest(
-        backend_service=backend_service,
-        project=project,
+    svc = get_backend_service(
+        credentials, project, backend_service, configuration=configuration
     )
-    svc = client.get(request=request)
 
     if region:
-        client = compute_v1.RegionBackendServicesClient(credentials=credentials)
+        client = clients.get(
+            compute_v1.RegionBackendServicesClient, credentials
+        )
 
         for backend in svc.backends:
             neg = backend.group
@@ -56,10 +67,10 @@ def get_backend_service_health(
                     group=neg
                 ),
             )
-            response = client.get_health(request=request)
-            health_per_group.append(response.__class__.to_dict(response))
+            response = get_health(client, request, credentials)
+            health_per_group.append(to_dict(response))
     else:
-        client = compute_v1.BackendServicesClient(credentials=credentials)
+        client = clients.get(compute_v1.BackendServicesClient, credentials)
 
         for backend in svc.backends:
             neg = backend.group
@@ -71,8 +82,8 @@ def get_backend_service_health(
                     group=neg
                 ),
             )
-            response = client.get_health(request=request)
-            health_per_group.append(response.__class__.to_dict(response))
+            response = get_health(client, request, credentials)
+            health_per_group.append(to_dict(response))
 
     return health_per_group
 
@@ -129,20 +140,17 @@ def get_fault_injection_traffic_policy(
                 "when `regional` is set, the `gcp_region` configuration key "
                 "must also be set"
             )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.GetRegionUrlMapRequest(
-            project=project,
-            url_map=url_map,
-            region=region,
-        )
+        client = clients.get(compute_v1.RegionUrlMapsClient, credentials)
     else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.GetUrlMapRequest(
-            project=project,
-            url_map=url_map,
-        )
-
-    urlmap = client.get(request=request)
+        client = clients.get(compute_v1.UrlMapsClient, credentials)
+
+    urlmap = get_url_map(
+        credentials,
+        project,
+        url_map,
+        region=region if regional else None,
+        configuration=configuration,
+    )
 
     fault = get_fault_injection_policy(urlmap, target_name, target_path)
 
@@ -162,5 +170,16 @@ def get_fault_injection_traffic_policy(
 
     operation = client.update(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate_url_map(project, url_map, region if regional else None)
 
-    return fault.__class__.to_dict(fault)
+    return to_dict(fault)
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def get_health(client: Any, request: Any, credentials: Any) -> Any:
+    return singleflight.do(
+        request_key("get_health", request, credentials),
+        lambda: client.get_health(request=request),
+    )
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import json
+import logging
+import os
+import os.path
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from chaoslib.types import DiscoveredActivities
+
+__all__ = [
+    "ACTIVITY_MODULES",
+    "MANIFEST_PATH",
+    "build_manifest",
+    "discover_activities",
+    "load_manifest",
+    "write_manifest",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# bump whenever the layout of the manifest changes
+MANIFEST_FORMAT = 1
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(PACKAGE_DIR, "activities.json")
+
+ACTIVITY_MODULES: List[Tuple[str, str]] = [
+    ("chaosgcp.gke.nodepool.actions", "action"),
+    ("chaosgcp.gke.nodepool.probes", "probe"),
+    ("chaosgcp.sql.actions", "action"),
+    ("chaosgcp.sql.probes", "probe"),
+    ("chaosgcp.storage.probes", "probe"),
+    ("chaosgcp.cloudbuild.actions", "action"),
+    ("chaosgcp.cloudbuild.probes", "probe"),
+    ("chaosgcp.cloudrun.actions", "action"),
+    ("chaosgcp.cloudrun.probes", "probe"),
+    ("chaosgcp.monitoring.probes", "probe"),
+    ("chaosgcp.cloudlogging.probes", "probe"),
+    ("chaosgcp.artifact.probes", "probe"),
+    ("chaosgcp.lb.actions", "action"),
+    ("chaosgcp.lb.probes", "action"),
+    ("chaosgcp.neg.probes", "probe"),
+    ("chaosgcp.neg.actions", "action"),
+    ("chaosgcp.compute.actions", "action"),
+    ("chaosgcp.dns.actions", "action"),
+]
+
+
+def discover_activities() -> List[DiscoveredActivities]:
+    """
+    Introspect all the activity modules of the extension. This imports each
+    one of them, and therefore every google-cloud library they rely on.
+    """
+    from chaoslib.discovery.discover import discover_actions, discover_probes
+
+    activities = []
+    for module, kind in ACTIVITY_MODULES:
+        if kind == "action":
+            activities.extend(discover_actions(module))
+        else:
+            activities.extend(discover_probes(module))
+    return activities
+
+
+def build_manifest() -> Dict[str, Any]:
+    """
+    Build the manifest of the activities exported by the extension.
+
+    Along with the activities, it records a fingerprint of the source of
+    every activity module so that a manifest which does not reflect the code
+    anymore is detected and ignored.
+    """
+    return {
+        "format": MANIFEST_FORMAT,
+        "fingerprint": sources_fingerprint(),
+        "activities": discover_activities(),
+    }
+
+
+def write_manifest(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate the manifest and store it at `path`, which defaults to the one
+    shipped with the package.
+    """
+    path = path or MANIFEST_PATH
+    manifest = build_manifest()
+    directory = os.path.dirname(os.path.abspath(path))
+
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return manifest
+
+
+def load_manifest(
+    path: Optional[str] = None,
+) -> Optional[List[DiscoveredActivities]]:
+    """
+    Return the activities of the manifest at `path` or `None` when it is
+    missing, unreadable or stale, in which case the caller should fall back
+    to `discover_activities`.
+
+    Checking freshness only hashes the source files, it does not import
+    any of the activity modules.
+    """
+    path = path or MANIFEST_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        logger.debug(f"No usable activity manifest at '{path}'")
+        return None
+
+    if manifest.get("format") != MANIFEST_FORMAT:
+        logger.debug("Activity manifest format is not supported")
+        return None
+
+    if manifest.get("fingerprint") != sources_fingerprint():
+        logger.debug("Activity manifest is stale")
+        return None
+
+    return manifest.get("activities")
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def module_path(module: str) -> str:
+    # resolved by hand so that the module, and its parent packages, do not
+    # get imported
+    parts = module.split(".")[1:]
+    return os.path.join(PACKAGE_DIR, *parts) + ".py"
+
+
+def sources_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for module, kind in ACTIVITY_MODULES:
+        digest.update(f"{module}:{kind}\n".encode("utf-8"))
+        try:
+            with open(module_path(module), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m chaosgcp.manifest",
+        description="Generate the activity manifest shipped with chaosgcp",
+    )
+    parser.add_argument("--path")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with an error when the manifest is stale",
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if load_manifest(args.path) is None:
+            path = args.path or MANIFEST_PATH
+            print(f"'{path}' is stale, regenerate it", file=sys.stderr)
+            return 1
+        return 0
+
+    manifest = write_manifest(args.path)
+    count = len(manifest["activities"])
+    print(f"Wrote {count} activities to '{args.path or MANIFEST_PATH}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from chaoslib.types import Configuration
+from google.cloud import monitoring_v3
+
+from chaosgcp import clients
+from chaosgcp.cache import ALL, CacheKey, cached, invalidate
+from chaosgcp.serializer import to_dict
+
+logger = logging.getLogger("chaostoolkit")
+
+__all__ = [
+    "get_service_level_objective",
+    "get_slo_name",
+    "invalidate_slo",
+    "get_slo_index",
+    "find_slos_by_backend_services",
+]
+
+SLO_API = "monitoring.serviceLevelObjectives"
+# SLO definitions seldom change, they are cached longer than other reads
+DEFAULT_SLO_TTL = 300.0
+SLO_NAME = re.compile(
+    r"^projects/[^/]+/services/[^/]+/serviceLevelObjectives/[^/]+$"
+)
+# how many services have their SLOs listed at once when indexing them
+MAX_WORKERS = 8
+# quoted values of a monitoring filter, such as `"my-backend"` in
+# `resource.label.backend_service_name="my-backend"`
+FILTER_VALUE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+def get_service_level_objective(
+    credentials: Any, name: str, configuration: Configuration = None
+) -> monitoring_v3.ServiceLevelObjective:
+    """
+    Read an SLO definition through the read cache.
+
+    It is cached for `gcp_slo_cache_ttl` seconds, set in the configuration,
+    five minutes by default. `0` disables caching.
+    """
+
+    def load() -> monitoring_v3.ServiceLevelObjective:
+        client = clients.get(
+            monitoring_v3.ServiceMonitoringServiceClient, credentials
+        )
+        return client.get_service_level_objective(
+            request=monitoring_v3.GetServiceLevelObjectiveRequest(name=name)
+        )
+
+    key = CacheKey(SLO_API, name, slo_project(name))
+    return cached(key, load, ttl=get_slo_ttl(configuration))
+
+
+def get_slo_name(
+    credentials: Any,
+    name: str,
+    skip_lookup: Optional[bool] = None,
+    configuration: Configuration = None,
+) -> str:
+    """
+    The name of an SLO as returned by the API, to use in time series
+    selectors.
+
+    When `skip_lookup` is set, or `gcp_slo_skip_lookup` in the
+    configuration, a fully qualified name such as
+    `projects/<project_id>/services/<service>/serviceLevelObjectives/<slo>`
+    is used as-is, without reading the SLO at all.
+    """
+    if skip_lookup is None:
+        skip_lookup = (configuration or {}).get("gcp_slo_skip_lookup", False)
+
+    if skip_lookup and SLO_NAME.match(name):
+        return name
+
+    return get_service_level_objective(credentials, name, configuration).name
+
+
+def get_slo_index(
+    credentials: Any, project: str, configuration: Configuration = None
+) -> Dict[str, Any]:
+    """
+    Index the SLOs of the GKE services of a project by the values their SLI
+    filters select, such as backend service names:
+
+    ```python
+    {
+        "slos": [{"name": "projects/.../serviceLevelObjectives/...", ...}],
+        "values": {"my-backend": [0]}
+    }
+    ```
+
+    where `values` maps each value to the position of the SLOs in `slos`.
+    The SLOs of all services are listed concurrently and the index is cached
+    like SLO definitions are, see `get_service_level_objective`.
+    """
+
+    def load() -> Dict[str, Any]:
+        client = clients.get(
+            monitoring_v3.ServiceMonitoringServiceClient, credentials
+        )
+        services = client.list_services(
+            request=monitoring_v3.ListServicesRequest(
+                parent=f"projects/{project}"
+            )
+        )
+        parents = [s.name for s in services if s.gke_service]
+
+        def list_slos(parent: str) -> List[Any]:
+            request = monitoring_v3.ListServiceLevelObjectivesRequest(
+                parent=parent, view="EXPLICIT"
+            )
+            return list(client.list_service_level_objectives(request=request))
+
+        with ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="chaosgcp-slo-index"
+        ) as executor:
+            pages = list(executor.map(list_slos, parents))
+
+        index = {"slos": [], "values": {}}
+        for slos in pages:
+            for slo in slos:
+                position = len(index["slos"])
+                index["slos"].append(to_dict(slo))
+                for value in set(sli_filter_values(slo)):
+                    index["values"].setdefault(value, []).append(position)
+        return index
+
+    key = CacheKey(SLO_API, ALL, project)
+    return cached(key, load, ttl=get_slo_ttl(configuration))
+
+
+def find_slos_by_backend_services(
+    credentials: Any,
+    project: str,
+    backend_services: List[str],
+    configuration: Configuration = None,
+) -> List[Dict[str, Any]]:
+    """
+    The SLOs of a project whose SLI filters select any of the given backend
+    services, each one once, in the order the API lists them.
+    """
+    index = get_slo_index(credentials, project, configuration)
+    positions = set()
+    for name in backend_services:
+        positions.update(index["values"].get(name, []))
+    return [index["slos"][p] for p in sorted(positions)]
+
+
+def invalidate_slo(name: Optional[str] = None) -> None:
+    """
+    Forget the cached definition of an SLO, or of all of them, once it was
+    changed. The SLO index of its project is dropped as well.
+    """
+    invalidate(SLO_API, name, slo_project(name) if name else None)
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def slo_project(name: str) -> Optional[str]:
+    parts = name.split("/")
+    if len(parts) > 1 and parts[0] == "projects":
+        return parts[1]
+    return None
+
+
+def get_slo_ttl(configuration: Configuration = None) -> float:
+    value = (configuration or {}).get("gcp_slo_cache_ttl")
+    if value is None:
+        return DEFAULT_SLO_TTL
+    return float(value)
+
+
+def sli_filter_values(message: Any) -> Iterator[str]:
+    # the SLI filters are spread over the various kinds of SLIs, look for
+    # them all rather than walking each kind
+    pb = getattr(type(message), "pb", None)
+    pb = pb(message) if pb is not None else message
+    for field, value in pb.ListFields():
+        if field.message_type is not None:
+            if field.is_repeated:
+                for item in value:
+                    yield from sli_filter_values(item)
+            else:
+                yield from sli_filter_values(value)
+        elif field.name.endswith("filter") or field.name == "time_series":
+            yield from FILTER_VALUE.findall(value)
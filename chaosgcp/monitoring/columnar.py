@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import warnings
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from chaoslib.exceptions import ActivityFailed
+
+__all__ = [
+    "REDUCTIONS",
+    "DEFAULT_REDUCTIONS",
+    "SeriesColumns",
+    "decode_time_series",
+    "summarize",
+]
+
+# reductions `summarize` knows about, percentiles are spelled `pNN`, such as
+# `p99` or `p99.9`
+REDUCTIONS = ("count", "sum", "min", "max", "mean", "stddev", "first", "last")
+DEFAULT_REDUCTIONS = ("count", "min", "max", "mean", "p50", "p95", "p99")
+
+
+class SeriesColumns(NamedTuple):
+    """
+    Time series decoded into columns. `labels` holds the metric and resource
+    of each series while `timestamps` and `values` hold one array per series
+    with the end time of its points, in seconds since the epoch, and their
+    value, in chronological order.
+    """
+
+    labels: List[Dict[str, Any]]
+    timestamps: List[Any]
+    values: List[Any]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            dict(labels, timestamps=t, values=v)
+            for labels, t, v in zip(self.labels, self.timestamps, self.values)
+        ]
+
+
+def decode_time_series(series: Iterable[Any]) -> SeriesColumns:
+    """
+    Decode Cloud Monitoring time series straight into NumPy arrays, without
+    going through dictionaries of points.
+
+    Integer, boolean and double points are decoded as floats. Distribution
+    points are decoded as their mean and string points are left out.
+
+    This requires NumPy, installed with the `numpy` extra.
+    """
+    np = numpy()
+
+    labels = []
+    timestamps = []
+    values = []
+    for ts in series:
+        pb = getattr(type(ts), "pb", None)
+        pb = pb(ts) if pb is not None else ts
+
+        labels.append(
+            {
+                "metric": {
+                    "type": pb.metric.type,
+                    "labels": dict(pb.metric.labels),
+                },
+                "resource": {
+                    "type": pb.resource.type,
+                    "labels": dict(pb.resource.labels),
+                },
+            }
+        )
+
+        points = [
+            (p.interval.end_time, point_value(p.value)) for p in pb.points
+        ]
+        points = [(t, v) for t, v in points if v is not None]
+        # the API returns the most recent points first
+        points.reverse()
+
+        timestamps.append(
+            np.fromiter(
+                (t.seconds + t.nanos * 1e-9 for t, _ in points),
+                dtype=np.float64,
+                count=len(points),
+            )
+        )
+        values.append(
+            np.fromiter(
+                (v for _, v in points), dtype=np.float64, count=len(points)
+            )
+        )
+
+    return SeriesColumns(labels, timestamps, values)
+
+
+def summarize(
+    columns: SeriesColumns, reductions: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reduce the points of each decoded series to summary statistics, returned
+    in place of the points along with the series' labels.
+
+    `reductions` are any of `REDUCTIONS` and percentiles, such as `p95`, and
+    default to `DEFAULT_REDUCTIONS`. They are computed for all the series at
+    once, over a matrix padded with NaNs. A series without points reduces to
+    `None`, except for its `count` which is `0`.
+    """
+    np = numpy()
+    reductions = list(reductions or DEFAULT_REDUCTIONS)
+    for name in reductions:
+        if name not in REDUCTIONS and percentile(name) is None:
+            raise ActivityFailed(f"unknown time series reduction '{name}'")
+
+    counts = np.array([len(v) for v in columns.values], dtype=np.int64)
+    matrix = np.full((len(counts), int(counts.max(initial=0))), np.nan)
+    for i, v in enumerate(columns.values):
+        matrix[i, : len(v)] = v
+
+    rows = np.arange(len(counts))
+    has_points = counts > 0
+    reduced = {}
+    # series without points are rows of NaNs, which reduce to NaN
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for name in reductions:
+            if name == "count":
+                reduced[name] = counts
+            elif not matrix.shape[1]:
+                reduced[name] = np.full(len(counts), np.nan)
+            elif name == "sum":
+                reduced[name] = np.where(
+                    has_points, np.nansum(matrix, axis=1), np.nan
+                )
+            elif name == "min":
+                # fmin and fmax only return NaN for rows made of NaNs
+                reduced[name] = np.fmin.reduce(matrix, axis=1)
+            elif name == "max":
+                reduced[name] = np.fmax.reduce(matrix, axis=1)
+            elif name == "mean":
+                reduced[name] = np.nansum(matrix, axis=1) / counts
+            elif name == "stddev":
+                mean = np.nansum(matrix, axis=1) / counts
+                squares = np.nansum((matrix - mean[:, None]) ** 2, axis=1)
+                reduced[name] = np.sqrt(squares / counts)
+            elif name == "first":
+                reduced[name] = matrix[:, 0]
+            elif name == "last":
+                last = np.maximum(counts - 1, 0)
+                reduced[name] = np.where(has_points, matrix[rows, last], np.nan)
+            else:
+                reduced[name] = np.nanpercentile(
+                    matrix, percentile(name), axis=1
+                )
+
+    summaries = []
+    for i, labels in enumerate(columns.labels):
+        summary = dict(labels)
+        for name in reductions:
+            value = reduced[name][i]
+            if name == "count":
+                summary[name] = int(value)
+            else:
+                summary[name] = None if np.isnan(value) else float(value)
+        summaries.append(summary)
+
+    return summaries
+
+
+###############################################################################
+# Private functions
+###############################################################################
+def numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError:
+        raise ActivityFailed(
+            "decoding time series into arrays requires NumPy, install "
+            "chaostoolkit-google-cloud-platform[numpy]"
+        )
+    return np
+
+
+def point_value(value: Any) -> Optional[float]:
+    kind = value.WhichOneof("value")
+    if kind in ("double_value", "int64_value", "bool_value"):
+        return float(getattr(value, kind))
+    if kind == "distribution_value":
+        return value.distribution_value.mean
+    return None
+
+
+def percentile(name: str) -> Optional[float]:
+    if not name.startswith("p"):
+        return None
+    try:
+        q = float(name[1:])
+    except ValueError:
+        return None
+    return q if 0 <= q <= 100 else None
@@ -1,18 +1,37 @@
-import json
 import re
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse
 
 from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
-from google.cloud import compute_v1
 from google.cloud import monitoring_v3
 from google.cloud.compute_v1.types import compute
 from google.cloud.monitoring_v3.query import Query
-from google.cloud.monitoring_v3.types.metric import TimeSeries
 
-from chaosgcp import get_context, load_credentials, parse_interval
+from chaosgcp import clients, get_context, load_credentials, parse_interval
+from chaosgcp import singleflight
+from chaosgcp.lb import list_url_maps
+from chaosgcp.monitoring import (
+    MAX_WORKERS,
+    find_slos_by_backend_services,
+    get_slo_name,
+)
+from chaosgcp.monitoring.columnar import decode_time_series, summarize
+from chaosgcp.serializer import to_dict, to_dicts
+from chaosgcp.singleflight import request_key
+from chaosgcp.types import GCPContext
 
 __all__ = [
     "get_metrics",
@@ -20,12 +39,16 @@ __all__ = [
     "get_slo_burn_rate",
     "get_slo_budget",
     "valid_slo_ratio_during_window",
+    "get_slo_ratio_during_window",
     "run_mql_query",
     "get_slo_from_url",
     "get_slo_health_from_url",
 ]
 logger = logging.getLogger("chaostoolkit")
 
+# how `get_metrics` returns time series
+OUTPUTS = ("points", "summary", "arrays")
+
 
 def get_metrics(
     metric_type: str,
@@ -37,6 +60,10 @@ def get_metrics(
     aligner_minutes: int = 1,
     reducer: int = 0,
     reducer_group_by: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    omit_defaults: bool = False,
+    output: str = "points",
+    reductions: Optional[Union[str, List[str]]] = None,
     project_id: str = None,
     region: str = None,
     configuration: Configuration = None,
@@ -49,11 +76,28 @@ def get_metrics(
     Refer to the documentation
     https://cloud.google.com/python/docs/reference/monitoring/latest/query
     to learn about the various flags.
+
+    Time series can be large. Use `fields` to only return some of their
+    fields, such as `["metric.labels", "points.value"]`, and
+    `omit_defaults` to leave out fields holding their default value.
+
+    With many series, set `output` to `summary` to get the `metric` and
+    `resource` of each series along with statistics of its points, rather
+    than the points themselves. `reductions` selects them, for instance
+    `["min", "max", "p99"]` (see `chaosgcp.monitoring.columnar.summarize`).
+    Set `output` to `arrays` to get the timestamps and values of the points
+    of each series as NumPy arrays, when calling this function from Python.
+    Both require the `numpy` extra.
     """
+    if output not in OUTPUTS:
+        raise ActivityFailed(
+            f"output must be one of {', '.join(OUTPUTS)}, not '{output}'"
+        )
+
     credentials = load_credentials(secrets)
-    client = monitoring_v3.MetricServiceClient(credentials=credentials)
+    client = clients.get(monitoring_v3.MetricServiceClient, credentials)
 
-    start, end = parse_interval(end_time, window)
+    start, end = parse_whole_interval(end_time, window)
     interval = (end - start).total_seconds()
     if interval <= 60.0:
         interval = 1
@@ -90,9 +134,33 @@ def get_metrics(
                 resource_labels_filters[k] = v
         q = q.select_resources(**resource_labels_filters)
 
+    key = (
+        "get_metrics",
+        id(credentials),
+        metric_type,
+        repr(metric_labels_filters),
+        repr(resource_labels_filters),
+        end,
+        interval,
+        aligner,
+        aligner_minutes,
+        reducer,
+        tuple(reducer_group_by or ()),
+    )
+    results = singleflight.do(key, lambda: list(q))
+
+    if output != "points":
+        columns = decode_time_series(results)
+        if output == "arrays":
+            return columns.to_dicts()
+
+        if isinstance(reductions, str):
+            reductions = reductions.split(",")
+        return summarize(columns, reductions)
+
     series = []
-    for timeseries in q:
-        d = TimeSeries.to_dict(timeseries)
+    for timeseries in results:
+        d = to_dict(timeseries, fields=fields, omit_defaults=omit_defaults)
         series.append(d)
 
     return series
@@ -112,16 +180,19 @@ def run_mql_query(
     Use the project name or id.
     """
     credentials = load_credentials(secrets)
-    client = monitoring_v3.QueryServiceClient(credentials=credentials)
+    client = clients.get(monitoring_v3.QueryServiceClient, credentials)
 
     request = monitoring_v3.QueryTimeSeriesRequest(
         name=f"projects/{project}",
         query=mql,
     )
 
-    results = client.query_time_series(request=request)
+    results = singleflight.do(
+        request_key("query_time_series", request, credentials),
+        lambda: list(client.query_time_series(request=request)),
+    )
 
-    return list(map(lambda p: p.__class__.to_dict(p), results))
+    return to_dicts(results)
 
 
 def get_slo_health(
@@ -134,6 +205,7 @@ def get_slo_health(
     group_by_fields: Optional[Union[str, List[str]]] = None,
     project_id: str = None,
     region: str = None,
+    skip_lookup: Optional[bool] = None,
     configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> List[Dict[str, Any]]:
@@ -143,50 +215,28 @@ def get_slo_health(
     The `name` argument is a full path to an SLO such as
     `"projects/<project_id>/services/<service_name>/serviceLevelObjectives/<slo_id>"`
 
+    The SLO is read, and cached, to resolve its name. Set `skip_lookup`, or
+    `gcp_slo_skip_lookup` in the configuration, to use a full path as-is.
+
     See also: https://cloud.google.com/stackdriver/docs/solutions/slo-monitoring/api/timeseries-selectors
     See also: https://cloud.google.com/python/docs/reference/monitoring/latest/google.cloud.monitoring_v3.types.Aggregation
     """  # noqa: E501
-    psa = monitoring_v3.Aggregation.Aligner[per_series_aligner]
-    csr = monitoring_v3.Aggregation.Reducer[cross_series_reducer]
-
-    credentials = load_credentials(secrets)
-    context = get_context(configuration, project_id=project_id, region=region)
-    project = context.project_id
-    start, end = parse_interval(end_time, window)
-
-    client = monitoring_v3.ServiceMonitoringServiceClient(
-        credentials=credentials
-    )
-
-    request = monitoring_v3.GetServiceLevelObjectiveRequest(
-        name=name,
-    )
-    response = client.get_service_level_objective(request=request)
-
-    group_by_fields = group_by_fields or None
-
-    if isinstance(group_by_fields, str):
-        group_by_fields = group_by_fields.split(",")
-
-    client = monitoring_v3.MetricServiceClient(credentials=credentials)
-    request = monitoring_v3.ListTimeSeriesRequest(
-        name=f"projects/{project}",
-        filter=f'select_slo_health("{response.name}")',
-        interval=monitoring_v3.TimeInterval(
-            start_time=start,
-            end_time=end,
-        ),
-        aggregation=monitoring_v3.Aggregation(
-            alignment_period={"seconds": alignment_period},
-            per_series_aligner=psa,
-            cross_series_reducer=csr,
-            group_by_fields=group_by_fields,
-        ),
+    results = list_slo_health(
+        name,
+        end_time,
+        window,
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+        project_id,
+        region,
+        skip_lookup,
+        configuration,
+        secrets,
     )
 
-    results = client.list_time_series(request=request)
-
-    return list(map(lambda p: p.__class__.to_dict(p), results))
+    return to_dicts(results)
 
 
 def get_slo_burn_rate(
@@ -196,6 +246,7 @@ def get_slo_burn_rate(
     loopback_period: str = "300s",
     project_id: str = None,
     region: str = None,
+    skip_lookup: Optional[bool] = None,
     configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> List[Dict[str, Any]]:
@@ -205,35 +256,34 @@ def get_slo_burn_rate(
     The `name` argument is a full path to an SLO such as
     `"projects/<project_id>/services/<service_name>/serviceLevelObjectives/<slo_id>"`
 
+    The SLO is read, and cached, to resolve its name. Set `skip_lookup`, or
+    `gcp_slo_skip_lookup` in the configuration, to use a full path as-is.
+
     See also: https://cloud.google.com/stackdriver/docs/solutions/slo-monitoring/api/timeseries-selectors
     """  # noqa: E501
     credentials = load_credentials(secrets)
     context = get_context(configuration, project_id=project_id, region=region)
     project = context.project_id
-    start, end = parse_interval(end_time, window)
+    start, end = parse_whole_interval(end_time, window)
 
-    client = monitoring_v3.ServiceMonitoringServiceClient(
-        credentials=credentials
-    )
-
-    request = monitoring_v3.GetServiceLevelObjectiveRequest(
-        name=name,
-    )
-    response = client.get_service_level_objective(request=request)
+    slo_name = get_slo_name(credentials, name, skip_lookup, configuration)
 
-    client = monitoring_v3.MetricServiceClient(credentials=credentials)
+    client = clients.get(monitoring_v3.MetricServiceClient, credentials)
     request = monitoring_v3.ListTimeSeriesRequest(
         name=f"projects/{project}",
-        filter=f'select_slo_burn_rate("{response.name}", "{loopback_period}")',
+        filter=f'select_slo_burn_rate("{slo_name}", "{loopback_period}")',
         interval=monitoring_v3.TimeInterval(
             start_time=start,
             end_time=end,
         ),
     )
 
-    results = client.list_time_series(request=request)
+    results = singleflight.do(
+        request_key("list_time_series", request, credentials),
+        lambda: list(client.list_time_series(request=request)),
+    )
 
-    return list(map(lambda p: p.__class__.to_dict(p), results))
+    return to_dicts(results)
 
 
 def get_slo_budget(
@@ -242,6 +292,7 @@ def get_slo_budget(
     window: str = "5 minutes",
     project_id: str = None,
     region: str = None,
+    skip_lookup: Optional[bool] = None,
     configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> List[Dict[str, Any]]:
@@ -251,35 +302,34 @@ def get_slo_budget(
     The `name` argument is a full path to an SLO such as
     `"projects/<project_id>/services/<service_name>/serviceLevelObjectives/<slo_id>"`
 
+    The SLO is read, and cached, to resolve its name. Set `skip_lookup`, or
+    `gcp_slo_skip_lookup` in the configuration, to use a full path as-is.
+
     See also: https://cloud.google.com/stackdriver/docs/solutions/slo-monitoring/api/timeseries-selectors
     """  # noqa: E501
     credentials = load_credentials(secrets)
     context = get_context(configuration, project_id=project_id, region=region)
     project = context.project_id
-    start, end = parse_interval(end_time, window)
+    start, end = parse_whole_interval(end_time, window)
 
-    client = monitoring_v3.ServiceMonitoringServiceClient(
-        credentials=credentials
-    )
-
-    request = monitoring_v3.GetServiceLevelObjectiveRequest(
-        name=name,
-    )
-    response = client.get_service_level_objective(request=request)
+    slo_name = get_slo_name(credentials, name, skip_lookup, configuration)
 
-    client = monitoring_v3.MetricServiceClient(credentials=credentials)
+    client = clients.get(monitoring_v3.MetricServiceClient, credentials)
     request = monitoring_v3.ListTimeSeriesRequest(
         name=f"projects/{project}",
-        filter=f'select_slo_budget("{response.name}")',
+        filter=f'select_slo_budget("{slo_name}")',
         interval=monitoring_v3.TimeInterval(
             start_time=start,
             end_time=end,
         ),
     )
 
-    results = client.list_time_series(request=request)
+    results = singleflight.do(
+        request_key("list_time_series", request, credentials),
+        lambda: list(client.list_time_series(request=request)),
+    )
 
-    return list(map(lambda p: p.__class__.to_dict(p), results))
+    return to_dicts(results)
 
 
 def valid_slo_ratio_during_window(
@@ -294,6 +344,7 @@ def valid_slo_ratio_during_window(
     group_by_fields: Optional[Union[str, List[str]]] = None,
     project_id: str = None,
     region: str = None,
+    skip_lookup: Optional[bool] = None,
     configuration: Configuration = None,
     secrets: Secrets = None,
 ) -> bool:
@@ -312,14 +363,20 @@ def valid_slo_ratio_during_window(
     The `name` argument is a full path to an SLO such as
     `"projects/<project_id>/services/<service_name>/serviceLevelObjectives/<slo_id>"`
 
+    When `group_by_fields` splits the SLO health into several series, each
+    of them must reach the `expected_ratio`. See
+    `get_slo_ratio_during_window` for the details of the verdict.
+
     This probe does not support point of type `distribution_value`.
 
     See also: https://cloud.google.com/stackdriver/docs/solutions/slo-monitoring/api/timeseries-selectors
     See also: https://cloud.google.com/python/docs/reference/monitoring/latest/google.cloud.monitoring_v3.types.Aggregation
     See also: https://cloud.google.com/python/docs/reference/monitoring/latest/google.cloud.monitoring_v3.types.TypedValue
     """  # noqa: E501
-    response = get_slo_health(
+    verdict = get_slo_ratio_during_window(
         name,
+        expected_ratio,
+        min_level,
         end_time,
         window,
         alignment_period,
@@ -328,39 +385,83 @@ def valid_slo_ratio_during_window(
         group_by_fields,
         project_id,
         region,
+        skip_lookup,
         configuration,
         secrets,
     )
 
-    logger.debug(f"Return SLO health: {response}")
+    logger.debug(f"SLO ratio verdict: {verdict}")
 
-    if not response:
-        logger.debug("SLO has no data for that period of time")
-        return False
-
-    points = response[0]["points"]
-
-    good = 0
-    total = 0
-    for pt in points:
-        total += 1
-        if "double_value" in pt["value"]:
-            if pt["value"]["double_value"] >= min_level:
-                good += 1
-        elif "int64_value" in pt["value"]:
-            # because this is an int64, this is returned a string
-            # Python3 should automatically handle this on 64 machines
-            # Rust would be more explicit here
-            if int(pt["value"]["int64_value"]) >= min_level:
-                good += 1
-        elif "bool_value" in pt["value"]:
-            if pt["value"]["bool_value"] == min_level:
-                good += 1
-        elif "string_value" in pt["value"]:
-            if pt["value"]["string_value"] == min_level:
-                good += 1
-
-    return ((good * 100.0) / total) >= expected_ratio
+    return verdict["ok"]
+
+
+def get_slo_ratio_during_window(
+    name: str,
+    expected_ratio: float = 0.90,
+    min_level: Union[float, int, bool, str] = 0.90,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    alignment_period: int = 60,
+    per_series_aligner: str = "ALIGN_MEAN",
+    cross_series_reducer: int = "REDUCE_COUNT",
+    group_by_fields: Optional[Union[str, List[str]]] = None,
+    project_id: str = None,
+    region: str = None,
+    skip_lookup: Optional[bool] = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate the SLO health during the window, as
+    `valid_slo_ratio_during_window` does, and return the details of the
+    verdict rather than a boolean:
+
+    ```json
+    {
+        "ok": true,
+        "expected_ratio": 0.9,
+        "min_level": 0.9,
+        "good": 19,
+        "total": 20,
+        "ratio": 0.95,
+        "series": [
+            {
+                "metric": {"type": "...", "labels": {}},
+                "resource": {"type": "...", "labels": {}},
+                "good": 19,
+                "total": 20,
+                "ratio": 0.95,
+                "ok": true
+            }
+        ]
+    }
+    ```
+
+    Each series returned for the SLO, one per group when `group_by_fields`
+    is set, gets its own ratio of intervals reaching `min_level`. The
+    top-level ratio is computed over the intervals of all of them. The
+    verdict is `ok` when every series reaches `expected_ratio`.
+
+    Points are compared as typed arrays, with NumPy when it is installed.
+
+    See also: https://cloud.google.com/stackdriver/docs/solutions/slo-monitoring/api/timeseries-selectors
+    """  # noqa: E501
+    results = list_slo_health(
+        name,
+        end_time,
+        window,
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+        project_id,
+        region,
+        skip_lookup,
+        configuration,
+        secrets,
+    )
+
+    return slo_ratio_verdict(results, expected_ratio, min_level)
 
 
 def query_time_series(
@@ -379,19 +480,19 @@ def query_time_series(
     context = get_context(configuration, project_id=project_id, region=region)
     project = context.project_id
 
-    client = monitoring_v3.QueryServiceClient(credentials=credentials)
+    client = clients.get(monitoring_v3.QueryServiceClient, credentials)
     request = monitoring_v3.QueryTimeSeriesRequest(
         name=f"projects/{project}",
         query=mql_query,
     )
 
-    return list(
-        map(
-            lambda p: p.__class__.to_dict(p),
-            client.query_time_series(request=request),
-        )
+    results = singleflight.do(
+        request_key("query_time_series", request, credentials),
+        lambda: list(client.query_time_series(request=request)),
     )
 
+    return to_dicts(results)
+
 
 def get_slo_from_url(
     url: str,
@@ -403,38 +504,15 @@ def get_slo_from_url(
     """
     Get all SLOs associated directly with a URL from the load balancer
     perspective.
-    """  # noqa: E501
+
+    These are the SLOs of GKE services whose SLI filters select one of the
+    backend services the URL is routed to. SLOs are indexed by the values of
+    their filters once, and the index is cached for `gcp_slo_cache_ttl`
+    seconds.
+    """
     credentials = load_credentials(secrets)
     context = get_context(configuration, project_id=project_id, region=region)
-    project = context.project_id
-    backend_services = get_backend_services_from_url(credentials, context, url)
-
-    client = monitoring_v3.ServiceMonitoringServiceClient(
-        credentials=credentials
-    )
-
-    request = monitoring_v3.ListServicesRequest(parent=f"projects/{project}")
-    services = client.list_services(request=request)
-
-    results = []
-
-    for service in services:
-        if service.gke_service:
-            request = monitoring_v3.ListServiceLevelObjectivesRequest(
-                parent=service.name, view="EXPLICIT"
-            )
-            slos = client.list_service_level_objectives(request=request)
-            for slo in slos:
-                slo_dict = slo.__class__.to_dict(slo)
-
-                # rather than exploring all potential sli combination
-                # we just want to know if the backend service is used by the slo
-                slo_str = json.dumps(slo_dict)
-                for bs in backend_services:
-                    if bs in slo_str:
-                        results.append(slo_dict)
-
-    return results
+    return find_url_slos(credentials, context, url, configuration)
 
 
 def get_slo_health_from_url(
@@ -449,38 +527,267 @@ def get_slo_health_from_url(
     region: str = None,
     configuration: Configuration = None,
     secrets: Secrets = None,
-) -> List[Dict[str, Any]]:
+) -> List[List[Dict[str, Any]]]:
     """
     Get all SLO healths associated directly with a URL from the load balancer
     perspective.
 
     Use this probe to efficientely retrieve the curerent health of SLOs
     associated with a particular URL endpoint.
+
+    The health of all the SLOs, found with `get_slo_from_url`, is queried
+    concurrently over the same interval, and returned in the same order.
+    SLO time series selectors only take a single SLO, so there is one
+    query per SLO.
     """  # noqa: E501
-    healths = []
-    slos = get_slo_from_url(url, project_id, region, configuration, secrets)
-    for slo in slos:
-        healths.append(
-            get_slo_health(
-                slo["name"],
-                end_time,
-                window,
-                alignment_period,
-                per_series_aligner,
-                cross_series_reducer,
-                group_by_fields,
-                project_id,
-                region,
-                configuration,
-                secrets,
-            )
+    aggregation = slo_health_aggregation(
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+    )
+
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+    start, end = parse_whole_interval(end_time, window)
+
+    slos = find_url_slos(credentials, context, url, configuration)
+    if not slos:
+        return []
+
+    client = clients.get(monitoring_v3.MetricServiceClient, credentials)
+    # SLO names come straight from the API, there is no need to look them up
+    requests = [
+        slo_health_request(
+            context.project_id, slo["name"], start, end, aggregation
         )
-    return healths
+        for slo in slos
+    ]
+
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(requests)),
+        thread_name_prefix="chaosgcp-slo-health",
+    ) as executor:
+        results = executor.map(
+            lambda r: list_time_series(client, r, credentials), requests
+        )
+        return [to_dicts(r) for r in results]
 
 
 ###############################################################################
 # Private functions
 ###############################################################################
+def parse_whole_interval(end_time: str, window: str) -> Tuple[Any, Any]:
+    # truncated to the second so that probes running at the same time send
+    # identical requests, which are then coalesced
+    start, end = parse_interval(end_time, window)
+    return start.replace(microsecond=0), end.replace(microsecond=0)
+
+
+def list_slo_health(
+    name: str,
+    end_time: str = "now",
+    window: str = "5 minutes",
+    alignment_period: int = 60,
+    per_series_aligner: str = "ALIGN_MEAN",
+    cross_series_reducer: int = "REDUCE_COUNT",
+    group_by_fields: Optional[Union[str, List[str]]] = None,
+    project_id: str = None,
+    region: str = None,
+    skip_lookup: Optional[bool] = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[monitoring_v3.TimeSeries]:
+    aggregation = slo_health_aggregation(
+        alignment_period,
+        per_series_aligner,
+        cross_series_reducer,
+        group_by_fields,
+    )
+
+    credentials = load_credentials(secrets)
+    context = get_context(configuration, project_id=project_id, region=region)
+    start, end = parse_whole_interval(end_time, window)
+
+    slo_name = get_slo_name(credentials, name, skip_lookup, configuration)
+
+    client = clients.get(monitoring_v3.MetricServiceClient, credentials)
+    request = slo_health_request(
+        context.project_id, slo_name, start, end, aggregation
+    )
+    return list_time_series(client, request, credentials)
+
+
+def slo_health_aggregation(
+    alignment_period: int,
+    per_series_aligner: str,
+    cross_series_reducer: str,
+    group_by_fields: Optional[Union[str, List[str]]],
+) -> monitoring_v3.Aggregation:
+    group_by_fields = group_by_fields or None
+
+    if isinstance(group_by_fields, str):
+        group_by_fields = group_by_fields.split(",")
+
+    return monitoring_v3.Aggregation(
+        alignment_period={"seconds": alignment_period},
+        per_series_aligner=monitoring_v3.Aggregation.Aligner[
+            per_series_aligner
+        ],
+        cross_series_reducer=monitoring_v3.Aggregation.Reducer[
+            cross_series_reducer
+        ],
+        group_by_fields=group_by_fields,
+    )
+
+
+def slo_health_request(
+    project: str,
+    slo_name: str,
+    start: Any,
+    end: Any,
+    aggregation: monitoring_v3.Aggregation,
+) -> monitoring_v3.ListTimeSeriesRequest:
+    return monitoring_v3.ListTimeSeriesRequest(
+        name=f"projects/{project}",
+        filter=f'select_slo_health("{slo_name}")',
+        interval=monitoring_v3.TimeInterval(
+            start_time=start,
+            end_time=end,
+        ),
+        aggregation=aggregation,
+    )
+
+
+def list_time_series(
+    client: monitoring_v3.MetricServiceClient,
+    request: monitoring_v3.ListTimeSeriesRequest,
+    credentials: Any,
+) -> List[monitoring_v3.TimeSeries]:
+    return singleflight.do(
+        request_key("list_time_series", request, credentials),
+        lambda: list(client.list_time_series(request=request)),
+    )
+
+
+def slo_ratio_verdict(
+    series: List[monitoring_v3.TimeSeries],
+    expected_ratio: float,
+    min_level: Union[float, int, bool, str],
+) -> Dict[str, Any]:
+    labels = []
+    bounds = []
+    # points of all series, back to back, in a single typed array
+    values = [] if isinstance(min_level, str) else array("d")
+    for ts in series:
+        pb = getattr(type(ts), "pb", None)
+        pb = pb(ts) if pb is not None else ts
+        labels.append(
+            {
+                "metric": {
+                    "type": pb.metric.type,
+                    "labels": dict(pb.metric.labels),
+                },
+                "resource": {
+                    "type": pb.resource.type,
+                    "labels": dict(pb.resource.labels),
+                },
+            }
+        )
+        start = len(values)
+        values.extend(level_values(pb.points, min_level))
+        bounds.append((start, len(values)))
+
+    good = count_good_levels(values, bounds, min_level)
+
+    verdict = {
+        "ok": bool(series),
+        "expected_ratio": expected_ratio,
+        "min_level": min_level,
+        "good": sum(good),
+        "total": len(values),
+        "ratio": None,
+        "series": [],
+    }
+    if values:
+        verdict["ratio"] = verdict["good"] / verdict["total"]
+
+    for series_labels, (start, end), series_good in zip(labels, bounds, good):
+        total = end - start
+        ratio = series_good / total if total else None
+        ok = ratio is not None and ratio >= expected_ratio
+        verdict["ok"] = verdict["ok"] and ok
+        verdict["series"].append(
+            dict(
+                series_labels,
+                good=series_good,
+                total=total,
+                ratio=ratio,
+                ok=ok,
+            )
+        )
+
+    if not series:
+        logger.debug("SLO has no data for that period of time")
+
+    return verdict
+
+
+def level_values(
+    points: Iterable[Any], min_level: Union[float, int, bool, str]
+) -> Iterable[Any]:
+    # points which can be compared with `min_level`, others are left out
+    if isinstance(min_level, str):
+        kinds = ("string_value",)
+    elif isinstance(min_level, bool):
+        kinds = ("bool_value",)
+    else:
+        kinds = ("double_value", "int64_value", "bool_value")
+
+    for p in points:
+        kind = p.value.WhichOneof("value")
+        if kind in kinds:
+            yield getattr(p.value, kind)
+
+
+def count_good_levels(
+    values: Sequence[Any],
+    bounds: List[Tuple[int, int]],
+    min_level: Union[float, int, bool, str],
+) -> List[int]:
+    if isinstance(min_level, (bool, str)):
+        good = [v == min_level for v in values]
+        return [sum(good[start:end]) for start, end in bounds]
+
+    try:
+        import numpy as np
+    except ImportError:
+        return [
+            sum(1 for v in values[start:end] if v >= min_level)
+            for start, end in bounds
+        ]
+
+    # counts of good points up to each index, differences give the number
+    # of good points of each series, including those without any point
+    good = np.frombuffer(values, dtype=np.float64) >= min_level
+    cumulative = np.concatenate(([0], np.cumsum(good, dtype=np.int64)))
+    return [int(cumulative[end] - cumulative[start]) for start, end in bounds]
+
+
+def find_url_slos(
+    credentials: Any,
+    context: GCPContext,
+    url: str,
+    configuration: Configuration = None,
+) -> List[Dict[str, Any]]:
+    backend_services = get_backend_services_from_url(
+        credentials, context, url, configuration=configuration
+    )
+    return find_slos_by_backend_services(
+        credentials, context.project_id, backend_services, configuration
+    )
+
+
 def get_route_action_from_url(
     urlmaps: List[compute.UrlMap], url: str
 ) -> Tuple[compute.UrlMap, compute.HttpRouteAction]:
@@ -516,28 +823,15 @@ def get_route_action_from_url(
     raise ActivityFailed("failed to find a suitable route")
 
 
-def get_backend_services_from_url(credentials, context, url: str) -> List[str]:
+def get_backend_services_from_url(
+    credentials, context, url: str, configuration: Configuration = None
+) -> List[str]:
     region = context.region
     project = context.project_id
 
-    if region:
-        if not region:
-            raise ActivityFailed(
-                "when `regional` is set, the `gcp_region` configuration key "
-                "must also be set"
-            )
-        client = compute_v1.RegionUrlMapsClient(credentials=credentials)
-        request = compute_v1.ListRegionUrlMapsRequest(
-            project=project,
-            region=region,
-        )
-    else:
-        client = compute_v1.UrlMapsClient(credentials=credentials)
-        request = compute_v1.ListUrlMapsRequest(
-            project=project,
-        )
-
-    urlmaps = client.list(request=request)
+    urlmaps = list_url_maps(
+        credentials, project, region=region, configuration=configuration
+    )
     url_map, route_action = get_route_action_from_url(urlmaps, url)
 
     backend_services = []
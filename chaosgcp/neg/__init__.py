@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+__all__ = ["NEG_API"]
+
+# the API network endpoint groups are cached under, see `chaosgcp.cache`
+NEG_API = "compute.networkEndpointGroups"
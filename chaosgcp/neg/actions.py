@@ -5,10 +5,13 @@ from chaoslib.types import Configuration, Secrets
 from google.cloud import compute_v1
 
 from chaosgcp import (
+    clients,
     get_context,
     load_credentials,
     wait_on_extended_operation,
 )
+from chaosgcp.cache import invalidate
+from chaosgcp.neg import NEG_API
 
 __all__ = [
     "detach_network_endpoint_group",
@@ -37,7 +40,7 @@ def detach_network_endpoint_group(
     )
     credentials = load_credentials(secrets)
 
-    client = compute_v1.NetworkEndpointGroupsClient(credentials=credentials)
+    client = clients.get(compute_v1.NetworkEndpointGroupsClient, credentials)
     credentials = client.transport._credentials
     project = ctx.project_id or credentials.project_id
 
@@ -62,6 +65,7 @@ def detach_network_endpoint_group(
 
     operation = client.detach_network_endpoints(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate(NEG_API, network_endpoint_group, project, zone)
 
 
 def attach_network_endpoint_group(
@@ -85,7 +89,7 @@ def attach_network_endpoint_group(
     )
     credentials = load_credentials(secrets)
 
-    client = compute_v1.NetworkEndpointGroupsClient(credentials=credentials)
+    client = clients.get(compute_v1.NetworkEndpointGroupsClient, credentials)
     credentials = client.transport._credentials
     project = ctx.project_id or credentials.project_id
 
@@ -110,3 +114,4 @@ def attach_network_endpoint_group(
 
     operation = client.attach_network_endpoints(request=request)
     wait_on_extended_operation(operation=operation)
+    invalidate(NEG_API, network_endpoint_group, project, zone)
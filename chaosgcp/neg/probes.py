@@ -4,7 +4,17 @@ from typing import Any, Dict, List
 from chaoslib.types import Configuration, Secrets
 from google.cloud import compute_v1
 
-from chaosgcp import get_context, load_credentials, to_dict
+from chaosgcp import (
+    clients,
+    get_context,
+    load_credentials,
+    singleflight,
+    to_dict,
+)
+from chaosgcp.cache import CacheKey, cached
+from chaosgcp.neg import NEG_API
+from chaosgcp.serializer import to_dicts
+from chaosgcp.singleflight import request_key
 
 __all__ = [
     "get_network_endpoint_group",
@@ -28,7 +38,7 @@ def get_network_endpoint_group(
     )
     credentials = load_credentials(secrets)
 
-    client = compute_v1.NetworkEndpointGroupsClient(credentials=credentials)
+    client = clients.get(compute_v1.NetworkEndpointGroupsClient, credentials)
     credentials = client.transport._credentials
     project = ctx.project_id or credentials.project_id
 
@@ -38,7 +48,10 @@ def get_network_endpoint_group(
         zone=zone,
     )
 
-    response = client.get(request=request)
+    key = CacheKey(NEG_API, network_endpoint_group, project, zone)
+    response = cached(
+        key, lambda: client.get(request=request), configuration=configuration
+    )
 
     return to_dict(response)
 
@@ -58,7 +71,7 @@ def list_network_endpoint_groups(
     )
     credentials = load_credentials(secrets)
 
-    client = compute_v1.NetworkEndpointGroupsClient(credentials=credentials)
+    client = clients.get(compute_v1.NetworkEndpointGroupsClient, credentials)
     credentials = client.transport._credentials
     project = ctx.project_id or credentials.project_id
 
@@ -67,6 +80,9 @@ def list_network_endpoint_groups(
         zone=zone,
     )
 
-    response = client.list(request=request)
+    response = singleflight.do(
+        request_key("list_network_endpoint_groups", request, credentials),
+        lambda: list(client.list(request=request)),
+    )
 
-    return to_dict(response)
+    return to_dicts(response)
@@ -5,6 +5,9 @@ from typing import Any, Dict
 from chaoslib.types import Configuration, Secrets
 from google.cloud import networkconnectivity_v1
 
+from chaosgcp import clients
+from chaosgcp.serializer import to_dict
+
 __all__ = ["create_policy_based_route", "delete_policy_based_route"]
 
 
@@ -19,7 +22,7 @@ def delete_policy_based_route(
     """
 
     # Create a client
-    client = networkconnectivity_v1.PolicyBasedRoutingServiceClient()
+    client = clients.get(networkconnectivity_v1.PolicyBasedRoutingServiceClient)
 
     # Initialize request argument(s)
     request = networkconnectivity_v1.DeletePolicyBasedRouteRequest(
@@ -29,7 +32,7 @@ def delete_policy_based_route(
     # Make the request
     response = client.delete_policy_based_route(request=request)
 
-    return response.__class__.to_dict(response)
+    return to_dict(response)
 
 
 def create_policy_based_route(
@@ -57,7 +60,7 @@ def create_policy_based_route(
     """
 
     # Create a client
-    client = networkconnectivity_v1.PolicyBasedRoutingServiceClient()
+    client = clients.get(networkconnectivity_v1.PolicyBasedRoutingServiceClient)
 
     # Initialize request argument(s)
     policy_based_route = networkconnectivity_v1.PolicyBasedRoute()
@@ -78,4 +81,4 @@ def create_policy_based_route(
     # Make the request
     response = client.create_policy_based_route(request=request)
 
-    return response.__class__.to_dict(response)
+    return to_dict(response)
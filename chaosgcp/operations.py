@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+import functools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from chaoslib.exceptions import ActivityFailed
+
+from chaosgcp.instrumentation import OPERATION, span
+
+__all__ = [
+    "Waiter",
+    "WaitStats",
+    "OperationTimeout",
+    "add_listener",
+    "remove_listener",
+    "discovery_operation_poller",
+    "extended_operation_poller",
+    "gke_operation_poller",
+    "lro_poller",
+    "OperationTracker",
+    "OperationResult",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# how many operations a tracker waits on at once
+MAX_WORKERS = 8
+
+# a poller is called with the time remaining before the deadline, if any, and
+# returns whether the operation is done along with its latest state
+Poller = Callable[[Optional[float]], Tuple[bool, Any]]
+
+
+class WaitStats(NamedTuple):
+    name: str
+    polls: int
+    elapsed: float
+    done: bool
+
+
+class OperationTimeout(ActivityFailed):
+    pass
+
+
+class OperationResult(NamedTuple):
+    name: str
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class Waiter:
+    """
+    Wait for an operation to complete by polling it with exponential backoff
+    and jitter, until an optional hard deadline.
+
+    Polling starts at `initial_delay` seconds and the delay is multiplied by
+    `multiplier` after each poll, up to `max_delay`. Each delay is randomly
+    spread by `jitter` (a ratio) so that concurrent waiters do not poll in
+    lockstep. Short operations are therefore detected quickly while long ones
+    do not burn API quota.
+
+    When `deadline` (in seconds) is reached, `OperationTimeout` is raised.
+
+    Once the wait is over, its `WaitStats` are logged and passed to all the
+    listeners registered with `add_listener`.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 1.5,
+        jitter: float = 0.2,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.initial_delay = max(0.0, initial_delay)
+        self.max_delay = max(self.initial_delay, max_delay)
+        self.multiplier = max(1.0, multiplier)
+        self.jitter = min(max(0.0, jitter), 1.0)
+        self.deadline = deadline
+
+    def next_delay(self, delay: float) -> float:
+        return min(self.max_delay, delay * self.multiplier)
+
+    def jittered(self, delay: float) -> float:
+        if not self.jitter:
+            return delay
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def wait(self, poll: Poller, name: str = "operation") -> Any:
+        with span("operation.wait", OPERATION, method=name) as s:
+            started = time.monotonic()
+            delay = self.initial_delay
+            polls = 0
+
+            while True:
+                elapsed = time.monotonic() - started
+                remaining = None
+                if self.deadline is not None:
+                    remaining = max(0.0, self.deadline - elapsed)
+
+                polls += 1
+                done, result = poll(remaining)
+                elapsed = time.monotonic() - started
+
+                if done:
+                    s.attributes["polls"] = polls
+                    emit(WaitStats(name, polls, elapsed, True))
+                    return result
+
+                if self.deadline is not None and elapsed >= self.deadline:
+                    s.attributes["polls"] = polls
+                    emit(WaitStats(name, polls, elapsed, False))
+                    raise OperationTimeout(
+                        f"operation '{name}' did not complete within "
+                        f"{self.deadline}s"
+                    )
+
+                logger.debug(f"Waiting for operation '{name}'")
+
+                pause = self.jittered(delay)
+                if self.deadline is not None:
+                    pause = min(pause, self.deadline - elapsed)
+                time.sleep(max(0.0, pause))
+
+                delay = self.next_delay(delay)
+
+
+class OperationTracker:
+    """
+    Wait on many in-flight operations concurrently.
+
+    Start all the mutations first, hand their operations to the tracker and
+    then wait on all of them at once. Mutating N resources then takes about
+    as long as the slowest operation rather than the sum of them all.
+
+    ```python
+    with OperationTracker() as tracker:
+        for name in instance_names:
+            tracker.add_extended_operation(
+                client.suspend(project=p, zone=z, instance=name), name=name
+            )
+        results = tracker.wait()
+    ```
+
+    Operations are polled by at most `max_workers` threads, each one with
+    its own `Waiter` configured from `waiter`. A failed or timed out
+    operation does not prevent the others from being waited on, its error
+    is reported in its `OperationResult`. Operations which failed to start
+    are recorded with `add_failure`.
+    """
+
+    def __init__(
+        self, max_workers: int = MAX_WORKERS, waiter: Optional[Waiter] = None
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.waiter = waiter or Waiter()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[str, Future]] = []
+
+    def __enter__(self) -> "OperationTracker":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+
+    def add(
+        self,
+        name: str,
+        poll: Poller,
+        finish: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """
+        Track an operation by its poller. When given, `finish` is called with
+        the state of the completed operation to turn it into its result, or
+        to raise its error.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="chaosgcp-operations",
+                )
+            future = self._executor.submit(self._wait_one, name, poll, finish)
+            self._pending.append((name, future))
+
+    def add_failure(self, name: str, error: BaseException) -> None:
+        """
+        Record an operation which could not even be started, so that `wait`
+        reports it, as failed, along with the others.
+        """
+        future: Future = Future()
+        future.set_result(OperationResult(name, error=error))
+        with self._lock:
+            self._pending.append((name, future))
+
+    def add_discovery_operation(
+        self,
+        operation_service: Any,
+        name: Optional[str] = None,
+        long_poll: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Track an operation of a discovery based API, such as sqladmin, by
+        the arguments of its service's `get` method.
+        """
+        name = name or kwargs.get("operationId", kwargs.get("operation"))
+        poll = discovery_operation_poller(
+            operation_service, long_poll=long_poll, **kwargs
+        )
+        self.add(name, poll, discovery_operation_result)
+
+    def add_extended_operation(
+        self,
+        operation: Any,
+        name: Optional[str] = None,
+        long_poll: bool = False,
+    ) -> None:
+        """
+        Track a compute `ExtendedOperation`.
+        """
+        poll = extended_operation_poller(operation, long_poll=long_poll)
+        self.add(
+            name or operation.name, poll, lambda _: operation.result(timeout=0)
+        )
+
+    def add_gke_operation(
+        self, client: Any, operation_name: str, name: Optional[str] = None
+    ) -> None:
+        """
+        Track a GKE `container_v1.Operation` by its full name, that is
+        `projects/*/locations/*/operations/*`.
+        """
+        poll = gke_operation_poller(client, operation_name)
+        self.add(name or operation_name, poll, gke_operation_result)
+
+    def add_lro(self, operation: Any, name: Optional[str] = None) -> None:
+        """
+        Track a `google.api_core.operation.Operation`, as returned by
+        Cloud Run for instance.
+        """
+        name = name or operation.operation.name
+        self.add(name, lro_poller(operation), lambda _: operation.result(0))
+
+    def wait(self) -> List[OperationResult]:
+        """
+        Wait on all the tracked operations and return their results in the
+        order they were added. The tracker can be reused afterwards.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+
+        return [future.result() for _, future in pending]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _wait_one(
+        self,
+        name: str,
+        poll: Poller,
+        finish: Optional[Callable[[Any], Any]],
+    ) -> OperationResult:
+        waiter = Waiter(
+            initial_delay=self.waiter.initial_delay,
+            max_delay=self.waiter.max_delay,
+            multiplier=self.waiter.multiplier,
+            jitter=self.waiter.jitter,
+            deadline=self.waiter.deadline,
+        )
+        try:
+            result = waiter.wait(poll, name=name)
+            if finish is not None:
+                result = finish(result)
+        except Exception as x:
+            logger.debug(f"Operation '{name}' failed", exc_info=True)
+            return OperationResult(name, error=x)
+
+        return OperationResult(name, result=result)
+
+
+def add_listener(listener: Callable[[WaitStats], None]) -> None:
+    """
+    Register a callable receiving the `WaitStats` of every completed or
+    timed out wait.
+    """
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[WaitStats], None]) -> None:
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def discovery_operation_poller(
+    operation_service: Any, long_poll: bool = False, **kwargs: Any
+) -> Poller:
+    """
+    Poll an operation of a discovery based API (sqladmin, compute...).
+
+    With `long_poll`, the service's `wait` method is called instead of
+    `get`, the server then holds the request until the operation is done
+    or a couple of minutes have elapsed. Only some APIs, such as compute,
+    offer it.
+    """
+    method = operation_service.wait if long_poll else operation_service.get
+
+    def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        result = method(**kwargs).execute()
+        return result["status"] == "DONE", result
+
+    return poll
+
+
+def extended_operation_poller(
+    operation: Any, long_poll: bool = False
+) -> Poller:
+    """
+    Poll a compute `ExtendedOperation`.
+
+    With `long_poll`, the `wait` endpoint of the zonal, regional or global
+    operations service is called instead of `get` whenever the operation
+    lets us find out which one it belongs to. This relies on internals of
+    `google-api-core` so, should they change, it falls back to regular
+    polling through `operation.done()`.
+    """
+    wait = long_poll_extended_operation(operation) if long_poll else None
+
+    def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        nonlocal wait
+
+        if wait is not None:
+            try:
+                return long_poll_once(operation, wait, remaining), None
+            except (AttributeError, TypeError):
+                logger.debug(
+                    "Cannot long poll extended operation, polling it instead",
+                    exc_info=True,
+                )
+                wait = None
+
+        return operation.done(), None
+
+    return poll
+
+
+def gke_operation_poller(client: Any, name: str) -> Poller:
+    """
+    Poll a GKE `container_v1.Operation` by its full name
+    """
+    from google.cloud import container_v1
+
+    def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        response = client.get_operation(name=name)
+        logger.debug(f"Operation {name} => {response.status}")
+        return response.status == container_v1.Operation.Status.DONE, response
+
+    return poll
+
+
+def lro_poller(operation: Any) -> Poller:
+    """
+    Poll a `google.api_core.operation.Operation`
+    """
+
+    def poll(remaining: Optional[float]) -> Tuple[bool, Any]:
+        return operation.done(), None
+
+    return poll
+
+
+###############################################################################
+# Private functions
+###############################################################################
+_listeners: List[Callable[[WaitStats], None]] = []
+_listeners_lock = threading.Lock()
+
+
+def emit(stats: WaitStats) -> None:
+    logger.debug(
+        f"Operation '{stats.name}' done={stats.done} after {stats.polls} "
+        f"poll(s) in {stats.elapsed:.3f}s"
+    )
+
+    with _listeners_lock:
+        listeners = list(_listeners)
+
+    for listener in listeners:
+        try:
+            listener(stats)
+        except Exception:
+            logger.debug("Operation wait listener failed", exc_info=True)
+
+
+def discovery_operation_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    errors = (result.get("error") or {}).get("errors")
+    if errors:
+        raise ActivityFailed(
+            f"operation '{result.get('name')}' failed: {errors}"
+        )
+    return result
+
+
+def gke_operation_result(response: Any) -> Any:
+    error = getattr(response, "error", None)
+    if error is not None and error.code:
+        raise ActivityFailed(
+            f"operation '{response.name}' failed: {error.message}"
+        )
+    return response
+
+
+def long_poll_once(
+    operation: Any, wait: Callable[[Optional[float]], Any], remaining: Any
+) -> bool:
+    if operation._extended_operation.done:
+        return True
+
+    try:
+        refreshed = wait(remaining)
+    except (AttributeError, TypeError):
+        raise
+    except Exception:
+        # the server gave up holding the request, this is not fatal
+        logger.debug("Long poll of operation failed", exc_info=True)
+        return False
+
+    operation._extended_operation = refreshed
+    operation._handle_refreshed_operation()
+    return bool(operation._extended_operation.done)
+
+
+def long_poll_extended_operation(
+    operation: Any,
+) -> Optional[Callable[[Optional[float]], Any]]:
+    """
+    Compute clients create their extended operations with a `_refresh`
+    partial calling the `get` method of the relevant operations client with
+    a `Get*OperationRequest`. Swap it for its `Wait*OperationRequest`
+    counterpart.
+    """
+    refresh = getattr(operation, "_refresh", None)
+    if not isinstance(refresh, functools.partial) or not refresh.args:
+        return None
+
+    service = getattr(refresh.func, "__self__", None)
+    request = refresh.args[0]
+    request_name = type(request).__name__
+    if not hasattr(service, "wait") or not request_name.startswith("Get"):
+        return None
+
+    from google.cloud import compute_v1
+
+    wait_request_cls = getattr(
+        compute_v1, "Wait" + request_name[len("Get") :], None
+    )
+    if wait_request_cls is None:
+        return None
+
+    wait_request = wait_request_cls(
+        **type(request).to_dict(request, preserving_proto_field_name=True)
+    )
+
+    def wait(remaining: Optional[float]) -> Any:
+        if remaining is None:
+            return service.wait(request=wait_request)
+        return service.wait(request=wait_request, timeout=remaining)
+
+    return wait
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from chaoslib.types import Configuration
+
+from chaosgcp.instrumentation import instrumented_request_class
+
+__all__ = [
+    "QuotaPolicy",
+    "TokenBucket",
+    "configure",
+    "get_bucket",
+    "api_name",
+    "call_with_quota_retry",
+    "throttle_client",
+    "request_class",
+    "reset",
+    "stats",
+]
+logger = logging.getLogger("chaostoolkit")
+
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 32.0
+
+# reasons given by discovery based APIs when they reject a call with a 403
+# rather than a 429 because of quota
+QUOTA_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+
+
+class QuotaPolicy(NamedTuple):
+    """
+    How calls rejected for quota (HTTP 429, `RESOURCE_EXHAUSTED`) are
+    retried: up to `retries` times, waiting `backoff` seconds, doubled after
+    each attempt up to `max_backoff`, and spread by a random jitter.
+    """
+
+    retries: int = DEFAULT_RETRIES
+    backoff: float = DEFAULT_BACKOFF
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * (2**attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+
+class TokenBucket:
+    """
+    Token bucket shared by all the calls made to one API in the process.
+
+    Calls take a token, waiting for one when the bucket is empty. Tokens are
+    added at `rate` per second, up to `burst` of them. Without a rate, calls
+    are never delayed, unless the API rejected one for quota: the bucket is
+    then paused for everybody, rather than every caller retrying on its own
+    and burning through the quota again.
+    """
+
+    def __init__(
+        self, rate: Optional[float] = None, burst: Optional[int] = None
+    ) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.quota_errors = 0
+        self._blocked_until = 0.0
+        self.set_rate(rate, burst)
+
+    def set_rate(
+        self, rate: Optional[float] = None, burst: Optional[int] = None
+    ) -> None:
+        with self._lock:
+            self.rate = float(rate) if rate else None
+            self.burst = max(1, int(burst or (self.rate or 1)))
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting for it if needed. Return how long we waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                pause = self._blocked_until - now
+                if pause <= 0 and self.rate is None:
+                    break
+
+                if pause <= 0:
+                    self._tokens = min(
+                        self.burst,
+                        self._tokens + (now - self._updated) * self.rate,
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    pause = (1 - self._tokens) / self.rate
+
+            time.sleep(pause)
+            waited += pause
+
+        with self._lock:
+            self.calls += 1
+            if waited:
+                self.throttled += 1
+                self.waited += waited
+        return waited
+
+    def penalize(self, delay: float) -> None:
+        """
+        Hold every call for `delay` seconds after the API rejected one for
+        quota.
+        """
+        with self._lock:
+            self.quota_errors += 1
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + delay
+            )
+            self._tokens = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "waited": self.waited,
+                "quota_errors": self.quota_errors,
+            }
+
+
+def configure(configuration: Configuration = None) -> None:
+    """
+    Set the rate limits and the quota retry policy from the configuration:
+
+    * `gcp_rate_limits`: the sustained rate, in calls per second, allowed
+      per API, keyed by the API's short name as in its endpoint, such as
+      `compute`, `monitoring` or `sqladmin`. A value is either a rate or a
+      mapping with a `rate` and a `burst`, the number of calls that may be
+      made at once after a quiet period
+    * `gcp_quota_retries`: how many times a call rejected for quota is
+      retried, `0` disables retrying
+    * `gcp_quota_backoff` and `gcp_quota_max_backoff`: the initial and
+      maximum delays, in seconds, between these retries
+
+    APIs without a limit are not throttled.
+    """
+    global policy
+    configuration = configuration or {}
+
+    policy = QuotaPolicy(
+        retries=int(configuration.get("gcp_quota_retries", DEFAULT_RETRIES)),
+        backoff=float(configuration.get("gcp_quota_backoff", DEFAULT_BACKOFF)),
+        max_backoff=float(
+            configuration.get("gcp_quota_max_backoff", DEFAULT_MAX_BACKOFF)
+        ),
+    )
+
+    for api, limit in (configuration.get("gcp_rate_limits") or {}).items():
+        if isinstance(limit, dict):
+            rate, burst = limit.get("rate"), limit.get("burst")
+        else:
+            rate, burst = limit, None
+        logger.debug(f"Limiting '{api}' API calls to {rate}/s")
+        get_bucket(api).set_rate(rate, burst)
+
+
+def get_bucket(api: str) -> TokenBucket:
+    """
+    Return the token bucket of the given API, creating it if needed.
+    """
+    bucket = buckets.get(api)
+    if bucket is not None:
+        return bucket
+
+    with buckets_lock:
+        return buckets.setdefault(api, TokenBucket())
+
+
+def api_name(endpoint: str) -> str:
+    """
+    The short name of an API from its endpoint, `compute` for
+    `https://compute.googleapis.com/compute/v1/`.
+    """
+    host = urlparse(endpoint).hostname if "//" in endpoint else endpoint
+    return (host or "").split(":")[0].split(".")[0]
+
+
+def call_with_quota_retry(
+    api: str,
+    func: Callable[..., Any],
+    *args: Any,
+    is_quota_error: Callable[[Exception], bool] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Call `func` once a token of the `api` bucket is available, retrying it
+    according to the quota policy when it is rejected for quota.
+    """
+    is_quota_error = is_quota_error or is_api_core_quota_error
+    bucket = get_bucket(api)
+    attempt = 0
+    while True:
+        bucket.acquire()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            current = policy
+            if not is_quota_error(e) or attempt >= current.retries:
+                raise
+            delay = current.delay(attempt)
+            attempt += 1
+            logger.debug(
+                f"'{api}' API call rejected for quota, retrying in "
+                f"{delay:.2f}s ({attempt}/{current.retries})"
+            )
+            bucket.penalize(delay)
+
+
+def throttle_client(c: Any, api: str) -> Any:
+    """
+    Route every method of a google-cloud client, pages of list calls
+    included, through the `api` bucket and the quota retry policy.
+    """
+    transport = getattr(c, "_transport", None)
+    methods = getattr(transport, "_wrapped_methods", None)
+    if not isinstance(methods, dict):
+        return c
+
+    for method, rpc in list(methods.items()):
+        if not getattr(rpc, "_chaosgcp_throttled", False):
+            methods[method] = throttled(api, rpc)
+    return c
+
+
+@functools.lru_cache(maxsize=1)
+def request_class() -> type:
+    """
+    A `googleapiclient.http.HttpRequest`, instrumented as well, routing each
+    call to a discovery based API through the bucket of that API and the
+    quota retry policy. Pass it to `build` as its `requestBuilder`.
+    """
+
+    class ThrottledHttpRequest(instrumented_request_class()):
+        def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+            parent = super().execute
+            return call_with_quota_retry(
+                api_name(self.uri),
+                parent,
+                http=http,
+                num_retries=num_retries,
+                is_quota_error=is_http_quota_error,
+            )
+
+    return ThrottledHttpRequest
+
+
+def reset() -> None:
+    """
+    Forget all the rate limits and restore the default quota policy.
+    """
+    global policy
+    with buckets_lock:
+        buckets.clear()
+    policy = QuotaPolicy()
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {api: bucket.stats() for api, bucket in list(buckets.items())}
+
+
+###############################################################################
+# Private functions
+###############################################################################
+buckets: Dict[str, TokenBucket] = {}
+buckets_lock = threading.Lock()
+policy = QuotaPolicy()
+
+
+def throttled(api: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(rpc)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return call_with_quota_retry(api, rpc, *args, **kwargs)
+
+    wrapper._chaosgcp_throttled = True
+    return wrapper
+
+
+def is_api_core_quota_error(error: Exception) -> bool:
+    from google.api_core.exceptions import TooManyRequests
+
+    # RESOURCE_EXHAUSTED is mapped onto ResourceExhausted, a TooManyRequests
+    return isinstance(error, TooManyRequests)
+
+
+def is_http_quota_error(error: Exception) -> bool:
+    from googleapiclient.errors import HttpError
+
+    if not isinstance(error, HttpError):
+        return False
+
+    status = getattr(error.resp, "status", None)
+    if status == 429:
+        return True
+
+    if status == 403:
+        content = error.content or b""
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="replace")
+        return any(reason in content for reason in QUOTA_REASONS)
+
+    return False
@@ -0,0 +1,603 @@
+# -*- coding: utf-8 -*-
+import base64
+import functools
+import importlib
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from chaoslib.exceptions import ActivityFailed
+
+__all__ = [
+    "RECORD",
+    "REPLAY",
+    "Cassette",
+    "CassetteMiss",
+    "Interaction",
+    "start",
+    "stop",
+    "active",
+    "client_arguments",
+    "install_client",
+    "wrap_http",
+]
+logger = logging.getLogger("chaostoolkit")
+
+# forward calls to the API and keep a copy of their responses
+RECORD = "record"
+# answer calls from a cassette, without reaching the network
+REPLAY = "replay"
+
+CASSETTE_VERSION = 1
+
+HTTP = "http"
+RPC = "rpc"
+
+# methods of long-running operations clients, not part of the client's own
+# wrapped methods
+OPERATIONS_METHODS = (
+    "_get_operation",
+    "_list_operations",
+    "_cancel_operation",
+    "_delete_operation",
+)
+
+
+class CassetteMiss(ActivityFailed):
+    pass
+
+
+class Interaction(NamedTuple):
+    kind: str
+    method: str
+    uri: str = ""
+    request: str = ""
+    response: Optional[Dict[str, Any]] = None
+    elapsed: float = 0.0
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        return (self.kind, self.method, self.uri, self.request)
+
+    @property
+    def loose_key(self) -> Tuple[str, str, str]:
+        return (self.kind, self.method, self.uri.split("?", 1)[0])
+
+
+class Cassette:
+    """
+    Calls made to GCP APIs along with their responses.
+
+    When replayed, a call is answered by the first unused interaction of the
+    same method, uri and request. When there is none, any interaction of the
+    same method and path, whatever its query string or request, is used
+    instead, in the order they were recorded. Requests embedding the current
+    time, such as time series intervals, are replayed that way.
+
+    Once all the interactions matching a call are used, the last one keeps
+    answering it, so an operation polled more often than when it was
+    recorded is still reported as done.
+    """
+
+    def __init__(self, interactions: Optional[List[Interaction]] = None):
+        self.interactions: List[Interaction] = []
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._exact: Dict[Tuple, List[int]] = {}
+        self._loose: Dict[Tuple, List[int]] = {}
+        self._cursors: Dict[Tuple, int] = {}
+        for interaction in interactions or []:
+            self.add(interaction)
+
+    def add(self, interaction: Interaction) -> None:
+        with self._lock:
+            index = len(self.interactions)
+            self.interactions.append(interaction)
+            self._exact.setdefault(interaction.key, []).append(index)
+            self._loose.setdefault(interaction.loose_key, []).append(index)
+
+    def find(
+        self, kind: str, method: str, uri: str = "", request: str = ""
+    ) -> Interaction:
+        probe = Interaction(kind, method, uri, request)
+        with self._lock:
+            for index, key in (
+                (self._exact, probe.key),
+                (self._loose, probe.loose_key),
+            ):
+                indices = index.get(key)
+                if not indices:
+                    continue
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = min(cursor + 1, len(indices) - 1)
+                self.hits += 1
+                return self.interactions[indices[cursor]]
+
+            self.misses += 1
+
+        raise CassetteMiss(f"no recorded response for {method} {uri}".strip())
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._cursors.clear()
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            interactions = [i._asdict() for i in self.interactions]
+
+        with open(path, "w") as f:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": interactions},
+                f,
+                indent=2,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path) as f:
+            doc = json.load(f)
+
+        if doc.get("version") != CASSETTE_VERSION:
+            raise ActivityFailed(f"unsupported cassette version in '{path}'")
+
+        return cls([Interaction(**i) for i in doc["interactions"]])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "interactions": len(self.interactions),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def start(
+    mode: Optional[str] = None,
+    path: Optional[str] = None,
+    latency: float = 0.0,
+    endpoints: Optional[Dict[str, str]] = None,
+) -> Optional[Cassette]:
+    """
+    Record the calls made to GCP APIs, or replay them, until `stop` is
+    called.
+
+    With `RECORD`, calls reach the APIs and their responses are saved to
+    the cassette at `path`, if any, when stopping. With `REPLAY`, calls are
+    answered from the cassette at `path` and never reach the network. Each
+    answer is then delayed by the time the call took when recorded, scaled
+    by `latency`, so that `0` replays as fast as possible while `1` replays
+    at the recorded pace.
+
+    `endpoints` redirects the calls made to an API host, such as
+    `compute.googleapis.com`, to another address. Use `http://host:port`
+    for clients talking REST and `host:port` for those talking gRPC. Such
+    calls are sent without credentials, over plain HTTP or an insecure gRPC
+    channel, as they are meant for local stand-in servers. This can be used
+    without a mode.
+
+    Calls are intercepted at the transport of the google-cloud clients, which
+    works the same whether they speak gRPC or REST, and at the HTTP transport
+    of discovery based resources. Clients and resources built before are
+    dropped so that they are built again with the recorder in place.
+    """
+    if mode not in (None, RECORD, REPLAY):
+        raise ActivityFailed(f"unknown replay mode '{mode}'")
+
+    cassette = None
+    if mode == REPLAY:
+        if not path:
+            raise ActivityFailed("replaying requires the path of a cassette")
+        cassette = Cassette.load(path)
+    elif mode == RECORD:
+        cassette = Cassette()
+
+    with session_lock:
+        global session
+        session = Session(mode, cassette, path, latency, endpoints or {})
+
+    reset_clients()
+    if mode == REPLAY:
+        mount_token_adapter()
+
+    logger.debug(f"GCP API calls are now handled in '{mode}' mode")
+    return cassette
+
+
+def stop() -> Optional[Cassette]:
+    """
+    Stop recording or replaying calls and return the cassette, if any. A
+    recorded cassette is saved to its path.
+    """
+    with session_lock:
+        global session
+        current, session = session, None
+
+    if current is None:
+        return None
+
+    if current.mode == RECORD and current.path:
+        current.cassette.save(current.path)
+        logger.debug(f"Saved GCP API calls to '{current.path}'")
+
+    if current.mode == REPLAY:
+        unmount_token_adapter()
+    reset_clients()
+
+    return current.cassette
+
+
+def active() -> Optional["Session"]:
+    return session
+
+
+def client_arguments(
+    client_cls: type, credentials: Any, kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    The constructor arguments of a google-cloud client, pointed at its
+    stand-in endpoint if one is set for its API.
+
+    Replayed clients are given anonymous credentials as they never talk to
+    the API.
+    """
+    s = session
+    arguments = dict(kwargs, credentials=credentials)
+    if s is None:
+        return arguments
+
+    from google.auth.credentials import AnonymousCredentials
+
+    host = default_host(client_cls)
+    target = s.endpoints.get(host) if host else None
+    if target and target.startswith(("http://", "https://")):
+        arguments["transport"] = "rest"
+        arguments["client_options"] = {"api_endpoint": target}
+        arguments["credentials"] = AnonymousCredentials()
+    elif target:
+        import grpc
+
+        transport_cls = client_cls.get_transport_class("grpc")
+        arguments["transport"] = transport_cls(
+            channel=grpc.insecure_channel(target)
+        )
+        arguments["credentials"] = None
+    elif s.mode == REPLAY:
+        arguments["credentials"] = AnonymousCredentials()
+
+    return arguments
+
+
+def install_client(c: Any) -> Any:
+    """
+    Route every method of a google-cloud client, and of its long-running
+    operations client, through the recorder.
+    """
+    s = session
+    if s is None or s.mode is None:
+        return c
+
+    prefix = c.__class__.__name__
+    transport = getattr(c, "_transport", None)
+    wrap_methods(transport, prefix)
+
+    if "operations_client" in dir(type(transport)):
+        try:
+            operations = transport.operations_client
+        except Exception:
+            logger.debug("Could not get operations client", exc_info=True)
+        else:
+            wrap_methods(getattr(operations, "_transport", None), prefix)
+            for name in OPERATIONS_METHODS:
+                rpc = getattr(operations, name, None)
+                if callable(rpc) and not getattr(rpc, "_chaosgcp_replay", 0):
+                    method = f"{prefix}.{name.lstrip('_')}"
+                    setattr(operations, name, recorded(method, rpc))
+
+    return c
+
+
+def wrap_http(http: Any, credentials: Any = None) -> Any:
+    """
+    An `httplib2.Http` compatible transport for discovery based resources
+    going through the recorder, or `None` when calls are not recorded nor
+    replayed. `http` is the transport used to reach the API when recording,
+    an authorized `httplib2.Http` by default.
+    """
+    s = session
+    if s is None or s.mode is None:
+        return None
+
+    if s.mode == RECORD and http is None:
+        import google_auth_httplib2
+        import httplib2
+
+        from chaosgcp.transport import scoped
+
+        http = google_auth_httplib2.AuthorizedHttp(
+            scoped(credentials), http=httplib2.Http()
+        )
+
+    return RecorderHttp(s, http)
+
+
+###############################################################################
+# Private functions
+###############################################################################
+class Session(NamedTuple):
+    mode: Optional[str]
+    cassette: Optional[Cassette]
+    path: Optional[str]
+    latency: float
+    endpoints: Dict[str, str]
+
+    def replay(self, interaction: Interaction) -> Interaction:
+        if self.latency > 0 and interaction.elapsed > 0:
+            time.sleep(interaction.elapsed * self.latency)
+        return interaction
+
+
+class RecorderHttp:
+    def __init__(self, s: Session, http: Any = None) -> None:
+        self.session = s
+        self.http = http
+        self.credentials = getattr(http, "credentials", None)
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> Tuple[Any, bytes]:
+        import httplib2
+
+        uri = normalize_uri(uri)
+        request = to_text(body)
+
+        if self.session.mode == REPLAY:
+            interaction = self.session.replay(
+                self.session.cassette.find(HTTP, method, uri, request)
+            )
+            response = interaction.response
+            info = dict(response["headers"], status=str(response["status"]))
+            return httplib2.Response(info), from_text(response["content"])
+
+        started = time.monotonic()
+        response, content = self.http.request(
+            uri,
+            method=method,
+            body=body,
+            headers=headers,
+            redirections=redirections,
+            connection_type=connection_type,
+        )
+        self.session.cassette.add(
+            Interaction(
+                HTTP,
+                method,
+                uri,
+                request,
+                {
+                    "status": response.status,
+                    "headers": {
+                        k: v for k, v in response.items() if k != "status"
+                    },
+                    "content": to_text(content),
+                },
+                time.monotonic() - started,
+            )
+        )
+        return response, content
+
+
+session_lock = threading.Lock()
+session: Optional[Session] = None
+
+
+def reset_clients() -> None:
+    from chaosgcp import cache, clients, transport
+    from chaosgcp.discovery_cache import resource_cache
+
+    clients.shutdown()
+    transport.shutdown()
+    resource_cache.clear()
+    cache.clear()
+
+
+def mount_token_adapter() -> None:
+    from chaosgcp.transport import pool
+
+    pool.auth_session().mount("https://", token_adapter_class()())
+
+
+def unmount_token_adapter() -> None:
+    from chaosgcp.transport import DEFAULT_POOL_SIZE, mount_pool, pool
+
+    mount_pool(pool.auth_session(), DEFAULT_POOL_SIZE)
+
+
+@functools.lru_cache(maxsize=1)
+def token_adapter_class() -> type:
+    import requests
+    from requests.adapters import BaseAdapter
+
+    class TokenAdapter(BaseAdapter):
+        # replayed calls are not authorized, but credentials loaded from the
+        # secrets are still refreshed, without reaching the network
+        def send(self, request: Any, **kwargs: Any) -> Any:
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["content-type"] = "application/json"
+            response._content = json.dumps(
+                {
+                    "access_token": "replayed",
+                    "expires_in": 3600,
+                    "token_type": "Bearer",
+                }
+            ).encode("utf-8")
+            response.url = request.url
+            response.request = request
+            return response
+
+        def close(self) -> None:
+            pass
+
+    return TokenAdapter
+
+
+def wrap_methods(transport: Any, prefix: str) -> None:
+    methods = getattr(transport, "_wrapped_methods", None)
+    if not isinstance(methods, dict):
+        return
+
+    for key, rpc in list(methods.items()):
+        if not getattr(rpc, "_chaosgcp_replay", False):
+            methods[key] = recorded(f"{prefix}.{rpc_name(key)}", rpc)
+
+
+def rpc_name(key: Any) -> str:
+    # gRPC stubs know their full method name while REST transports name their
+    # callables after the method, so that the same call gets the same name
+    # whichever transport made it
+    name = getattr(key, "_method", None)
+    if isinstance(name, bytes):
+        name = name.decode("utf-8")
+    if isinstance(name, str):
+        name = name.rsplit("/", 1)[-1]
+    elif isinstance(getattr(key, "__name__", None), str):
+        name = key.__name__
+    else:
+        name = type(key).__name__
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name.lstrip("_")).lower()
+
+
+def recorded(method: str, rpc: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(rpc)
+    def wrapper(request: Any, *args: Any, **kwargs: Any) -> Any:
+        s = session
+        if s is None or s.mode is None:
+            return rpc(request, *args, **kwargs)
+
+        encoded = encode_message(request)
+        if s.mode == REPLAY:
+            interaction = s.replay(s.cassette.find(RPC, method, "", encoded))
+            return decode_response(interaction.response)
+
+        from google.api_core.exceptions import GoogleAPICallError
+
+        started = time.monotonic()
+        try:
+            response = rpc(request, *args, **kwargs)
+        except GoogleAPICallError as x:
+            # API errors are part of the recording, network ones are not
+            s.cassette.add(
+                Interaction(
+                    RPC,
+                    method,
+                    "",
+                    encoded,
+                    encode_error(x),
+                    time.monotonic() - started,
+                )
+            )
+            raise
+
+        s.cassette.add(
+            Interaction(
+                RPC,
+                method,
+                "",
+                encoded,
+                encode_response(response),
+                time.monotonic() - started,
+            )
+        )
+        return response
+
+    wrapper._chaosgcp_replay = True
+    return wrapper
+
+
+def encode_message(message: Any) -> str:
+    if message is None:
+        return ""
+    serialize = getattr(type(message), "serialize", None)
+    if serialize is not None:
+        data = serialize(message)
+    else:
+        data = message.SerializeToString()
+    return base64.b64encode(data).decode("ascii")
+
+
+def encode_response(response: Any) -> Dict[str, Any]:
+    if response is None:
+        return {"type": None, "message": ""}
+
+    cls = type(response)
+    return {
+        "type": f"{cls.__module__}:{cls.__qualname__}",
+        "message": encode_message(response),
+    }
+
+
+def encode_error(error: Any) -> Dict[str, Any]:
+    return {"error": {"code": error.code or 500, "message": error.message}}
+
+
+def decode_response(response: Dict[str, Any]) -> Any:
+    error = response.get("error")
+    if error:
+        from google.api_core import exceptions
+
+        raise exceptions.from_http_status(error["code"], error["message"])
+
+    if response["type"] is None:
+        return None
+
+    module_name, _, qualname = response["type"].partition(":")
+    cls = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        cls = getattr(cls, name)
+
+    data = base64.b64decode(response["message"])
+    deserialize = getattr(cls, "deserialize", None)
+    if deserialize is not None:
+        return deserialize(data)
+    return cls.FromString(data)
+
+
+def default_host(client_cls: type) -> Optional[str]:
+    endpoint = getattr(client_cls, "DEFAULT_ENDPOINT", None)
+    if not isinstance(endpoint, str):
+        return None
+    return endpoint.split(":", 1)[0]
+
+
+def normalize_uri(uri: str) -> str:
+    parts = urlsplit(uri)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(parts._replace(query=query))
+
+
+def to_text(data: Any) -> str:
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return data
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return "base64:" + base64.b64encode(data).decode("ascii")
+
+
+def from_text(text: str) -> bytes:
+    if text.startswith("base64:"):
+        return base64.b64decode(text[len("base64:") :])
+    return text.encode("utf-8")
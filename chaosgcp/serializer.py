@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+import base64
+import math
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from google.protobuf import json_format
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
+from google.protobuf.internal import type_checkers
+from google.protobuf.message import Message as ProtobufMessage
+
+from chaosgcp.instrumentation import SERIALIZATION, span
+
+__all__ = ["to_dict", "to_dicts", "compile_fields"]
+
+# a projection tree maps field names to the projection of their own fields,
+# `None` meaning the whole field
+Projection = Optional[Dict[str, Any]]
+Converter = Callable[[Any, Projection, bool], Any]
+
+INT64_TYPES = frozenset(
+    [FieldDescriptor.CPPTYPE_INT64, FieldDescriptor.CPPTYPE_UINT64]
+)
+WKT_STRINGS = frozenset(
+    ["google.protobuf.Duration", "google.protobuf.FieldMask"]
+)
+EPOCH = date(1970, 1, 1)
+
+SINGLE = "single"
+REPEATED = "repeated"
+MAP = "map"
+
+
+def to_dict(
+    message: Any,
+    fields: Optional[Iterable[str]] = None,
+    omit_defaults: bool = False,
+) -> Any:
+    """
+    Serialize a protobuf message, or a proto-plus wrapper of one, into a
+    dictionary.
+
+    The output is the same as proto-plus' `Message.to_dict` (field names as
+    declared in the proto, enums as integers, fields without presence set to
+    their default value) but it is produced by walking the message with
+    converters compiled once per message type, which is several times
+    faster on large payloads such as time series or URL maps.
+
+    `fields` restricts the output to the given fields. Nested fields are
+    selected with dotted paths, such as `points.value` or
+    `metric.labels`, and apply to every item of repeated fields.
+
+    When `omit_defaults` is set, fields holding their default value are not
+    emitted at all, which makes for much smaller journals.
+
+    Objects which are not protobuf messages are handed to their class'
+    `to_dict` method.
+    """
+    with span("serialize", SERIALIZATION, method=type(message).__name__):
+        pb = as_pb(message)
+        if pb is None:
+            return message.__class__.to_dict(message)
+
+        return message_to_json(pb, compile_fields(fields), omit_defaults)
+
+
+def to_dicts(
+    messages: Iterable[Any],
+    fields: Optional[Iterable[str]] = None,
+    omit_defaults: bool = False,
+) -> List[Any]:
+    """
+    Serialize all the given messages, see `to_dict`.
+    """
+    with span("serialize", SERIALIZATION) as s:
+        projection = compile_fields(fields)
+        results = []
+        for message in messages:
+            pb = as_pb(message)
+            if pb is None:
+                results.append(message.__class__.to_dict(message))
+            else:
+                results.append(message_to_json(pb, projection, omit_defaults))
+        s.attributes["count"] = len(results)
+        return results
+
+
+def compile_fields(fields: Optional[Iterable[str]]) -> Projection:
+    """
+    Turn dotted field paths into a projection tree.
+
+    `["name", "points.value", "points.interval"]` becomes
+    `{"name": None, "points": {"value": None, "interval": None}}`.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",")]
+
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        if not path:
+            continue
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # the whole field is already selected
+                break
+            node[part] = child
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+###############################################################################
+# Private functions
+###############################################################################
+_plans: Dict[Descriptor, "MessagePlan"] = {}
+_plans_lock = threading.Lock()
+
+
+class MessagePlan:
+    """
+    Converters for each field of a message type, along with the defaults of
+    its fields without presence.
+    """
+
+    def __init__(self, descriptor: Descriptor) -> None:
+        self.converters: Dict[int, Tuple[str, Converter]] = {}
+        self.defaults: List[Tuple[str, Callable[[], Any]]] = []
+
+        for field in descriptor.fields:
+            self.converters[field.number] = field_plan(field)
+
+            if field.has_presence:
+                continue
+
+            kind, converter = self.converters[field.number]
+            if kind == MAP:
+                self.defaults.append((field.name, dict))
+            elif kind == REPEATED:
+                self.defaults.append((field.name, list))
+            else:
+                default = converter(field.default_value, None, False)
+                self.defaults.append((field.name, lambda d=default: d))
+
+
+def get_plan(descriptor: Descriptor) -> MessagePlan:
+    plan = _plans.get(descriptor)
+    if plan is None:
+        plan = MessagePlan(descriptor)
+        with _plans_lock:
+            _plans[descriptor] = plan
+    return plan
+
+
+def as_pb(message: Any) -> Optional[ProtobufMessage]:
+    if isinstance(message, ProtobufMessage):
+        return message
+
+    pb = getattr(type(message), "pb", None)
+    if pb is None:
+        return None
+
+    try:
+        raw = pb(message)
+    except TypeError:
+        return None
+
+    return raw if isinstance(raw, ProtobufMessage) else None
+
+
+def message_to_json(
+    pb: ProtobufMessage, projection: Projection, omit_defaults: bool
+) -> Any:
+    descriptor = pb.DESCRIPTOR
+    if descriptor.full_name.startswith("google.protobuf."):
+        return message_converter(descriptor)(pb, projection, omit_defaults)
+    return regular_message_to_json(pb, projection, omit_defaults)
+
+
+def regular_message_to_json(
+    pb: ProtobufMessage, projection: Projection, omit_defaults: bool
+) -> Dict[str, Any]:
+    plan = get_plan(pb.DESCRIPTOR)
+    converters = plan.converters
+    js = {}
+
+    for field, value in pb.ListFields():
+        entry = converters.get(field.number)
+        if entry is None:
+            # extensions are not part of the message's own fields
+            entry = field_plan(field)
+            name = f"[{field.full_name}]"
+        else:
+            name = field.name
+
+        sub = None
+        if projection is not None:
+            if name not in projection:
+                continue
+            sub = projection[name]
+
+        kind, converter = entry
+        if kind == SINGLE:
+            js[name] = converter(value, sub, omit_defaults)
+        elif kind == REPEATED:
+            js[name] = [converter(v, sub, omit_defaults) for v in value]
+        else:
+            js[name] = {
+                map_key(k): converter(v, sub, omit_defaults)
+                for k, v in value.items()
+            }
+
+    if not omit_defaults and plan.defaults:
+        for name, default in plan.defaults:
+            if name in js:
+                continue
+            if projection is not None and name not in projection:
+                continue
+            js[name] = default()
+
+    return js
+
+
+def field_plan(field: FieldDescriptor) -> Tuple[str, Converter]:
+    if is_map_entry(field):
+        value_field = field.message_type.fields_by_name["value"]
+        return (MAP, value_converter(value_field))
+    if field.is_repeated:
+        return (REPEATED, value_converter(field))
+    return (SINGLE, value_converter(field))
+
+
+def value_converter(field: FieldDescriptor) -> Converter:
+    cpp_type = field.cpp_type
+
+    if cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        return message_converter(field.message_type)
+    if cpp_type == FieldDescriptor.CPPTYPE_STRING:
+        if field.type == FieldDescriptor.TYPE_BYTES:
+            return lambda v, p, o: base64.b64encode(v).decode("utf-8")
+        return lambda v, p, o: str(v)
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        return lambda v, p, o: bool(v)
+    if cpp_type in INT64_TYPES:
+        return lambda v, p, o: str(v)
+    if cpp_type == FieldDescriptor.CPPTYPE_DOUBLE:
+        # only infinities and NaN are not zero once substracted from
+        # themselves
+        return lambda v, p, o: v if v - v == 0.0 else special_float(v)
+    if cpp_type == FieldDescriptor.CPPTYPE_FLOAT:
+        return lambda v, p, o: (
+            type_checkers.ToShortestFloat(v)
+            if v - v == 0.0
+            else special_float(v)
+        )
+
+    # enums are emitted as integers, like the other 32-bit integers
+    return lambda v, p, o: v
+
+
+def message_converter(descriptor: Descriptor) -> Converter:
+    full_name = descriptor.full_name
+    if full_name == "google.protobuf.Timestamp":
+        return lambda v, p, o: timestamp_to_json(v.seconds, v.nanos)
+    if full_name in WKT_STRINGS:
+        return lambda v, p, o: v.ToJsonString()
+    if full_name.startswith("google.protobuf."):
+        # Any, Struct, wrappers... have their own JSON mapping
+        return lambda v, p, o: json_format.MessageToDict(
+            v,
+            always_print_fields_with_no_presence=not o,
+            preserving_proto_field_name=True,
+            use_integers_for_enums=True,
+        )
+    return regular_message_to_json
+
+
+def timestamp_to_json(seconds: int, nanos: int) -> str:
+    # same output as `Timestamp.ToJsonString()`, points of a time series
+    # usually share their day so its formatting is cached
+    days, seconds = divmod(seconds, 86400)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    ts = f"{day_to_iso(days)}T{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+    if nanos == 0:
+        return ts + "Z"
+    if nanos % 1000000 == 0:
+        return "%s.%03dZ" % (ts, nanos // 1000000)
+    if nanos % 1000 == 0:
+        return "%s.%06dZ" % (ts, nanos // 1000)
+    return "%s.%09dZ" % (ts, nanos)
+
+
+@lru_cache(maxsize=1024)
+def day_to_iso(days: int) -> str:
+    return (EPOCH + timedelta(days=days)).isoformat()
+
+
+def special_float(value: float) -> Optional[str]:
+    if math.isinf(value):
+        return "-Infinity" if value < 0.0 else "Infinity"
+    if math.isnan(value):
+        return "NaN"
+    return None
+
+
+def map_key(key: Any) -> str:
+    if isinstance(key, bool):
+        return "true" if key else "false"
+    return str(key)
+
+
+def is_map_entry(field: FieldDescriptor) -> bool:
+    return (
+        field.type == FieldDescriptor.TYPE_MESSAGE
+        and field.message_type.has_options
+        and field.message_type.GetOptions().map_entry
+    )
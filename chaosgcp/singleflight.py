@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import copy
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+__all__ = ["Group", "group", "do", "request_key", "stats"]
+logger = logging.getLogger("chaostoolkit")
+
+
+class Group:
+    """
+    Coalesce identical reads running at the same time in the process.
+
+    The first caller for a key makes the call. Callers asking for the same
+    key while it is in flight wait for it and share its outcome, rather than
+    each making the same API call. They are given a deep copy of the result,
+    so that they can modify it, or the same error. Nothing is kept once the
+    call completed, see `chaosgcp.cache` for this.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self.calls += 1
+                flight = self._flights[key] = Flight()
+            else:
+                self.coalesced += 1
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            value = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                waiters = flight.waiters
+                del self._flights[key]
+            # snapshot before the caller gets a chance to modify the value
+            if waiters:
+                flight.value = copy.deepcopy(value)
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+group = Group()
+
+
+def do(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """
+    Call `fn`, or wait for the call already in flight for `key` and share
+    its outcome.
+    """
+    return group.do(key, fn)
+
+
+def request_key(
+    method: str, request: Any, credentials: Optional[Any] = None
+) -> Hashable:
+    """
+    A key identifying a call to `method` with the given proto-plus request,
+    on behalf of the given credentials.
+    """
+    creds_id = id(credentials) if credentials is not None else None
+    return (method, creds_id, type(request).serialize(request))
+
+
+def stats() -> Dict[str, int]:
+    return group.stats()
+
+
+###############################################################################
+# Private functions
+###############################################################################
+class Flight:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
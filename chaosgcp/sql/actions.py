@@ -6,10 +6,12 @@ from chaoslib.exceptions import ActivityFailed
 from chaoslib.types import Configuration, Secrets
 
 from chaosgcp import get_context, get_service, wait_on_operation
+from chaosgcp.operations import OperationResult, OperationTracker, Waiter
 from chaosgcp.sql.probes import describe_instance
 
 __all__ = [
     "trigger_failover",
+    "trigger_failovers",
     "export_data",
     "import_data",
     "restore_backup",
@@ -74,12 +76,89 @@ def trigger_failover(
             ops,
             project=ctx.project_id,
             operation=response["name"],
-            frequency=10,
+            frequency=2,
+            max_frequency=10,
         )
 
     return response
 
 
+def trigger_failovers(
+    instance_ids: List[str],
+    wait_until_complete: bool = True,
+    concurrency: int = 8,
+    project_id: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> List[Dict[str, Any]]:
+    """
+    Causes many high-availability Cloud SQL instances to failover at once.
+
+    All the failovers are requested first and, when `wait_until_complete`
+    is set, their operations are then awaited concurrently by up to
+    `concurrency` threads. An instance whose failover cannot be triggered
+    is reported as failed without stopping the others.
+
+    See: https://cloud.google.com/sql/docs/postgres/admin-api/v1/instances/failover
+
+    :param instance_ids: Cloud SQL instance IDs.
+    :param wait_until_complete: wait for the operations in progress to
+        complete.
+    :param concurrency: how many operations are awaited at once.
+
+    :return: the operations, or their outcome when waiting for them
+    """  # noqa: E501
+    ctx = get_context(configuration=configuration, project_id=project_id)
+    service = get_service(
+        "sqladmin",
+        version="v1",
+        configuration=configuration,
+        secrets=secrets,
+    )
+
+    # a failover which cannot be triggered does not prevent the others
+    responses = []
+    for instance_id in instance_ids:
+        try:
+            response = trigger_failover(
+                instance_id,
+                wait_until_complete=False,
+                project_id=ctx.project_id,
+                configuration=configuration,
+                secrets=secrets,
+            )
+        except Exception as x:
+            logger.debug(f"Failover of '{instance_id}' failed to start: {x}")
+            response = OperationResult(instance_id, error=x)
+        responses.append(response)
+
+    if not wait_until_complete:
+        return [
+            r.to_dict() if isinstance(r, OperationResult) else r
+            for r in responses
+        ]
+
+    waiter = Waiter(initial_delay=2, max_delay=10)
+    with OperationTracker(max_workers=concurrency, waiter=waiter) as tracker:
+        for instance_id, response in zip(instance_ids, responses):
+            if isinstance(response, OperationResult):
+                tracker.add_failure(instance_id, response.error)
+                continue
+            tracker.add_discovery_operation(
+                service.operations(),
+                name=instance_id,
+                project=ctx.project_id,
+                operation=response["name"],
+            )
+        results = tracker.wait()
+
+    for r in results:
+        if not r.ok:
+            logger.error(f"Failover of '{r.name}' failed: {r.error}")
+
+    return [r.to_dict() for r in results]
+
+
 def export_data(
     instance_id: str,
     storage_uri: str,
@@ -105,7 +184,7 @@ def export_data(
 
     if file_type not in ["sql", "csv"]:
         raise ActivityFailed(
-            "Cannot export database. " "File type '{ft}' is invalid.".format(
+            "Cannot export database. File type '{ft}' is invalid.".format(
                 ft=file_type
             )
         )
@@ -197,7 +276,7 @@ def import_data(
         )
     if not database:
         raise ActivityFailed(
-            "Cannot import data into database. " "Database name is required."
+            "Cannot import data into database. Database name is required."
         )
     if not storage_uri:
         raise ActivityFailed(
@@ -317,7 +396,8 @@ def restore_backup(
         ops = service.operations()
         response = wait_on_operation(
             ops,
-            frequency=30,
+            frequency=5,
+            max_frequency=30,
             project=ctx.project_id,
             operation=response["name"],
         )
@@ -359,7 +439,8 @@ def disable_replication(
         ops = service.operations()
         response = wait_on_operation(
             ops,
-            frequency=30,
+            frequency=5,
+            max_frequency=30,
             project=ctx.project_id,
             operation=response["name"],
         )
@@ -401,7 +482,8 @@ def enable_replication(
         ops = service.operations()
         response = wait_on_operation(
             ops,
-            frequency=30,
+            frequency=5,
+            max_frequency=30,
             project=ctx.project_id,
             operation=response["name"],
         )
@@ -440,7 +522,8 @@ def promote_replica(
         ops = service.operations()
         response = wait_on_operation(
             ops,
-            frequency=30,
+            frequency=5,
+            max_frequency=30,
             project=ctx.project_id,
             operation=response["name"],
         )
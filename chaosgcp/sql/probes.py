@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from chaoslib.types import Configuration, Secrets
 
 from chaosgcp import get_context, get_service
+from chaosgcp.batch import BATCH_LIMIT, execute_batch
 
-__all__ = ["list_instances", "describe_instance"]
+__all__ = ["list_instances", "describe_instance", "describe_instances"]
 
 
 def list_instances(
@@ -74,6 +75,55 @@ def describe_instance(
     return response
 
 
+def describe_instances(
+    instance_ids: List[str],
+    batch_size: int = BATCH_LIMIT,
+    project_id: str = None,
+    configuration: Configuration = None,
+    secrets: Secrets = None,
+) -> Dict[str, Any]:
+    """
+    Displays configuration and metadata about many Cloud SQL instances.
+
+    The instances are fetched in batches of up to `batch_size` calls per
+    HTTP request, rather than one request per instance.
+
+    See: https://cloud.google.com/sql/docs/postgres/admin-api/v1/instances/get
+
+    :param instance_ids: Cloud SQL instance IDs.
+    :param batch_size: how many instances are described per HTTP request.
+
+    :return: the instances which could be described and the errors of the
+        others
+    """  # noqa: E501
+    ctx = get_context(configuration=configuration, project_id=project_id)
+    service = get_service(
+        "sqladmin",
+        version="v1",
+        configuration=configuration,
+        secrets=secrets,
+    )
+
+    results = execute_batch(
+        service,
+        [
+            (
+                instance_id,
+                service.instances().get(
+                    project=ctx.project_id, instance=instance_id
+                ),
+            )
+            for instance_id in instance_ids
+        ],
+        batch_size=batch_size,
+    )
+
+    return {
+        "instances": [r.response for r in results if r.ok],
+        "errors": [r.to_dict() for r in results if not r.ok],
+    }
+
+
 def list_databases(
     instance_id: str,
     project_id: str = None,
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import socket
+import threading
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from chaoslib.types import Configuration
+
+__all__ = [
+    "PooledHttp",
+    "TransportSettings",
+    "auth_request",
+    "get_http",
+    "get_transport_settings",
+    "shutdown",
+    "stats",
+]
+logger = logging.getLogger("chaostoolkit")
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 60.0
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# headers describing the raw payload, which requests already decoded
+DECODED_HEADERS = ("content-encoding", "content-length")
+
+
+class TransportSettings(NamedTuple):
+    pooled: bool = False
+    pool_size: int = DEFAULT_POOL_SIZE
+    timeout: float = DEFAULT_TIMEOUT
+    keep_alive: bool = True
+
+
+class PooledHttp:
+    """
+    `httplib2.Http` compatible transport for discovery based services, backed
+    by a `google.auth.transport.requests.AuthorizedSession`.
+
+    Unlike `httplib2.Http`, the session is thread-safe and keeps a pool of
+    up to `pool_size` connections per host alive, so that all the activities
+    talking to the same API reuse their connections, and TLS handshakes,
+    rather than opening new ones.
+
+    The session authorizes its requests itself, refreshing its credentials
+    when needed. They are exposed as `credentials` so that `googleapiclient`
+    can authorize the calls of batch requests too.
+    """
+
+    def __init__(
+        self, credentials: Any, settings: TransportSettings = None
+    ) -> None:
+        from google.auth.transport.requests import AuthorizedSession
+
+        settings = settings or TransportSettings(pooled=True)
+        self.credentials = credentials
+        self.timeout = settings.timeout
+        self.keep_alive = settings.keep_alive
+        self.session = AuthorizedSession(
+            credentials, auth_request=auth_request()
+        )
+        mount_pool(self.session, settings.pool_size)
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> Tuple[Any, bytes]:
+        import httplib2
+        import requests
+
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers["connection"] = "close"
+
+        # googleapiclient retries on the builtin exceptions httplib2 raises
+        try:
+            r = self.session.request(
+                method,
+                uri,
+                data=body,
+                headers=headers,
+                timeout=self.timeout,
+                allow_redirects=redirections > 0,
+            )
+        except requests.Timeout as e:
+            raise socket.timeout(str(e)) from e
+        except requests.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+
+        info = {
+            k.lower(): v
+            for k, v in r.headers.items()
+            if k.lower() not in DECODED_HEADERS
+        }
+        info["status"] = str(r.status_code)
+        response = httplib2.Response(info)
+        response.reason = r.reason
+        return response, r.content
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def get_transport_settings(
+    configuration: Configuration = None,
+) -> TransportSettings:
+    """
+    Read the transport settings from the configuration:
+
+    * `gcp_http_transport`: `pooled` to use `PooledHttp`, the default is
+      `httplib2`. The `CHAOSGCP_HTTP_TRANSPORT` environment variable is
+      used when the key is not set
+    * `gcp_http_pool_size`: how many connections are kept alive per host
+    * `gcp_http_timeout`: how long, in seconds, to wait for a response
+    * `gcp_http_keep_alive`: set it to `false` to close connections after
+      each request
+    """
+    configuration = configuration or {}
+    transport = configuration.get(
+        "gcp_http_transport", os.getenv("CHAOSGCP_HTTP_TRANSPORT", "httplib2")
+    )
+    keep_alive = configuration.get("gcp_http_keep_alive", True)
+    if isinstance(keep_alive, str):
+        keep_alive = keep_alive.lower() in ("1", "true", "yes")
+
+    return TransportSettings(
+        pooled=str(transport).lower() == "pooled",
+        pool_size=int(
+            configuration.get("gcp_http_pool_size", DEFAULT_POOL_SIZE)
+        ),
+        timeout=float(configuration.get("gcp_http_timeout", DEFAULT_TIMEOUT)),
+        keep_alive=bool(keep_alive),
+    )
+
+
+def get_http(
+    credentials: Any = None, settings: TransportSettings = None
+) -> PooledHttp:
+    """
+    Return the process-wide `PooledHttp` transport for the given credentials
+    and settings, creating it if needed.
+
+    Credentials are scoped to `cloud-platform`, as `googleapiclient` does not
+    scope credentials it is not given. Without credentials, the application
+    default credentials are used.
+    """
+    return pool.get(credentials, settings or TransportSettings(pooled=True))
+
+
+def auth_request() -> Any:
+    """
+    A `google.auth` request over a process-wide pooled session, for
+    refreshing access tokens without opening a new connection every time.
+    """
+    from google.auth.transport.requests import Request
+
+    return Request(session=pool.auth_session())
+
+
+def shutdown() -> None:
+    """
+    Close all the pooled transports. Resources built with them open new
+    connections on their next call.
+    """
+    pool.shutdown()
+
+
+def stats() -> Dict[str, int]:
+    return pool.stats()
+
+
+###############################################################################
+# Private functions
+###############################################################################
+class TransportPool:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # entries hold their credentials, so their identity cannot be reused
+        # while the entry lives
+        self._transports: Dict[Hashable, Tuple[Any, PooledHttp]] = {}
+        self._auth_session = None
+
+    def get(self, credentials: Any, settings: TransportSettings) -> PooledHttp:
+        key = (id(credentials) if credentials is not None else None, settings)
+
+        with self._lock:
+            entry = self._transports.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            logger.debug(f"Creating pooled HTTP transport with {settings}")
+            http = PooledHttp(scoped(credentials), settings)
+            self._transports[key] = (credentials, http)
+            return http
+
+    def auth_session(self) -> Any:
+        with self._lock:
+            if self._auth_session is None:
+                import requests
+
+                self._auth_session = requests.Session()
+                mount_pool(self._auth_session, DEFAULT_POOL_SIZE)
+            return self._auth_session
+
+    def shutdown(self) -> None:
+        with self._lock:
+            transports = [http for _, http in self._transports.values()]
+            self._transports.clear()
+
+        for http in transports:
+            try:
+                http.close()
+            except Exception:
+                logger.debug("Failed to close HTTP transport", exc_info=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._transports),
+            }
+
+
+pool = TransportPool()
+
+
+def scoped(credentials: Any) -> Any:
+    import google.auth
+    from google.auth.credentials import with_scopes_if_required
+
+    if credentials is None:
+        credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+        return credentials
+
+    return with_scopes_if_required(credentials, [CLOUD_PLATFORM_SCOPE])
+
+
+def mount_pool(session: Any, pool_size: int) -> None:
+    from requests.adapters import HTTPAdapter
+
+    # retries are left to googleapiclient, which knows which calls are safe
+    # to retry
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
@@ -1,2 +1,20 @@
 # -*- coding: utf-8 -*-
 import fixtures  # noqa
+import pytest
+
+from chaosgcp import cache, clients
+from chaosgcp.auth import clear_credentials_cache
+from chaosgcp.discovery_cache import resource_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """
+    Process-wide caches would otherwise leak mocks from one test to the next
+    """
+    clear_credentials_cache()
+    resource_cache.clear()
+    cache.clear()
+    yield
+    clear_credentials_cache()
+    clients.shutdown()
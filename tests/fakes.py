@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-ins for the GCP APIs, for tests and benchmarks to exercise the
+real clients, their serialization, pagination and operation polling, with
+no network.
+
+```python
+from chaosgcp import replay
+
+gcp = FakeGCP(latency=0.05)
+gcp.add_url_map("my-project", "my-map")
+gcp.start()
+replay.start(endpoints=gcp.endpoints)
+...
+replay.stop()
+gcp.stop()
+```
+
+Compute URL maps, Cloud Run services and GKE node pools are served over
+REST, monitoring SLOs and time series over gRPC, as their clients talk.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import grpc
+from google.cloud import monitoring_v3
+
+__all__ = ["FakeGCP"]
+
+PAGE_SIZE = 100
+
+RUN_SERVICE_TYPE = "type.googleapis.com/google.cloud.run.v2.Service"
+
+PROJECT = r"projects/(?P<project>[^/]+)"
+LOCATION = PROJECT + r"/locations/(?P<location>[^/]+)"
+NAME = r"/(?P<name>[^/]+)"
+
+
+class Operation:
+    def __init__(self, pending: Dict[str, Any], done: Dict[str, Any]) -> None:
+        self.pending = pending
+        self.done = done
+        self.polls = 0
+
+
+class FakeGCP:
+    """
+    In-memory GCP resources served by local REST and gRPC servers.
+
+    Every request waits `latency` seconds before being answered. Operations
+    are reported done once they have been polled `polls` times, and list
+    calls return pages of `page_size` items.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, polls: int = 1, page_size: int = PAGE_SIZE
+    ) -> None:
+        self.latency = latency
+        self.polls = polls
+        self.page_size = page_size
+        self.url_maps: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.services: Dict[str, Dict[str, Any]] = {}
+        self.node_pools: Dict[str, Dict[str, Any]] = {}
+        self.slos: Dict[str, monitoring_v3.ServiceLevelObjective] = {}
+        self.time_series: Dict[str, List[monitoring_v3.TimeSeries]] = {}
+        self.operations: Dict[str, Operation] = {}
+        self.calls: List[str] = []
+        self._operations = 0
+        self._lock = threading.Lock()
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._grpc: Optional[grpc.Server] = None
+        url_maps = PROJECT + "/global/urlMaps"
+        services = LOCATION + "/services"
+        node_pool = LOCATION + "/clusters/[^/]+/nodePools/[^/:]+"
+        self._routes: List[Tuple[str, str, Callable]] = [
+            ("GET", url_maps + NAME, self.get_url_map),
+            ("GET", url_maps, self.list_url_maps),
+            ("GET", services + NAME, self.get_service),
+            ("GET", services, self.list_services),
+            ("DELETE", services + NAME, self.delete_service),
+            ("GET", LOCATION + "/operations" + NAME, self.get_operation),
+            ("GET", node_pool, self.get_node_pool),
+            ("POST", node_pool + ":setSize", self.set_node_pool_size),
+        ]
+
+    @property
+    def endpoints(self) -> Dict[str, str]:
+        """
+        The API hosts served, to pass to `chaosgcp.replay.start`.
+        """
+        http = "http://127.0.0.1:{}".format(self._http.server_address[1])
+        return {
+            "compute.googleapis.com": http,
+            "run.googleapis.com": http,
+            "container.googleapis.com": http,
+            "monitoring.googleapis.com": f"127.0.0.1:{self._grpc_port}",
+        }
+
+    def start(self) -> "FakeGCP":
+        self._http = ThreadingHTTPServer(("127.0.0.1", 0), self.http_handler())
+        self._http.daemon_threads = True
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+        self._grpc = grpc.server(ThreadPoolExecutor(max_workers=8))
+        self._grpc.add_generic_rpc_handlers(self.grpc_handlers())
+        self._grpc_port = self._grpc.add_insecure_port("127.0.0.1:0")
+        self._grpc.start()
+        return self
+
+    def stop(self) -> None:
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._grpc is not None:
+            self._grpc.stop(grace=None)
+
+    def add_url_map(self, project: str, name: str, **fields: Any) -> None:
+        self.url_maps[(project, name)] = dict(
+            fields,
+            name=name,
+            selfLink=f"https://compute.googleapis.com/compute/v1/projects/"
+            f"{project}/global/urlMaps/{name}",
+        )
+
+    def add_service(self, parent: str, **fields: Any) -> None:
+        self.services[parent] = dict(fields, name=parent)
+
+    def add_node_pool(self, parent: str, node_count: int = 3) -> None:
+        self.node_pools[parent] = {
+            "name": parent.rsplit("/", 1)[-1],
+            "selfLink": parent,
+            "initialNodeCount": node_count,
+        }
+
+    def add_slo(self, name: str, goal: float = 0.99) -> None:
+        self.slos[name] = monitoring_v3.ServiceLevelObjective(
+            name=name, goal=goal
+        )
+
+    def add_time_series(self, project: str, values: List[float]) -> None:
+        series = monitoring_v3.TimeSeries(
+            points=[
+                monitoring_v3.Point(
+                    value=monitoring_v3.TypedValue(double_value=v)
+                )
+                for v in values
+            ]
+        )
+        self.time_series.setdefault(project, []).append(series)
+
+    ###########################################################################
+    # REST
+    ###########################################################################
+    def get_url_map(
+        self, path: str, query: Dict, body: Dict, project: str, name: str
+    ):
+        url_map = self.url_maps.get((project, name))
+        if url_map is None:
+            return 404, error(404, f"urlMap '{name}' not found")
+        return 200, url_map
+
+    def list_url_maps(self, path: str, query: Dict, body: Dict, project: str):
+        items = [
+            m for (p, _), m in sorted(self.url_maps.items()) if p == project
+        ]
+        page, token = self.paginate(items, query, "maxResults")
+        return 200, dict(token, items=page)
+
+    def get_service(self, path: str, query: Dict, body: Dict, **names: str):
+        service = self.services.get(path)
+        if service is None:
+            return 404, error(404, "service not found")
+        return 200, service
+
+    def list_services(self, path: str, query: Dict, body: Dict, **names: str):
+        prefix = path + "/"
+        items = [
+            s for n, s in sorted(self.services.items()) if n.startswith(prefix)
+        ]
+        page, token = self.paginate(items, query, "pageSize")
+        return 200, dict(token, services=page)
+
+    def delete_service(self, path: str, query: Dict, body: Dict, **names: str):
+        with self._lock:
+            service = self.services.pop(path, None)
+        if service is None:
+            return 404, error(404, "service not found")
+
+        name = self.operation_name(**names)
+        response = dict(service, **{"@type": RUN_SERVICE_TYPE})
+        pending = {"name": name, "done": False}
+        self.operations[name] = Operation(
+            pending, {"done": True, "response": response}
+        )
+        return 200, pending
+
+    def get_node_pool(self, path: str, query: Dict, body: Dict, **names: str):
+        node_pool = self.node_pools.get(path)
+        if node_pool is None:
+            return 404, error(404, "node pool not found")
+        return 200, node_pool
+
+    def set_node_pool_size(
+        self, path: str, query: Dict, body: Dict, **names: str
+    ):
+        parent = path.rsplit(":", 1)[0]
+        node_pool = self.node_pools.get(parent)
+        if node_pool is None:
+            return 404, error(404, "node pool not found")
+
+        node_pool["initialNodeCount"] = body.get("nodeCount", 0)
+        name = self.operation_name(**names)
+        pending = {
+            "name": name.rsplit("/", 1)[-1],
+            "operationType": "SET_NODE_POOL_SIZE",
+            "status": "RUNNING",
+            "targetLink": parent,
+        }
+        self.operations[name] = Operation(pending, {"status": "DONE"})
+        return 200, pending
+
+    def get_operation(self, path: str, query: Dict, body: Dict, **names: str):
+        operation = self.operations.get(path)
+        if operation is None:
+            return 404, error(404, "operation not found")
+
+        with self._lock:
+            operation.polls += 1
+            done = operation.polls >= self.polls
+
+        if not done:
+            return 200, operation.pending
+        return 200, dict(operation.pending, **operation.done)
+
+    ###########################################################################
+    # gRPC
+    ###########################################################################
+    def list_time_series(
+        self, request: monitoring_v3.ListTimeSeriesRequest, context: Any
+    ) -> monitoring_v3.ListTimeSeriesResponse:
+        self.record(f"ListTimeSeries {request.name}")
+        project = request.name.split("/", 1)[-1]
+        items = self.time_series.get(project, [])
+        start = int(request.page_token or 0)
+        size = request.page_size or self.page_size
+        end = start + size
+        return monitoring_v3.ListTimeSeriesResponse(
+            time_series=items[start:end],
+            next_page_token=str(end) if end < len(items) else "",
+        )
+
+    def get_service_level_objective(
+        self,
+        request: monitoring_v3.GetServiceLevelObjectiveRequest,
+        context: Any,
+    ) -> monitoring_v3.ServiceLevelObjective:
+        self.record(f"GetServiceLevelObjective {request.name}")
+        slo = self.slos.get(request.name)
+        if slo is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "SLO not found")
+        return slo
+
+    def grpc_handlers(self) -> List[Any]:
+        def unary(func: Callable, request_cls: Any, response_cls: Any) -> Any:
+            return grpc.unary_unary_rpc_method_handler(
+                func,
+                request_deserializer=request_cls.deserialize,
+                response_serializer=response_cls.serialize,
+            )
+
+        return [
+            grpc.method_handlers_generic_handler(
+                "google.monitoring.v3.MetricService",
+                {
+                    "ListTimeSeries": unary(
+                        self.list_time_series,
+                        monitoring_v3.ListTimeSeriesRequest,
+                        monitoring_v3.ListTimeSeriesResponse,
+                    )
+                },
+            ),
+            grpc.method_handlers_generic_handler(
+                "google.monitoring.v3.ServiceMonitoringService",
+                {
+                    "GetServiceLevelObjective": unary(
+                        self.get_service_level_objective,
+                        monitoring_v3.GetServiceLevelObjectiveRequest,
+                        monitoring_v3.ServiceLevelObjective,
+                    )
+                },
+            ),
+        ]
+
+    ###########################################################################
+    # Plumbing
+    ###########################################################################
+    def record(self, call: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(call)
+
+    def route(self, method: str, url: str, body: Dict) -> Tuple[int, Dict]:
+        parts = urlsplit(url)
+        # REST paths are prefixed by the API and its version
+        path = re.sub(r"^/(compute/v1|v1|v2)/", "", parts.path)
+        self.record(f"{method} {path}")
+
+        for verb, pattern, handler in self._routes:
+            m = re.fullmatch(pattern, path)
+            if verb == method and m:
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                return handler(path, query, body, **m.groupdict())
+
+        return 404, error(404, f"no such resource {path}")
+
+    def paginate(
+        self, items: List[Any], query: Dict[str, str], size_param: str
+    ) -> Tuple[List[Any], Dict[str, str]]:
+        start = int(query.get("pageToken") or 0)
+        end = start + int(query.get(size_param) or self.page_size)
+        token = {"nextPageToken": str(end)} if end < len(items) else {}
+        return items[start:end], token
+
+    def operation_name(self, project: str, location: str, **names: str) -> str:
+        with self._lock:
+            self._operations += 1
+            number = self._operations
+        parent = f"projects/{project}/locations/{location}"
+        return f"{parent}/operations/operation-{number}"
+
+    def http_handler(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_request(self) -> None:
+                length = int(self.headers.get("content-length") or 0)
+                payload = self.rfile.read(length) if length else b""
+                body = json.loads(payload) if payload else {}
+                status, response = fake.route(self.command, self.path, body)
+
+                content = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_DELETE = do_PATCH = handle_request
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def error(code: int, message: str) -> Dict[str, Any]:
+    return {"error": {"code": code, "message": message}}
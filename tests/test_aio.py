@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fixtures
+import pytest
+from google.cloud import container_v1, monitoring_v3
+
+from chaosgcp.aio import get_client, to_async
+from chaosgcp.aio.monitoring import valid_slo_ratio_during_window
+from chaosgcp.aio.nodepool import resize_nodepools
+from chaosgcp.aio.operations import AsyncWaiter
+from chaosgcp.operations import OperationTimeout
+
+PARENT = "projects/my-project/locations/us-west1-a/clusters/my-cluster"
+
+
+class AsyncPager:
+    def __init__(self, items):
+        self.items = items
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        for item in self.items:
+            yield item
+
+
+def test_async_waiter_polls_until_done():
+    outcomes = iter([(False, None), (False, None), (True, "done")])
+
+    async def poll(remaining):
+        return next(outcomes)
+
+    waiter = AsyncWaiter(initial_delay=0, jitter=0)
+    assert asyncio.run(waiter.wait(poll)) == "done"
+
+
+def test_async_waiter_gives_up_at_deadline():
+    async def poll(remaining):
+        return False, None
+
+    waiter = AsyncWaiter(initial_delay=0.01, deadline=0.05)
+    with pytest.raises(OperationTimeout):
+        asyncio.run(waiter.wait(poll))
+
+
+def test_async_clients_are_shared_per_event_loop():
+    client_cls = MagicMock()
+    credentials = MagicMock()
+
+    async def get_twice():
+        return (
+            get_client(client_cls, credentials),
+            get_client(client_cls, credentials),
+        )
+
+    c1, c2 = asyncio.run(get_twice())
+    asyncio.run(get_twice())
+
+    assert c1 is c2
+    assert client_cls.call_count == 2
+
+
+def test_to_async_runs_in_executor():
+    def activity(name, secrets=None):
+        return name, threading.current_thread()
+
+    name, thread = asyncio.run(to_async(activity)("my-vm", secrets={}))
+
+    assert name == "my-vm"
+    assert thread is not threading.main_thread()
+
+
+@patch("chaosgcp.aio.monitoring.monitoring_v3.MetricServiceAsyncClient")
+@patch(
+    "chaosgcp.aio.monitoring.monitoring_v3.ServiceMonitoringServiceAsyncClient"
+)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_valid_slo_ratio_during_window(Credentials, SLOClient, MetricClient):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+    SLOClient.return_value.get_service_level_objective = AsyncMock(
+        return_value=monitoring_v3.ServiceLevelObjective(name="my-slo")
+    )
+    series = monitoring_v3.TimeSeries(
+        points=[
+            monitoring_v3.Point(value=monitoring_v3.TypedValue(double_value=v))
+            for v in (0.95, 0.99, 0.5)
+        ]
+    )
+    MetricClient.return_value.list_time_series = AsyncMock(
+        return_value=AsyncPager([series])
+    )
+
+    assert asyncio.run(
+        valid_slo_ratio_during_window(
+            "my-slo",
+            expected_ratio=0.5,
+            min_level=0.9,
+            configuration=fixtures.configuration,
+            secrets=fixtures.secrets,
+        )
+    )
+
+    request = MetricClient.return_value.list_time_series.call_args[1]["request"]
+    assert request.filter == 'select_slo_health("my-slo")'
+
+
+@patch("chaosgcp.aio.nodepool.container_v1.ClusterManagerAsyncClient")
+@patch("chaosgcp.Credentials", autospec=True)
+def test_resize_nodepools_awaits_all_resizes(Credentials, ClusterManager):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+
+    async def set_node_pool_size(request):
+        if request.name.endswith("broken"):
+            raise RuntimeError("boom")
+        return container_v1.Operation(name="op")
+
+    client = ClusterManager.return_value
+    client.set_node_pool_size = AsyncMock(side_effect=set_node_pool_size)
+    client.get_operation = AsyncMock(
+        return_value=container_v1.Operation(
+            name="op", status=container_v1.Operation.Status.DONE
+        )
+    )
+
+    results = asyncio.run(
+        resize_nodepools(
+            [f"{PARENT}/nodePools/pool-1", f"{PARENT}/nodePools/broken"],
+            pool_size=3,
+            secrets=fixtures.secrets,
+        )
+    )
+
+    assert [r["ok"] for r in results] == [True, False]
+    assert results[1]["error"] == "boom"
+    client.get_operation.assert_awaited_once_with(
+        name="projects/my-project/locations/us-west1-a/operations/op"
+    )
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import fixtures
+
+from chaosgcp import load_credentials
+from chaosgcp.auth import (
+    CredentialsCache,
+    credentials_cache,
+    get_credentials_cache_stats,
+)
+
+
+@patch("chaosgcp.Credentials", autospec=True)
+def test_credentials_are_loaded_once_per_file(Credentials):
+    creds = MagicMock(expired=False, expiry=None)
+    Credentials.from_service_account_file.return_value = creds
+
+    assert load_credentials(fixtures.secrets) is creds
+    assert load_credentials(fixtures.secrets) is creds
+
+    Credentials.from_service_account_file.assert_called_once()
+    stats = get_credentials_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+@patch("chaosgcp.Credentials", autospec=True)
+def test_credentials_are_reloaded_when_file_changes(Credentials, tmp_path):
+    creds_file = tmp_path / "creds.json"
+    with open(fixtures.secrets["service_account_file"]) as f:
+        creds_file.write_text(f.read())
+    secrets = {"service_account_file": str(creds_file)}
+
+    first = MagicMock(expired=False, expiry=None)
+    second = MagicMock(expired=False, expiry=None)
+    Credentials.from_service_account_file.side_effect = [first, second]
+
+    assert load_credentials(secrets) is first
+
+    st = os.stat(creds_file)
+    os.utime(creds_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert load_credentials(secrets) is second
+    assert get_credentials_cache_stats()["size"] == 1
+
+
+@patch("chaosgcp.Credentials", autospec=True)
+def test_credentials_info_are_keyed_on_content(Credentials):
+    Credentials.from_service_account_info.side_effect = lambda info: MagicMock(
+        expired=False, expiry=None
+    )
+
+    a = load_credentials({"service_account_info": {"client_email": "a@b"}})
+    b = load_credentials({"service_account_info": {"client_email": "a@b"}})
+    c = load_credentials({"service_account_info": {"client_email": "c@d"}})
+
+    assert a is b
+    assert a is not c
+    assert credentials_cache.stats()["misses"] == 2
+
+
+@patch("chaosgcp.auth.CredentialsCache.refresh", autospec=True)
+def test_credentials_close_to_expiry_are_refreshed(refresh):
+    cache = CredentialsCache(refresh_margin=300)
+    creds = MagicMock(
+        expired=False, expiry=datetime.utcnow() + timedelta(seconds=30)
+    )
+
+    refreshed = threading.Event()
+    refresh.side_effect = lambda *args: refreshed.set()
+
+    cache.get(("info", "x"), lambda: creds)
+
+    assert refreshed.wait(5)
+    refresh.assert_called_once_with(cache, creds, False)
+
+
+@patch("chaosgcp.auth.CredentialsCache.refresh", autospec=True)
+def test_expired_credentials_are_refreshed_synchronously(refresh):
+    cache = CredentialsCache()
+    creds = MagicMock(expired=True)
+
+    cache.get(("info", "x"), lambda: creds)
+
+    refresh.assert_called_once_with(cache, creds)
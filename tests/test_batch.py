@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+import fixtures
+
+from chaosgcp.batch import BATCH_LIMIT, execute_batch
+from chaosgcp.cloudbuild.probes import get_triggers
+from chaosgcp.dns.actions import update_dns_records
+from chaosgcp.sql.probes import describe_instances
+
+
+class FakeBatch:
+    # answers each request with its own body, or with the error it is
+    # given, the way `BatchHttpRequest` calls back
+    def __init__(self, errors=None, failure=None):
+        self.errors = errors or {}
+        self.failure = failure
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request, callback, request_id))
+
+    def execute(self):
+        if self.failure:
+            raise self.failure
+        for request, callback, request_id in self.requests:
+            error = self.errors.get(request) if self.errors else None
+            callback(request_id, None if error else request, error)
+
+
+def batched_service(errors=None, failure=None):
+    service = MagicMock()
+    batches = []
+
+    def new_batch_http_request():
+        batches.append(FakeBatch(errors, failure))
+        return batches[-1]
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service, batches
+
+
+def test_execute_batch_splits_requests_and_keeps_order():
+    service, batches = batched_service(errors={"r2": RuntimeError("boom")})
+    requests = [(f"n{i}", f"r{i}") for i in range(5)]
+
+    results = execute_batch(service, requests, batch_size=2)
+
+    assert [len(b.requests) for b in batches] == [2, 2, 1]
+    assert [r.name for r in results] == ["n0", "n1", "n2", "n3", "n4"]
+    assert [r.response for r in results] == ["r0", "r1", None, "r3", "r4"]
+    assert results[2].to_dict() == {
+        "name": "n2",
+        "ok": False,
+        "error": "boom",
+        "response": None,
+    }
+
+
+def test_execute_batch_is_capped_to_the_api_limit():
+    service, batches = batched_service()
+
+    execute_batch(service, [("n", "r")] * (BATCH_LIMIT + 1), batch_size=5000)
+
+    assert [len(b.requests) for b in batches] == [BATCH_LIMIT, 1]
+
+
+def test_execute_batch_reports_failed_round_trips():
+    service, _ = batched_service(failure=ConnectionError("unreachable"))
+
+    results = execute_batch(service, [("a", "ra"), ("b", "rb")])
+
+    assert [str(r.error) for r in results] == ["unreachable"] * 2
+
+
+@patch("chaosgcp.build", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_describe_instances(Credentials, service_builder):
+    project_id = fixtures.configuration["gcp_project_id"]
+    Credentials.from_service_account_file.return_value = MagicMock()
+
+    service, batches = batched_service()
+    service_builder.return_value = service
+    service.instances.return_value.get.side_effect = lambda **kw: kw
+
+    response = describe_instances(
+        ["db-1", "db-2"],
+        configuration=fixtures.configuration,
+        secrets=fixtures.secrets,
+    )
+
+    assert len(batches) == 1
+    assert response["errors"] == []
+    assert response["instances"] == [
+        {"project": project_id, "instance": "db-1"},
+        {"project": project_id, "instance": "db-2"},
+    ]
+
+
+@patch("chaosgcp.build", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_get_triggers(Credentials, service_builder):
+    Credentials.from_service_account_file.return_value = MagicMock()
+
+    service, _ = batched_service(errors={"missing": KeyError("missing")})
+    service_builder.return_value = service
+    triggers_svc = service.projects.return_value.triggers.return_value
+    triggers_svc.get.side_effect = lambda **kw: kw["triggerId"]
+
+    response = get_triggers(
+        ["build", "missing"],
+        configuration=fixtures.configuration,
+        secrets=fixtures.secrets,
+    )
+
+    assert response["triggers"] == ["build"]
+    assert response["errors"][0]["name"] == "missing"
+
+
+@patch("chaosgcp.build", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_update_dns_records(Credentials, service_builder):
+    project_id = fixtures.configuration["gcp_project_id"]
+    Credentials.from_service_account_file.return_value = MagicMock()
+
+    service, _ = batched_service()
+    service_builder.return_value = service
+    service.resourceRecordSets.return_value.patch.side_effect = lambda **kw: kw[
+        "body"
+    ]
+
+    results = update_dns_records(
+        project_id=project_id,
+        zone_name="zone",
+        records=[
+            {"name": "a.example.com.", "ip_address": "10.0.0.1"},
+            {"name": "b.example.com.", "ip_address": "10.0.0.2", "ttl": 60},
+        ],
+        secrets=fixtures.secrets,
+    )
+
+    assert all(r["ok"] for r in results)
+    assert results[0]["response"]["rrdatas"] == ["10.0.0.1"]
+    assert results[0]["response"]["ttl"] == 5
+    assert results[1]["response"]["ttl"] == 60
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+import fixtures
+from google.cloud import compute_v1
+
+from chaosgcp import cache
+from chaosgcp.cache import ALL, CacheKey, ReadCache
+from chaosgcp.lb.actions import inject_traffic_delay
+from chaosgcp.neg.actions import detach_network_endpoint_group
+from chaosgcp.neg.probes import get_network_endpoint_group
+
+
+def test_reads_are_served_from_cache_until_they_expire():
+    c = ReadCache(ttl=30)
+    loader = MagicMock(return_value={"name": "my-map"})
+    key = CacheKey("compute.urlMaps", "my-map", "my-project", "global")
+
+    with patch("chaosgcp.cache.time.monotonic", return_value=100.0):
+        assert c.get(key, loader) == {"name": "my-map"}
+        assert c.get(key, loader) == {"name": "my-map"}
+    assert loader.call_count == 1
+
+    with patch("chaosgcp.cache.time.monotonic", return_value=131.0):
+        c.get(key, loader)
+    assert loader.call_count == 2
+    assert c.stats()["hits"] == 1
+
+
+def test_zero_ttl_disables_caching():
+    loader = MagicMock(return_value=[])
+    key = CacheKey("compute.urlMaps", ALL, "my-project", "global")
+
+    for _ in range(3):
+        cache.cached(key, loader, configuration={"gcp_cache_ttl": 0})
+
+    assert loader.call_count == 3
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_read_is_evicted():
+    c = ReadCache(max_size=2)
+    keys = [CacheKey("compute.urlMaps", f"map-{i}") for i in range(3)]
+
+    c.get(keys[0], lambda: 0)
+    c.get(keys[1], lambda: 1)
+    c.get(keys[0], lambda: 0)
+    c.get(keys[2], lambda: 2)
+
+    loader = MagicMock(return_value=1)
+    c.get(keys[1], loader)
+    loader.assert_called_once()
+    assert c.stats()["evictions"] == 2
+
+
+def test_cached_values_are_copies():
+    c = ReadCache()
+    key = CacheKey("compute.urlMaps", "my-map")
+    urlmap = compute_v1.UrlMap(name="my-map")
+
+    c.get(key, lambda: urlmap).description = "changed"
+    urlmap.description = "changed too"
+
+    assert c.get(key, lambda: None).description == ""
+
+
+def test_invalidation_drops_resource_and_its_lists():
+    c = ReadCache()
+    resource = CacheKey("compute.urlMaps", "my-map", "my-project", "global")
+    listing = CacheKey("compute.urlMaps", ALL, "my-project", "global")
+    aggregated = CacheKey("compute.urlMaps", ALL, "my-project", ALL)
+    other = CacheKey("compute.urlMaps", "my-map", "my-project", "us-west1")
+    for key in (resource, listing, aggregated, other):
+        c.get(key, lambda: key)
+
+    assert c.invalidate("compute.urlMaps", "my-map", "my-project", "global")
+    assert c.stats()["size"] == 1
+
+    loader = MagicMock()
+    c.get(other, loader)
+    loader.assert_not_called()
+
+
+@patch("chaosgcp.lb.actions.wait_on_extended_operation", autospec=True)
+@patch("chaosgcp.lb.actions.get_fault_injection_policy", autospec=True)
+@patch("chaosgcp.lb.compute_v1.UrlMapsClient")
+@patch("chaosgcp.Credentials", autospec=True)
+def test_url_map_is_read_again_after_update(
+    Credentials, UrlMapsClient, get_fip, wait
+):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+    client = UrlMapsClient.return_value
+    client.get.return_value = compute_v1.UrlMap(name="my-map")
+    get_fip.return_value = compute_v1.HttpFaultInjection()
+
+    for _ in range(2):
+        inject_traffic_delay(
+            "my-map",
+            "allpaths",
+            configuration=fixtures.configuration,
+            secrets=fixtures.secrets,
+        )
+
+    assert client.get.call_count == 2
+    assert cache.stats()["invalidations"] == 2
+
+
+@patch("chaosgcp.neg.actions.wait_on_extended_operation", autospec=True)
+@patch("chaosgcp.neg.probes.to_dict", autospec=True)
+@patch("chaosgcp.neg.probes.compute_v1.NetworkEndpointGroupsClient")
+@patch("chaosgcp.Credentials", autospec=True)
+def test_network_endpoint_group_is_invalidated_on_detach(
+    Credentials, NEGClient, to_dict, wait
+):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+    client = NEGClient.return_value
+    client.get.return_value = compute_v1.NetworkEndpointGroup(name="my-neg")
+
+    def get():
+        get_network_endpoint_group(
+            "my-neg",
+            "us-west1-a",
+            configuration=fixtures.configuration,
+            secrets=fixtures.secrets,
+        )
+
+    get()
+    get()
+    assert client.get.call_count == 1
+
+    detach_network_endpoint_group(
+        "my-neg",
+        "us-west1-a",
+        configuration=fixtures.configuration,
+        secrets=fixtures.secrets,
+    )
+    get()
+    assert client.get.call_count == 2
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+import fixtures
+
+from chaosgcp import clients
+from chaosgcp.clients import ClientRegistry
+from chaosgcp.controls import clients as clients_ctrl
+from chaosgcp.neg.probes import get_network_endpoint_group
+
+
+class FakeClient:
+    def __init__(self, credentials=None, **kwargs) -> None:
+        self.credentials = credentials
+        self.kwargs = kwargs
+        self.transport = MagicMock()
+
+
+class OtherFakeClient(FakeClient):
+    pass
+
+
+def test_registry_reuses_clients_per_credentials():
+    registry = ClientRegistry()
+    creds = MagicMock()
+
+    c1 = registry.get(FakeClient, creds)
+    c2 = registry.get(FakeClient, creds)
+    c3 = registry.get(FakeClient, MagicMock())
+    c4 = registry.get(OtherFakeClient, creds)
+
+    assert c1 is c2
+    assert c1 is not c3
+    assert c1 is not c4
+    assert c1.credentials is creds
+    assert registry.stats() == {
+        "hits": 1,
+        "misses": 3,
+        "evictions": 0,
+        "size": 3,
+    }
+
+
+def test_registry_keys_on_constructor_arguments():
+    registry = ClientRegistry()
+
+    c1 = registry.get(FakeClient, None, transport="rest")
+    c2 = registry.get(FakeClient, None, transport="grpc")
+
+    assert c1 is not c2
+    assert c1.kwargs == {"transport": "rest"}
+
+
+def test_registry_evicts_least_recently_used():
+    registry = ClientRegistry(max_size=2)
+    a, b, c = MagicMock(), MagicMock(), MagicMock()
+
+    ca = registry.get(FakeClient, a)
+    registry.get(FakeClient, b)
+    assert registry.get(FakeClient, a) is ca
+    registry.get(FakeClient, c)
+
+    assert registry.stats()["evictions"] == 1
+    assert registry.get(FakeClient, a) is ca
+    assert registry.stats()["size"] == 2
+
+
+def test_shutdown_closes_transports():
+    registry = ClientRegistry()
+    c = registry.get(FakeClient, MagicMock())
+
+    registry.shutdown()
+
+    c.transport.close.assert_called_once_with()
+    assert registry.stats()["size"] == 0
+
+
+def test_after_experiment_control_shuts_registry_down():
+    c = clients.get(FakeClient, MagicMock())
+
+    clients_ctrl.after_experiment_control(context={}, state={})
+
+    c.transport.close.assert_called_once_with()
+    assert clients.stats()["size"] == 0
+
+
+@patch("chaosgcp.neg.probes.to_dict", autospec=True)
+@patch("chaosgcp.neg.probes.compute_v1.NetworkEndpointGroupsClient")
+@patch("chaosgcp.Credentials", autospec=True)
+def test_activities_share_their_client(Credentials, NEGClient, to_dict):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+
+    for _ in range(3):
+        get_network_endpoint_group(
+            "my-neg",
+            "us-west1-a",
+            configuration=fixtures.configuration,
+            secrets=fixtures.secrets,
+        )
+
+    NEGClient.assert_called_once()
@@ -97,3 +97,35 @@ def test_resume_vm_instance(Credentials, client, resumevm_req):
     resumevm_req.return_value = compute_v1.ResumeInstanceRequest(
         instance=instance_name, project=project_id, zone=zone_name
     )
+
+
+@patch("chaosgcp.compute.actions.compute_v1.InstancesClient", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_suspend_vm_instances_waits_on_all_operations(Credentials, client):
+    from chaosgcp.compute.actions import suspend_vm_instances
+
+    project_id = fixtures.configuration["gcp_project_id"]
+    zone_name = fixtures.configuration["gcp_zone"]
+
+    failed = MagicMock()
+    failed.done.return_value = True
+    failed.result.side_effect = RuntimeError("quota exceeded")
+    client.return_value.suspend.side_effect = [
+        MagicMock(),
+        RuntimeError("instance not found"),
+        failed,
+    ]
+
+    results = suspend_vm_instances(
+        project_id,
+        zone_name,
+        ["vm-1", "vm-2", "vm-3"],
+        secrets=fixtures.secrets,
+    )
+
+    assert client.return_value.suspend.call_count == 3
+    assert results == [
+        {"name": "vm-1", "ok": True, "error": None},
+        {"name": "vm-2", "ok": False, "error": "instance not found"},
+        {"name": "vm-3", "ok": False, "error": "quota exceeded"},
+    ]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from chaosgcp.controls import profiler as profiler_ctrl
+from chaosgcp.instrumentation import NETWORK, span
+from chaosgcp.operations import Waiter
+
+
+def test_profiler_records_activities_into_journal():
+    experiment = {"title": "exp"}
+    probe = {
+        "name": "describe-db",
+        "type": "probe",
+        "provider": {
+            "type": "python",
+            "module": "chaosgcp.sql.probes",
+            "func": "describe_instance",
+        },
+    }
+    action = {"name": "noop", "type": "action", "provider": {}}
+
+    profiler_ctrl.before_experiment_control(experiment)
+
+    profiler_ctrl.before_activity_control(probe)
+    with span("api.call", NETWORK, method="sqladmin.instances.get") as s:
+        s.retries = 1
+    Waiter(initial_delay=0).wait(lambda remaining: (True, None))
+    profiler_ctrl.after_activity_control(probe, {"status": "succeeded"})
+
+    profiler_ctrl.before_activity_control(action)
+    profiler_ctrl.after_activity_control(action, {"status": "succeeded"})
+
+    journal = {}
+    profiler_ctrl.after_experiment_control(experiment, journal)
+
+    (extension,) = journal["extensions"]
+    assert extension["name"] == "chaosgcp-profiler"
+
+    first, second = extension["activities"]
+    assert first["name"] == "describe-db"
+    assert first["target"] == "chaosgcp.sql.probes.describe_instance"
+    assert first["api_calls"] == 1
+    assert first["api_retries"] == 1
+    assert first["polls"] == 1
+    assert first["wall_time"] >= 0
+    assert first["cpu_time"] >= 0
+    assert set(first["durations"]) == {"network", "operation"}
+    assert second["api_calls"] == 0
+
+    assert extension["summary"]["activities"] == 2
+    assert extension["summary"]["api_calls"] == 1
+
+
+def test_profiler_stops_recording_after_experiment():
+    profiler_ctrl.before_experiment_control({})
+    profiler_ctrl.after_experiment_control({}, {})
+
+    activity = {"name": "late", "type": "probe"}
+    with span("api.call", NETWORK):
+        pass
+
+    assert profiler_ctrl.profiler._running == {}
+    profiler_ctrl.after_activity_control(activity, {})
+    assert profiler_ctrl.profiler.stop() == []
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import threading
+from unittest.mock import MagicMock, patch
+
+from chaosgcp.controls import warmup as warmup_ctrl
+
+EXPERIMENT = {
+    "steady-state-hypothesis": {
+        "probes": [
+            {
+                "type": "probe",
+                "provider": {
+                    "type": "python",
+                    "module": "chaosgcp.monitoring.probes",
+                    "func": "valid_slo_ratio_during_window",
+                },
+            }
+        ]
+    },
+    "method": [
+        {
+            "type": "action",
+            "provider": {
+                "type": "python",
+                "module": "chaosgcp.sql.actions",
+                "func": "trigger_failover",
+            },
+        },
+        {
+            "type": "action",
+            "provider": {"type": "process", "path": "echo"},
+        },
+    ],
+}
+
+
+def test_services_are_inferred_from_experiment():
+    modules = warmup_ctrl.experiment_modules(EXPERIMENT)
+
+    assert modules == {"chaosgcp.monitoring.probes", "chaosgcp.sql.actions"}
+    assert warmup_ctrl.services_for_modules(modules) == {
+        "sqladmin",
+        "monitoring.metrics",
+        "monitoring.query",
+        "monitoring.slo",
+        "compute.urlmaps",
+        "compute.regionurlmaps",
+    }
+
+
+@patch("chaosgcp.controls.warmup.load_credentials", autospec=True)
+@patch("chaosgcp.controls.warmup.clients", autospec=True)
+@patch("chaosgcp.controls.warmup.client", autospec=True)
+def test_warmup_prepares_services(client, clients, load_credentials):
+    credentials = MagicMock(valid=True)
+    load_credentials.return_value = credentials
+    clients.get.return_value = MagicMock(transport=None)
+    threads = []
+    client.side_effect = lambda *args, **kwargs: threads.append(
+        threading.current_thread()
+    )
+
+    outcomes = warmup_ctrl.warmup(
+        ["sqladmin", "monitoring.slo", "nope"],
+        modules=["chaosgcp.sql.actions"],
+    )
+
+    assert outcomes == {
+        "credentials": None,
+        "import:chaosgcp.sql.actions": None,
+        "sqladmin": None,
+        "monitoring.slo": None,
+    }
+    # the resource is eventually built by the calling thread
+    assert threads[-1] is threading.current_thread()
+    clients.get.assert_called_once()
+    assert clients.get.call_args.args[1] is credentials
+
+
+@patch("chaosgcp.controls.warmup.load_credentials", autospec=True)
+@patch("chaosgcp.controls.warmup.client", autospec=True)
+def test_warmup_never_fails_the_experiment(client, load_credentials):
+    load_credentials.return_value = None
+    client.side_effect = RuntimeError("no network")
+
+    warmup_ctrl.before_experiment_control(EXPERIMENT, services=["dns"])
+
+    outcomes = warmup_ctrl.warmup(["dns"])
+    assert outcomes["dns"] == "no network"
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+from unittest.mock import ANY, MagicMock, patch
+
+import fixtures
+
+from chaosgcp import client
+from chaosgcp.discovery_cache import (
+    DiscoveryDocumentCache,
+    ResourceCache,
+    discovery_cache,
+    get_static_discovery,
+)
+from chaosgcp.ratelimit import request_class
+
+URL = "https://sqladmin.googleapis.com/$discovery/rest?version=v1"
+
+
+def test_documents_are_kept_in_memory():
+    cache = DiscoveryDocumentCache()
+    assert cache.get(URL) is None
+
+    cache.set(URL, "{}")
+
+    assert cache.get(URL) == "{}"
+    assert cache.path_for(URL) is None
+
+
+def test_documents_are_stored_on_disk_with_versioned_keys(tmp_path):
+    cache = DiscoveryDocumentCache(str(tmp_path))
+    cache.set(URL, '{"name": "sqladmin"}')
+
+    path = cache.path_for(URL)
+    assert os.path.isfile(path)
+    assert path.endswith(".json")
+
+    # a new process starts with an empty memory cache
+    other = DiscoveryDocumentCache(str(tmp_path))
+    assert other.get(URL) == '{"name": "sqladmin"}'
+
+
+def test_stale_documents_on_disk_are_ignored(tmp_path):
+    cache = DiscoveryDocumentCache(str(tmp_path), max_age=60)
+    cache.set(URL, "{}")
+    old = time.time() - 120
+    os.utime(cache.path_for(URL), (old, old))
+
+    assert DiscoveryDocumentCache(str(tmp_path), max_age=60).get(URL) is None
+
+
+def test_resources_are_built_once_per_thread():
+    cache = ResourceCache()
+    builder = MagicMock(side_effect=lambda: object())
+
+    r1 = cache.get("k", builder)
+    assert cache.get("k", builder) is r1
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(cache.get("k", builder)))
+    t.start()
+    t.join()
+
+    assert other[0] is not r1
+    assert builder.call_count == 2
+
+    cache.clear()
+    assert cache.get("k", builder) is not r1
+
+
+def test_static_discovery_from_configuration():
+    assert get_static_discovery(None) is None
+    assert get_static_discovery({"gcp_static_discovery": "false"}) is False
+    assert get_static_discovery({"gcp_static_discovery": True}) is True
+
+
+@patch("chaosgcp.build", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_client_builds_resource_once(Credentials, build):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+    configuration = {"gcp_static_discovery": False}
+
+    s1 = client(
+        "sqladmin", secrets=fixtures.secrets, configuration=configuration
+    )
+    s2 = client(
+        "sqladmin", secrets=fixtures.secrets, configuration=configuration
+    )
+
+    assert s1 is s2
+    build.assert_called_once_with(
+        "sqladmin",
+        version="v1",
+        credentials=ANY,
+        cache=discovery_cache,
+        static_discovery=False,
+        requestBuilder=request_class(),
+    )
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+from chaoslib.exceptions import ActivityFailed
+
+from chaosgcp import fanout
+from chaosgcp.fanout import FAIL_FAST
+
+
+def test_run_calls_targets_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def activity(name, zone=None, configuration=None, secrets=None):
+        # all three targets must be called at the same time
+        barrier.wait()
+        return f"{zone}/{name}"
+
+    summary = fanout.run(
+        activity, ["a", "b", "c"], concurrency=3, zone="us-central1-a"
+    )
+
+    assert summary["ok"] is True
+    assert summary["succeeded"] == 3
+    assert [r["result"] for r in summary["results"]] == [
+        "us-central1-a/a",
+        "us-central1-a/b",
+        "us-central1-a/c",
+    ]
+
+
+def test_run_collects_all_failures():
+    def activity(name, configuration=None, secrets=None):
+        if name == "b":
+            raise ActivityFailed("boom")
+        return name
+
+    summary = fanout.run(activity, ["a", "b", "c"], concurrency=1)
+
+    assert summary["ok"] is False
+    assert (summary["succeeded"], summary["failed"]) == (2, 1)
+    assert summary["results"][1]["error"] == "boom"
+
+
+def test_run_skips_remaining_targets_when_failing_fast():
+    called = []
+
+    def activity(name, configuration=None, secrets=None):
+        called.append(name)
+        raise ActivityFailed("boom")
+
+    summary = fanout.run(
+        activity, ["a", "b", "c"], concurrency=1, policy=FAIL_FAST
+    )
+
+    assert called == ["a"]
+    assert (summary["failed"], summary["skipped"]) == (1, 2)
+    assert [r["skipped"] for r in summary["results"]] == [False, True, True]
+
+
+def test_run_reports_targets_running_past_their_timeout():
+    release = threading.Event()
+
+    def activity(name, configuration=None, secrets=None):
+        if name == "slow":
+            release.wait(5)
+        return name
+
+    try:
+        summary = fanout.run(activity, ["slow", "fast"], timeout=0.1)
+    finally:
+        release.set()
+
+    assert [r["ok"] for r in summary["results"]] == [False, True]
+    assert "did not complete" in summary["results"][0]["error"]
+
+
+def test_run_resolves_activity_and_selector(monkeypatch):
+    calls = []
+
+    def resize_nodepool(**kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(
+        "chaosgcp.gke.nodepool.actions.resize_nodepool", resize_nodepool
+    )
+
+    def selector(configuration=None, secrets=None):
+        return [{"node_pool_id": "pool-1", "pool_size": 0}]
+
+    summary = fanout.run(
+        "chaosgcp.gke.nodepool.actions.resize_nodepool",
+        selector,
+        configuration={"gcp_project_id": "my-project"},
+    )
+
+    assert summary["ok"] is True
+    assert calls == [
+        {
+            "node_pool_id": "pool-1",
+            "pool_size": 0,
+            "configuration": {"gcp_project_id": "my-project"},
+            "secrets": None,
+        }
+    ]
+
+
+def test_run_rejects_unknown_activity_and_policy():
+    with pytest.raises(ActivityFailed):
+        fanout.run("chaosgcp.nope.actions.do_it", ["a"])
+
+    with pytest.raises(ActivityFailed):
+        fanout.run(lambda **kw: None, ["a"], policy="sometimes")
+
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import subprocess
+import sys
 from unittest.mock import MagicMock
 
 import fixtures
@@ -41,3 +43,24 @@ def test_wait_on_operation_kwargs():
         operation="operation-xyz",
     )
     assert response["status"] == "DONE"
+
+
+def test_importing_package_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, chaosgcp; "
+        "print(','.join(m for m in ('dateparser', 'googleapiclient.discovery', "
+        "'google.api_core.extended_operation', 'google.oauth2.service_account')"
+        " if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == ""
+
+
+def test_lazy_attributes_are_resolved_on_access():
+    from googleapiclient.discovery import build
+
+    import chaosgcp
+
+    assert chaosgcp.build is build
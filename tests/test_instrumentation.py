@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+from chaosgcp.instrumentation import (
+    NETWORK,
+    SpanCollector,
+    add_exporter,
+    instrumented_request_class,
+    remove_exporter,
+    span,
+)
+from chaosgcp.operations import Waiter
+from chaosgcp.serializer import to_dicts
+
+
+@pytest.fixture
+def collector():
+    c = SpanCollector()
+    add_exporter(c)
+    yield c
+    remove_exporter(c)
+
+
+def test_spans_are_not_recorded_without_exporters():
+    with span("noop", NETWORK) as s:
+        s.bytes_in = 10
+
+    # never finished, nor exported
+    assert s.duration is None
+
+
+def test_spans_are_exported_with_their_errors(collector):
+    with span("ok", NETWORK, method="dns.managedZones.get"):
+        pass
+    with pytest.raises(ValueError):
+        with span("ko", NETWORK):
+            raise ValueError("boom")
+
+    ok, ko = collector.spans
+    assert ok.method == "dns.managedZones.get"
+    assert ok.end >= ok.start
+    assert ok.error is None
+    assert ko.error == "ValueError: boom"
+    assert collector.summary()[NETWORK]["count"] == 2
+    assert collector.summary()[NETWORK]["errors"] == 1
+
+
+def test_discovery_calls_record_bytes_and_retries(collector):
+    payload = json.dumps({"name": "zone"}).encode("utf-8")
+    http = HttpMockSequence(
+        [
+            ({"status": "503"}, b""),
+            ({"status": "200"}, payload),
+        ]
+    )
+    service = build(
+        "dns",
+        "v1",
+        http=http,
+        static_discovery=True,
+        requestBuilder=instrumented_request_class(),
+    )
+
+    request = service.managedZones().get(project="p", managedZone="zone")
+    request._sleep = lambda seconds: None
+    assert request.execute(num_retries=1) == {"name": "zone"}
+
+    (s,) = collector.spans
+    assert s.name == "api.call"
+    assert s.method == "dns.managedZones.get"
+    assert s.retries == 1
+    assert s.bytes_in == len(payload)
+
+
+def test_operation_and_serialization_spans(collector):
+    Waiter(initial_delay=0).wait(lambda remaining: (True, None), name="op")
+    to_dicts([])
+
+    wait, serialize = collector.spans
+    assert wait.method == "op"
+    assert wait.attributes["polls"] == 1
+    assert serialize.attributes["count"] == 0
+
+
+def test_collector_attaches_to_journal(collector):
+    with span("ok", NETWORK):
+        pass
+
+    journal = {}
+    collector.attach(journal)
+
+    extension = journal["extensions"][0]
+    assert extension["name"] == "chaosgcp-instrumentation"
+    assert extension["spans"][0]["name"] == "ok"
+    assert extension["summary"][NETWORK]["count"] == 1
+
+
+def test_opentelemetry_exporter():
+    sdk = pytest.importorskip("opentelemetry.sdk.trace")
+    export = pytest.importorskip("opentelemetry.sdk.trace.export")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from chaosgcp.instrumentation import OpenTelemetryExporter
+
+    memory = InMemorySpanExporter()
+    provider = sdk.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(memory))
+    exporter = OpenTelemetryExporter(tracer_provider=provider)
+
+    add_exporter(exporter)
+    try:
+        with span("api.call", NETWORK, method="sqladmin.instances.get"):
+            pass
+    finally:
+        remove_exporter(exporter)
+
+    (otel_span,) = memory.get_finished_spans()
+    assert otel_span.name == "api.call"
+    assert otel_span.attributes["chaosgcp.method"] == "sqladmin.instances.get"
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import dateparser
+import pytest
+from chaoslib.exceptions import ActivityFailed
+
+from chaosgcp import parse_interval
+from chaosgcp.interval import parse_datetime, parse_duration
+
+BASE = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "now",
+        "5 minutes",
+        "5 Minutes",
+        "  5 minutes  ",
+        "5minutes",
+        "5m",
+        "5min",
+        "10 mins",
+        "1h",
+        "1H",
+        "1hr",
+        "2 hrs",
+        "1.5h",
+        "2 hours",
+        "300s",
+        "30 sec",
+        "90 seconds",
+        "0s",
+        "1 day",
+        "3d",
+        "1 week",
+        "2w",
+        "1 hour ago",
+        "2024-05-01",
+        "2024-05-01T10:00",
+        "2024-05-01T10:00:00",
+        "2024-05-01 10:00:00",
+        "2024-05-01T10:00:00Z",
+        "2024-05-01T10:00:00.123456Z",
+        "2024-05-01T10:00:00+02:00",
+        "2024-05-01T10:00:00+0530",
+    ],
+)
+def test_fast_path_matches_dateparser(value):
+    expected = dateparser.parse(
+        value,
+        settings={
+            "TIMEZONE": "UTC",
+            "RELATIVE_BASE": BASE,
+            "RETURN_AS_TIMEZONE_AWARE": True,
+        },
+    )
+
+    with patch("chaosgcp.interval.parse_with_dateparser") as fallback:
+        assert parse_datetime(value, relative_base=BASE) == expected
+    fallback.assert_not_called()
+
+
+@pytest.mark.parametrize("value", ["in 5 minutes", "1 month", "yesterday"])
+def test_exotic_values_fall_back_to_dateparser(value):
+    expected = dateparser.parse(
+        value,
+        settings={
+            "TIMEZONE": "UTC",
+            "RELATIVE_BASE": BASE,
+            "RETURN_AS_TIMEZONE_AWARE": True,
+        },
+    )
+
+    assert parse_duration(value) is None
+    assert parse_datetime(value, relative_base=BASE) == expected
+
+
+def test_negative_offsets_are_parsed():
+    # dateparser cannot parse those
+    assert parse_datetime("2024-05-01T06:30:00-05:30") == BASE
+
+
+def test_parse_interval_counts_window_back_from_end_time():
+    start, end = parse_interval("2024-05-01T12:00:00Z", "5 minutes")
+
+    assert end == BASE
+    assert end - start == timedelta(minutes=5)
+    assert start.tzinfo is not None
+
+
+def test_parse_interval_rejects_unparsable_values():
+    with pytest.raises(ActivityFailed):
+        parse_interval("not a date at all", "5 minutes")
+
+    with pytest.raises(ActivityFailed):
+        parse_interval("now", "1 ms")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest.mock import patch
+
+from chaosgcp import discover
+from chaosgcp.manifest import (
+    discover_activities,
+    load_manifest,
+    main,
+    write_manifest,
+)
+
+
+def test_shipped_manifest_matches_live_discovery():
+    activities = load_manifest()
+
+    assert activities is not None, (
+        "the activity manifest is stale, run `pdm run manifest`"
+    )
+    assert activities == json.loads(json.dumps(discover_activities()))
+
+
+def test_discover_serves_manifest_without_introspection():
+    with patch("chaosgcp.manifest.discover_activities") as live:
+        discovery = discover()
+
+    live.assert_not_called()
+    assert len(discovery["activities"]) == len(load_manifest())
+
+
+def test_stale_manifest_falls_back_to_live_discovery(tmp_path):
+    path = str(tmp_path / "activities.json")
+    write_manifest(path)
+    assert load_manifest(path) is not None
+
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest["fingerprint"] = "outdated"
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+
+    assert load_manifest(path) is None
+    assert main(["--check", "--path", path]) == 1
+
+    with patch("chaosgcp.manifest.MANIFEST_PATH", path):
+        with patch(
+            "chaosgcp.manifest.discover_activities", return_value=[]
+        ) as live:
+            assert discover()["activities"] == []
+    live.assert_called_once()
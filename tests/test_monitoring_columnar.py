@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+import pytest
+from chaoslib.exceptions import ActivityFailed
+from google.api import distribution_pb2
+from google.cloud import monitoring_v3
+
+from chaosgcp.monitoring.columnar import decode_time_series, summarize
+from chaosgcp.monitoring.probes import get_metrics
+
+np = pytest.importorskip("numpy")
+
+
+def make_series(values, instance="vm-1"):
+    # points are returned most recent first
+    points = []
+    for i, v in enumerate(values):
+        if isinstance(v, monitoring_v3.TypedValue):
+            value = v
+        else:
+            value = monitoring_v3.TypedValue(double_value=v)
+        points.append(
+            monitoring_v3.Point(
+                interval=monitoring_v3.TimeInterval(
+                    end_time={"seconds": 1000 - i * 60}
+                ),
+                value=value,
+            )
+        )
+
+    return monitoring_v3.TimeSeries(
+        metric={"type": "custom/latency", "labels": {"instance": instance}},
+        resource={"type": "gce_instance", "labels": {"zone": "us-east1-b"}},
+        points=points,
+    )
+
+
+def test_decode_time_series_into_chronological_arrays():
+    series = make_series(
+        [
+            monitoring_v3.TypedValue(int64_value=3),
+            monitoring_v3.TypedValue(string_value="n/a"),
+            monitoring_v3.TypedValue(bool_value=True),
+            monitoring_v3.TypedValue(
+                distribution_value=distribution_pb2.Distribution(mean=2.5)
+            ),
+        ]
+    )
+
+    columns = decode_time_series([series])
+
+    assert columns.labels[0]["metric"]["labels"] == {"instance": "vm-1"}
+    assert columns.labels[0]["resource"]["type"] == "gce_instance"
+    assert columns.timestamps[0].tolist() == [820.0, 880.0, 1000.0]
+    assert columns.values[0].tolist() == [2.5, 1.0, 3.0]
+
+
+def test_summarize_reduces_all_series_at_once():
+    columns = decode_time_series(
+        [make_series([4.0, 1.0, 3.0, 2.0]), make_series([], "vm-2")]
+    )
+
+    first, empty = summarize(
+        columns, ["count", "min", "max", "mean", "last", "p50"]
+    )
+
+    assert first["metric"]["labels"] == {"instance": "vm-1"}
+    assert (first["count"], first["min"], first["max"]) == (4, 1.0, 4.0)
+    assert (first["mean"], first["last"], first["p50"]) == (2.5, 4.0, 2.5)
+    assert empty["count"] == 0
+    assert empty["mean"] is None and empty["p50"] is None
+
+
+def test_summarize_rejects_unknown_reductions():
+    with pytest.raises(ActivityFailed):
+        summarize(decode_time_series([make_series([1.0])]), ["median"])
+
+
+@patch("chaosgcp.monitoring.probes.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+@patch("chaosgcp.monitoring.probes.Query", autospec=True)
+def test_get_metrics_returns_summaries(Query, load_credentials, clients):
+    load_credentials.return_value = MagicMock(project_id="my-project")
+    Query.return_value.align.return_value = [
+        make_series([0.2, 0.4]),
+        make_series([0.8], "vm-2"),
+    ]
+
+    summaries = get_metrics(
+        "custom/latency", output="summary", reductions="count,max"
+    )
+
+    assert [(s["count"], s["max"]) for s in summaries] == [(2, 0.4), (1, 0.8)]
+    assert "points" not in summaries[0]
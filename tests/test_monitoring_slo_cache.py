@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+from google.cloud import monitoring_v3
+
+from chaosgcp.monitoring import invalidate_slo
+from chaosgcp.monitoring.probes import get_slo_budget, get_slo_health
+
+SLO = "projects/my-project/services/my-svc/serviceLevelObjectives/my-slo"
+CONFIGURATION = {"gcp_project_id": "my-project"}
+
+
+@patch("chaosgcp.monitoring.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_slo_definition_is_read_once(load_credentials, clients, slo_clients):
+    load_credentials.return_value = MagicMock()
+    client = slo_clients.get.return_value
+    client.get_service_level_objective.return_value = (
+        monitoring_v3.ServiceLevelObjective(name=SLO)
+    )
+    clients.get.return_value.list_time_series.return_value = []
+
+    get_slo_health(SLO, configuration=CONFIGURATION)
+    get_slo_budget(SLO, configuration=CONFIGURATION)
+    assert client.get_service_level_objective.call_count == 1
+
+    invalidate_slo(SLO)
+    get_slo_health(SLO, configuration=CONFIGURATION)
+    assert client.get_service_level_objective.call_count == 2
+
+    request = clients.get.return_value.list_time_series.call_args[1]
+    assert request["request"].filter == f'select_slo_health("{SLO}")'
+
+
+@patch("chaosgcp.monitoring.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_slo_lookup_is_skipped_for_full_names(
+    load_credentials, clients, slo_clients
+):
+    load_credentials.return_value = MagicMock()
+    clients.get.return_value.list_time_series.return_value = []
+
+    get_slo_health(SLO, skip_lookup=True, configuration=CONFIGURATION)
+    get_slo_budget(
+        SLO, configuration=dict(CONFIGURATION, gcp_slo_skip_lookup=True)
+    )
+
+    slo_clients.get.assert_not_called()
+    request = clients.get.return_value.list_time_series.call_args[1]
+    assert request["request"].filter == f'select_slo_budget("{SLO}")'
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock, patch
+
+from google.cloud import monitoring_v3
+
+from chaosgcp.monitoring import invalidate_slo
+from chaosgcp.monitoring.probes import (
+    get_slo_from_url,
+    get_slo_health_from_url,
+)
+
+PROJECT = "my-project"
+SERVICES = f"projects/{PROJECT}/services"
+CONFIGURATION = {"gcp_project_id": PROJECT}
+
+
+def make_slo(service, name, backend_services):
+    selector = ",".join(f'"{bs}"' for bs in backend_services)
+    return monitoring_v3.ServiceLevelObjective(
+        name=f"{SERVICES}/{service}/serviceLevelObjectives/{name}",
+        service_level_indicator={
+            "request_based": {
+                "good_total_ratio": {
+                    "total_service_filter": (
+                        'resource.type="https_lb_rule" AND '
+                        f"resource.label.backend_service_name=one_of("
+                        f"{selector})"
+                    )
+                }
+            }
+        },
+    )
+
+
+def setup_client(clients):
+    client = clients.get.return_value
+    client.list_services.return_value = [
+        monitoring_v3.Service(
+            name=f"{SERVICES}/{name}", gke_service={"service_name": name}
+        )
+        for name in ("svc-a", "svc-b")
+    ] + [monitoring_v3.Service(name=f"{SERVICES}/custom", custom={})]
+    slos = {
+        f"{SERVICES}/svc-a": [
+            make_slo("svc-a", "latency", ["my-bs", "other-bs"]),
+            make_slo("svc-a", "errors", ["my-bs-2"]),
+        ],
+        f"{SERVICES}/svc-b": [make_slo("svc-b", "availability", ["other-bs"])],
+    }
+    client.list_service_level_objectives.side_effect = lambda request: slos[
+        request.parent
+    ]
+    return client
+
+
+@patch("chaosgcp.monitoring.probes.get_backend_services_from_url")
+@patch("chaosgcp.monitoring.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_slos_are_matched_on_their_sli_filters(
+    load_credentials, clients, get_backend_services_from_url
+):
+    load_credentials.return_value = MagicMock()
+    client = setup_client(clients)
+    get_backend_services_from_url.return_value = ["my-bs", "other-bs"]
+
+    slos = get_slo_from_url("https://example.com/", configuration=CONFIGURATION)
+
+    # my-bs-2 is not my-bs, and latency selects both backend services
+    assert [s["name"].rsplit("/", 1)[-1] for s in slos] == [
+        "latency",
+        "availability",
+    ]
+    # the custom service has no SLOs listed
+    assert client.list_service_level_objectives.call_count == 2
+
+
+@patch("chaosgcp.monitoring.probes.get_backend_services_from_url")
+@patch("chaosgcp.monitoring.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_slo_index_is_cached_until_invalidated(
+    load_credentials, clients, get_backend_services_from_url
+):
+    load_credentials.return_value = MagicMock()
+    client = setup_client(clients)
+    get_backend_services_from_url.return_value = ["my-bs-2"]
+
+    for _ in range(3):
+        get_slo_from_url("https://example.com/", configuration=CONFIGURATION)
+    assert client.list_services.call_count == 1
+
+    invalidate_slo(f"{SERVICES}/svc-a/serviceLevelObjectives/errors")
+    slos = get_slo_from_url("https://example.com/", configuration=CONFIGURATION)
+    assert client.list_services.call_count == 2
+    assert [s["name"].rsplit("/", 1)[-1] for s in slos] == ["errors"]
+
+
+@patch("chaosgcp.monitoring.probes.get_backend_services_from_url")
+@patch("chaosgcp.monitoring.probes.clients", autospec=True)
+@patch("chaosgcp.monitoring.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_slo_healths_are_queried_concurrently_over_one_interval(
+    load_credentials, slo_clients, clients, get_backend_services_from_url
+):
+    load_credentials.return_value = MagicMock()
+    slo_client = setup_client(slo_clients)
+    get_backend_services_from_url.return_value = ["other-bs"]
+
+    def list_time_series(request):
+        slo = request.filter.split("/")[-1].rstrip('")')
+        return [monitoring_v3.TimeSeries(metric={"type": slo})]
+
+    metric_client = clients.get.return_value
+    metric_client.list_time_series.side_effect = list_time_series
+
+    healths = get_slo_health_from_url(
+        "https://example.com/", configuration=CONFIGURATION
+    )
+
+    assert [h[0]["metric"]["type"] for h in healths] == [
+        "latency",
+        "availability",
+    ]
+    load_credentials.assert_called_once()
+    slo_client.get_service_level_objective.assert_not_called()
+    requests = [
+        c[1]["request"] for c in metric_client.list_time_series.call_args_list
+    ]
+    assert (
+        len({(r.interval.start_time, r.interval.end_time) for r in requests})
+        == 1
+    )
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.cloud import monitoring_v3
+
+from chaosgcp.monitoring.probes import (
+    get_slo_ratio_during_window,
+    slo_ratio_verdict,
+    valid_slo_ratio_during_window,
+)
+
+SLO = "projects/my-project/services/my-svc/serviceLevelObjectives/my-slo"
+CONFIGURATION = {"gcp_project_id": "my-project", "gcp_slo_skip_lookup": True}
+
+
+def make_series(values, zone):
+    return monitoring_v3.TimeSeries(
+        resource={"type": "gce_instance", "labels": {"zone": zone}},
+        points=[
+            monitoring_v3.Point(value=monitoring_v3.TypedValue(double_value=v))
+            for v in values
+        ],
+    )
+
+
+@patch("chaosgcp.monitoring.probes.clients", autospec=True)
+@patch("chaosgcp.monitoring.probes.load_credentials", autospec=True)
+def test_every_group_must_reach_the_expected_ratio(load_credentials, clients):
+    load_credentials.return_value = MagicMock()
+    clients.get.return_value.list_time_series.return_value = [
+        make_series([0.99, 0.95, 0.97, 0.2], "us-east1-b"),
+        make_series([0.5, 0.4, 0.99, 0.3], "us-east1-c"),
+    ]
+
+    verdict = get_slo_ratio_during_window(
+        SLO,
+        expected_ratio=0.7,
+        min_level=0.9,
+        group_by_fields="resource.zone",
+        configuration=CONFIGURATION,
+    )
+
+    assert verdict["ok"] is False
+    assert (verdict["good"], verdict["total"], verdict["ratio"]) == (4, 8, 0.5)
+    first, second = verdict["series"]
+    assert first["resource"]["labels"] == {"zone": "us-east1-b"}
+    assert (first["good"], first["ratio"], first["ok"]) == (3, 0.75, True)
+    assert (second["good"], second["ratio"], second["ok"]) == (1, 0.25, False)
+    assert not valid_slo_ratio_during_window(
+        SLO, 0.7, 0.9, configuration=CONFIGURATION
+    )
+
+
+def test_expected_ratio_is_a_ratio_not_a_percentage():
+    series = [make_series([0.95, 0.5, 0.5, 0.5], "us-east1-b")]
+
+    assert not slo_ratio_verdict(series, 0.5, 0.9)["ok"]
+    assert slo_ratio_verdict(series, 0.25, 0.9)["ok"]
+
+
+def test_verdict_without_numpy_or_data():
+    series = [make_series([0.95, 0.91], "us-east1-b"), make_series([], "b")]
+
+    with patch.dict(sys.modules, {"numpy": None}):
+        verdict = slo_ratio_verdict(series, 0.9, 0.9)
+
+    assert [s["good"] for s in verdict["series"]] == [2, 0]
+    assert verdict["series"][1]["ratio"] is None
+    assert verdict["ok"] is False
+    assert slo_ratio_verdict([], 0.9, 0.9)["ok"] is False
+
+
+@pytest.mark.parametrize("min_level,good", [(True, 2), (False, 1)])
+def test_boolean_levels_are_compared_for_equality(min_level, good):
+    series = monitoring_v3.TimeSeries(
+        points=[
+            monitoring_v3.Point(value=monitoring_v3.TypedValue(bool_value=v))
+            for v in (True, False, True)
+        ]
+    )
+
+    assert slo_ratio_verdict([series], 0.5, min_level)["good"] == good
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+import functools
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from chaoslib.exceptions import ActivityFailed
+from google.api_core.extended_operation import ExtendedOperation
+from google.cloud import compute_v1, container_v1
+
+from chaosgcp import wait_on_extended_operation, wait_on_operation
+from chaosgcp.gke.nodepool import wait_on_operation as wait_on_gke_operation
+from chaosgcp.operations import (
+    OperationTimeout,
+    OperationTracker,
+    Waiter,
+    add_listener,
+    remove_listener,
+)
+
+
+class ComputeOperation(ExtendedOperation):
+    # mirrors what compute clients do with their operations
+    @property
+    def error_message(self):
+        return self._extended_operation.http_error_message
+
+    @property
+    def error_code(self):
+        return self._extended_operation.http_error_status_code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    c = FakeClock()
+    with patch("chaosgcp.operations.time") as t:
+        t.monotonic.side_effect = c.monotonic
+        t.sleep.side_effect = c.sleep
+        yield c
+
+
+def test_waiter_backs_off_exponentially_up_to_max(clock):
+    results = iter([False] * 6 + [True])
+    waiter = Waiter(initial_delay=1, max_delay=5, multiplier=2, jitter=0)
+
+    waiter.wait(lambda remaining: (next(results), None))
+
+    assert clock.sleeps == [1, 2, 4, 5, 5, 5]
+
+
+def test_waiter_jitter_stays_within_bounds(clock):
+    results = iter([False] * 20 + [True])
+    waiter = Waiter(initial_delay=10, max_delay=10, jitter=0.2)
+
+    waiter.wait(lambda remaining: (next(results), None))
+
+    assert all(8 <= s <= 12 for s in clock.sleeps)
+
+
+def test_waiter_raises_once_deadline_is_reached(clock):
+    waiter = Waiter(initial_delay=4, max_delay=4, jitter=0, deadline=10)
+    remainings = []
+
+    def poll(remaining):
+        remainings.append(remaining)
+        return False, None
+
+    with pytest.raises(OperationTimeout):
+        waiter.wait(poll)
+
+    # the last pause is shortened to the deadline
+    assert clock.sleeps == [4, 4, 2]
+    assert remainings == [10, 6, 2, 0]
+    assert issubclass(OperationTimeout, ActivityFailed)
+
+
+def test_waiter_emits_stats(clock):
+    stats = []
+    add_listener(stats.append)
+    try:
+        results = iter([False, False, True])
+        Waiter(initial_delay=1, jitter=0).wait(
+            lambda remaining: (next(results), "ok"), name="op-1"
+        )
+    finally:
+        remove_listener(stats.append)
+
+    assert len(stats) == 1
+    assert stats[0].name == "op-1"
+    assert stats[0].polls == 3
+    assert stats[0].done is True
+    assert stats[0].elapsed == 2.5
+
+
+def test_wait_on_operation_can_long_poll(clock):
+    ops_svc = MagicMock()
+    ops_svc.wait.return_value.execute.side_effect = [
+        {"status": "RUNNING"},
+        {"status": "DONE"},
+    ]
+
+    response = wait_on_operation(
+        ops_svc, long_poll=True, project="p", zone="z", operation="op"
+    )
+
+    assert response["status"] == "DONE"
+    ops_svc.wait.assert_called_with(project="p", zone="z", operation="op")
+    ops_svc.get.assert_not_called()
+
+
+def test_wait_on_extended_operation_uses_wait_endpoint(clock):
+    ops_client = MagicMock(spec=compute_v1.ZoneOperationsClient)
+    ops_client.wait.return_value = compute_v1.Operation(
+        name="op", status=compute_v1.Operation.Status.DONE
+    )
+    request = compute_v1.GetZoneOperationRequest(
+        project="p", zone="z", operation="op"
+    )
+
+    # the bound `get` method exposes its client, as real clients do
+    get = MagicMock(__self__=ops_client)
+    operation = ComputeOperation.make(
+        functools.partial(get, request),
+        MagicMock(),
+        compute_v1.Operation(
+            name="op", status=compute_v1.Operation.Status.RUNNING
+        ),
+    )
+
+    wait_on_extended_operation(operation, long_poll=True)
+
+    get.assert_not_called()
+    wait_request = ops_client.wait.call_args.kwargs["request"]
+    assert isinstance(wait_request, compute_v1.WaitZoneOperationRequest)
+    assert wait_request.operation == "op"
+    assert operation.done()
+
+
+def test_wait_on_extended_operation_cancels_on_timeout(clock):
+    operation = MagicMock()
+    operation.done.return_value = False
+
+    wait_on_extended_operation(operation, timeout=5)
+
+    operation.cancel.assert_called_once()
+
+
+def test_gke_wait_on_operation_times_out(clock):
+    client = MagicMock()
+    client.get_operation.return_value = container_v1.Operation(
+        status=container_v1.Operation.Status.RUNNING
+    )
+    ctx = MagicMock()
+
+    with pytest.raises(ActivityFailed):
+        wait_on_gke_operation(client, MagicMock(), ctx, timeout=3)
+
+    client.get_operation.return_value = container_v1.Operation(
+        status=container_v1.Operation.Status.DONE
+    )
+    response = wait_on_gke_operation(client, MagicMock(), ctx, timeout=3)
+    assert response.status == container_v1.Operation.Status.DONE
+
+
+def test_tracker_waits_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def poller(value):
+        def poll(remaining):
+            # all three operations must be polled at the same time
+            barrier.wait()
+            return True, value
+
+        return poll
+
+    with OperationTracker(max_workers=3) as tracker:
+        for value in ("a", "b", "c"):
+            tracker.add(value, poller(value))
+        results = tracker.wait()
+
+    assert [r.result for r in results] == ["a", "b", "c"]
+    assert all(r.ok for r in results)
+
+
+def test_tracker_reports_failures_without_stopping_others(clock):
+    ops_svc = MagicMock()
+    ops_svc.get.return_value.execute.return_value = {
+        "name": "op",
+        "status": "DONE",
+        "error": {"errors": [{"code": "INTERNAL"}]},
+    }
+
+    with OperationTracker(max_workers=2) as tracker:
+        tracker.add_discovery_operation(ops_svc, project="p", operation="op")
+        tracker.add("ok", lambda remaining: (True, 42))
+        results = tracker.wait()
+
+    assert results[0].name == "op"
+    assert isinstance(results[0].error, ActivityFailed)
+    assert results[1].result == 42
+    assert results[1].to_dict() == {"name": "ok", "ok": True, "error": None}
+
+
+def test_tracker_reports_timeouts(clock):
+    waiter = Waiter(initial_delay=1, jitter=0, deadline=2)
+
+    with OperationTracker(waiter=waiter) as tracker:
+        tracker.add("slow", lambda remaining: (False, None))
+        results = tracker.wait()
+
+    assert isinstance(results[0].error, OperationTimeout)
+
+
+def test_long_poll_falls_back_to_polling_without_api_core_internals(clock):
+    # an operation without the private attributes long polling relies on
+    operation = MagicMock(spec=["name", "done", "cancel", "_refresh"])
+    operation._refresh = functools.partial(
+        MagicMock(__self__=MagicMock(spec=compute_v1.ZoneOperationsClient)),
+        compute_v1.GetZoneOperationRequest(operation="op"),
+    )
+    operation.done.side_effect = [False, True]
+
+    wait_on_extended_operation(operation, long_poll=True)
+
+    assert operation.done.call_count == 2
+    operation.cancel.assert_not_called()
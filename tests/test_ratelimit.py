@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.api_core.exceptions import NotFound, ResourceExhausted
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import compute_v1
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+from chaosgcp import clients, ratelimit
+from chaosgcp.ratelimit import TokenBucket, api_name, call_with_quota_retry
+
+
+@pytest.fixture(autouse=True)
+def clock():
+    """
+    Sleeping moves a fake monotonic clock forward instead of waiting
+    """
+    now = [10.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    ratelimit.reset()
+    with patch("chaosgcp.ratelimit.time.monotonic", lambda: now[0]):
+        with patch("chaosgcp.ratelimit.time.sleep", side_effect=sleep) as s:
+            yield s
+    ratelimit.reset()
+
+
+def test_bucket_waits_once_its_burst_is_spent(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+
+    clock.assert_called_once_with(0.5)
+    assert bucket.stats()["throttled"] == 1
+
+
+def test_unlimited_bucket_is_paused_after_quota_error(clock):
+    bucket = TokenBucket()
+    assert bucket.acquire() == 0
+
+    bucket.penalize(3)
+    assert bucket.acquire() == 3
+    assert bucket.stats()["quota_errors"] == 1
+
+
+def test_quota_errors_are_retried():
+    func = MagicMock(side_effect=[ResourceExhausted("quota"), "done"])
+
+    assert call_with_quota_retry("compute", func, 1, key="v") == "done"
+    assert func.call_count == 2
+    assert ratelimit.stats()["compute"]["quota_errors"] == 1
+
+
+def test_quota_retries_are_bounded():
+    ratelimit.configure({"gcp_quota_retries": 2})
+    func = MagicMock(side_effect=ResourceExhausted("quota"))
+
+    with pytest.raises(ResourceExhausted):
+        call_with_quota_retry("compute", func)
+    assert func.call_count == 3
+
+
+def test_other_errors_are_not_retried():
+    func = MagicMock(side_effect=NotFound("nope"))
+
+    with pytest.raises(NotFound):
+        call_with_quota_retry("compute", func)
+    func.assert_called_once()
+
+
+def test_configure_sets_rate_limits():
+    ratelimit.configure(
+        {
+            "gcp_rate_limits": {
+                "compute": 20,
+                "monitoring": {"rate": 5, "burst": 10},
+            }
+        }
+    )
+
+    s = ratelimit.stats()
+    assert (s["compute"]["rate"], s["compute"]["burst"]) == (20.0, 20)
+    assert (s["monitoring"]["rate"], s["monitoring"]["burst"]) == (5.0, 10)
+
+
+def test_api_name():
+    assert api_name("compute.googleapis.com") == "compute"
+    assert api_name("https://sqladmin.googleapis.com/sql/v1/") == "sqladmin"
+
+
+def test_registry_clients_are_throttled():
+    c = clients.get(compute_v1.UrlMapsClient, AnonymousCredentials())
+
+    methods = c._transport._wrapped_methods
+    assert methods
+    assert all(m._chaosgcp_throttled for m in methods.values())
+
+
+def test_discovery_calls_are_retried_on_429():
+    payload = json.dumps({"name": "zone"}).encode("utf-8")
+    http = HttpMockSequence(
+        [
+            ({"status": "429"}, b""),
+            ({"status": "200"}, payload),
+        ]
+    )
+    service = build(
+        "dns",
+        "v1",
+        http=http,
+        static_discovery=True,
+        requestBuilder=ratelimit.request_class(),
+    )
+
+    request = service.managedZones().get(project="p", managedZone="zone")
+    assert request.execute() == {"name": "zone"}
+    assert ratelimit.stats()["dns"]["quota_errors"] == 1
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import MagicMock
+
+import httplib2
+import pytest
+from fakes import FakeGCP
+from google.cloud import container_v1
+
+from chaosgcp import clients, replay
+from chaosgcp.cloudrun.actions import delete_service
+from chaosgcp.gke.nodepool import wait_on_operation
+from chaosgcp.lb import get_url_map, list_url_maps
+from chaosgcp.monitoring.probes import get_slo_health
+from chaosgcp.replay import RECORD, REPLAY, CassetteMiss
+from chaosgcp.types import GCPContext
+
+PROJECT = "my-project"
+LOCATION = f"projects/{PROJECT}/locations/us-central1"
+SLO = f"projects/{PROJECT}/services/my-svc/serviceLevelObjectives/my-slo"
+NODE_POOL = f"{LOCATION}/clusters/my-cluster/nodePools/my-pool"
+CONFIGURATION = {"gcp_project_id": PROJECT, "gcp_region": "us-central1"}
+
+
+@pytest.fixture
+def gcp():
+    fake = FakeGCP(page_size=2)
+    fake.add_url_map(PROJECT, "map-1", defaultService="backend-1")
+    fake.add_url_map(PROJECT, "map-2")
+    fake.add_url_map(PROJECT, "map-3")
+    fake.add_service(f"{LOCATION}/services/my-svc", uri="https://my-svc")
+    fake.add_node_pool(NODE_POOL)
+    fake.add_slo(SLO)
+    for values in ([0.99, 0.98], [0.5], [0.97, 0.91], [0.95]):
+        fake.add_time_series(PROJECT, values)
+    fake.start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture(autouse=True)
+def stop_replay():
+    yield
+    replay.stop()
+
+
+def run_activities():
+    client = clients.get(container_v1.ClusterManagerClient)
+    op = client.set_node_pool_size(
+        request=container_v1.SetNodePoolSizeRequest(
+            name=NODE_POOL, node_count=5
+        )
+    )
+    op = wait_on_operation(client, op, GCPContext(PROJECT, zone="us-central1"))
+
+    return {
+        "url_map": get_url_map(None, PROJECT, "map-1").default_service,
+        "url_maps": [m.name for m in list_url_maps(None, PROJECT)],
+        "health": get_slo_health(SLO, configuration=CONFIGURATION),
+        "deleted": delete_service(f"{LOCATION}/services/my-svc")["uri"],
+        "resize": op.status.name,
+    }
+
+
+def test_fakes_serve_activities_over_the_wire(gcp):
+    replay.start(endpoints=gcp.endpoints)
+
+    results = run_activities()
+
+    assert results["url_map"] == "backend-1"
+    assert results["url_maps"] == ["map-1", "map-2", "map-3"]
+    assert len(results["health"]) == 4
+    assert results["deleted"] == "https://my-svc"
+    assert results["resize"] == "DONE"
+    assert gcp.node_pools[NODE_POOL]["initialNodeCount"] == 5
+    # two pages of URL maps and time series, polled operations
+    assert gcp.calls.count("GET projects/my-project/global/urlMaps") == 2
+    assert gcp.calls.count(f"ListTimeSeries projects/{PROJECT}") == 2
+    assert f"GET {LOCATION}/operations/operation-2" in gcp.calls
+
+
+def test_recorded_calls_replay_without_network(gcp, tmp_path):
+    cassette_path = str(tmp_path / "cassette.json")
+
+    replay.start(RECORD, cassette_path, endpoints=gcp.endpoints)
+    recorded = run_activities()
+    replay.stop()
+    gcp.stop()
+
+    cassette = replay.start(REPLAY, cassette_path)
+    replayed = run_activities()
+
+    assert replayed == recorded
+    assert cassette.stats()["misses"] == 0
+
+
+def test_replay_raises_on_unrecorded_calls(tmp_path):
+    cassette_path = str(tmp_path / "cassette.json")
+    replay.Cassette().save(cassette_path)
+    replay.start(REPLAY, cassette_path)
+
+    with pytest.raises(CassetteMiss):
+        get_url_map(None, PROJECT, "map-1")
+
+
+def test_discovery_calls_are_recorded_and_replayed(tmp_path):
+    cassette_path = str(tmp_path / "cassette.json")
+    uri = "https://sqladmin.googleapis.com/v1/projects/p/instances?b=2&a=1"
+    http = MagicMock()
+    http.request.return_value = (
+        httplib2.Response({"status": "200"}),
+        b'{"items": []}',
+    )
+
+    replay.start(RECORD, cassette_path)
+    replay.wrap_http(http).request(uri)
+    replay.stop()
+
+    replay.start(REPLAY, cassette_path)
+    response, content = replay.wrap_http(None).request(
+        "https://sqladmin.googleapis.com/v1/projects/p/instances?a=1&b=2"
+    )
+
+    assert response.status == 200
+    assert content == b'{"items": []}'
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from google.cloud import compute_v1, container_v1, monitoring_v3, run_v2
+from google.cloud.logging_v2.types import LogEntry
+from google.protobuf import any_pb2, struct_pb2, timestamp_pb2
+
+from chaosgcp.serializer import compile_fields, to_dict, to_dicts
+
+
+def time_series():
+    return monitoring_v3.TimeSeries(
+        metric={"type": "custom.googleapis.com/x", "labels": {"a": "b"}},
+        resource={"type": "gce_instance", "labels": {"zone": "z"}},
+        points=[
+            monitoring_v3.Point(
+                interval={
+                    "end_time": {"seconds": 1714560000 + i, "nanos": i * 1000}
+                },
+                value={"double_value": i * 1.5},
+            )
+            for i in range(10)
+        ]
+        + [monitoring_v3.Point(value={"double_value": float("nan")})]
+        + [monitoring_v3.Point(value={"int64_value": 2**40})],
+    )
+
+
+def log_entry():
+    payload = struct_pb2.Struct()
+    payload.update({"a": 1, "b": [1, "x", None], "c": {"d": True}})
+    return LogEntry(
+        log_name="projects/p/logs/l",
+        json_payload=payload,
+        timestamp=timestamp_pb2.Timestamp(seconds=-10, nanos=1),
+        labels={"k": "v"},
+        severity=400,
+    )
+
+
+def proto_log_entry():
+    payload = any_pb2.Any()
+    payload.Pack(timestamp_pb2.Timestamp(seconds=5))
+    return LogEntry(log_name="projects/p/logs/l", proto_payload=payload)
+
+
+def url_map():
+    return compute_v1.UrlMap(
+        name="m",
+        id=123,
+        default_service="svc",
+        host_rules=[compute_v1.HostRule(hosts=["a", "b"], path_matcher="pm")],
+        path_matchers=[
+            compute_v1.PathMatcher(
+                name="pm",
+                path_rules=[
+                    compute_v1.PathRule(
+                        paths=["/p"],
+                        service="s",
+                        route_action=compute_v1.HttpRouteAction(
+                            fault_injection_policy=compute_v1.HttpFaultInjection(
+                                abort=compute_v1.HttpFaultAbort(
+                                    http_status=503, percentage=12.5
+                                )
+                            )
+                        ),
+                    )
+                ],
+            )
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        time_series(),
+        monitoring_v3.TimeSeries(),
+        log_entry(),
+        proto_log_entry(),
+        url_map(),
+        container_v1.Operation(name="o", status=2, error={"code": 3}),
+        container_v1.NodePool(
+            name="n", config={"labels": {"x": "y"}, "oauth_scopes": ["s"]}
+        ),
+        run_v2.Service(
+            name="s",
+            labels={"a": "b"},
+            traffic=[run_v2.TrafficTarget(percent=100, type_=1)],
+            create_time=timestamp_pb2.Timestamp(seconds=1),
+        ),
+    ],
+)
+def test_output_matches_proto_plus(message):
+    expected = type(message).to_dict(message)
+    assert json.dumps(to_dict(message), sort_keys=True) == json.dumps(
+        expected, sort_keys=True
+    )
+
+
+def test_projection():
+    ts = time_series()
+
+    d = to_dict(ts, fields=["metric.type", "points.value"])
+
+    assert d["metric"] == {"type": "custom.googleapis.com/x"}
+    assert d["points"][0] == {"value": {"double_value": 0.0}}
+    assert "resource" not in d
+    assert to_dict(ts, fields="metric.type,points.value") == d
+
+
+def test_compile_fields_keeps_whole_fields():
+    assert compile_fields(["metric", "metric.type", "points.value"]) == {
+        "metric": None,
+        "points": {"value": None},
+    }
+
+
+def test_omit_defaults():
+    ts = monitoring_v3.TimeSeries(metric={"type": "x"})
+
+    assert to_dict(ts, omit_defaults=True) == {"metric": {"type": "x"}}
+    assert to_dict(ts)["points"] == []
+
+
+def test_non_protobuf_objects_use_their_own_to_dict():
+    response = MagicMock()
+    response.__class__.to_dict = MagicMock(return_value={"a": 1})
+
+    assert to_dicts([response]) == [{"a": 1}]
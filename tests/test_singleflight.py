@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import fixtures
+import pytest
+from google.cloud import monitoring_v3
+
+from chaosgcp.monitoring.probes import run_mql_query
+from chaosgcp.singleflight import Group, request_key
+
+
+def run_concurrently(group, key, fn, count=3):
+    """
+    Start `count` calls for `key`, the first one only completing once the
+    others joined it
+    """
+    release = threading.Event()
+
+    def leader():
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(group.do, key, leader)]
+        while not group.stats()["in_flight"]:
+            pass
+        futures += [
+            executor.submit(group.do, key, fn) for _ in range(count - 1)
+        ]
+        while group.stats()["coalesced"] < count - 1:
+            pass
+        release.set()
+        return [f.result() for f in futures]
+
+
+def test_concurrent_calls_share_one_call():
+    group = Group()
+    fn = MagicMock(return_value={"name": "my-slo"})
+
+    results = run_concurrently(group, "k", fn)
+
+    fn.assert_called_once()
+    assert results == [{"name": "my-slo"}] * 3
+    assert len({id(r) for r in results}) == 3
+    assert group.stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_concurrent_calls_share_the_error():
+    group = Group()
+    fn = MagicMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError):
+        run_concurrently(group, "k", fn)
+    fn.assert_called_once()
+
+
+def test_sequential_calls_are_not_coalesced():
+    group = Group()
+    fn = MagicMock(return_value=1)
+
+    group.do("k", fn)
+    group.do("k", fn)
+
+    assert fn.call_count == 2
+
+
+def test_request_key_identifies_request():
+    r1 = monitoring_v3.GetServiceLevelObjectiveRequest(name="a")
+    r2 = monitoring_v3.GetServiceLevelObjectiveRequest(name="a")
+    r3 = monitoring_v3.GetServiceLevelObjectiveRequest(name="b")
+
+    assert request_key("get", r1) == request_key("get", r2)
+    assert request_key("get", r1) != request_key("get", r3)
+
+
+@patch("chaosgcp.monitoring.probes.singleflight.group", new_callable=Group)
+@patch("chaosgcp.monitoring.probes.monitoring_v3.QueryServiceClient")
+@patch("chaosgcp.Credentials", autospec=True)
+def test_concurrent_mql_queries_are_coalesced(Credentials, QueryClient, group):
+    Credentials.from_service_account_file.return_value = MagicMock(
+        expired=False, expiry=None
+    )
+    started = threading.Event()
+    release = threading.Event()
+
+    def query(request):
+        started.set()
+        release.wait(5)
+        return []
+
+    client = QueryClient.return_value
+    client.query_time_series.side_effect = query
+
+    def probe():
+        return run_mql_query(
+            "my-project",
+            "fetch gce_instance",
+            configuration=fixtures.configuration,
+            secrets=fixtures.secrets,
+        )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(probe)
+        started.wait(5)
+        second = executor.submit(probe)
+        while not group.stats()["coalesced"]:
+            pass
+        release.set()
+        assert first.result() == second.result() == []
+
+    client.query_time_series.assert_called_once()
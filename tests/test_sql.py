@@ -110,7 +110,11 @@ def test_trigger_failover(Credentials, service_builder, wait_on_operation):
     )
 
     wait_on_operation.assert_called_with(
-        ops_svc, project=project_id, operation="mysqlfailover", frequency=10
+        ops_svc,
+        project=project_id,
+        operation="mysqlfailover",
+        frequency=2,
+        max_frequency=10,
     )
 
 
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import socket
+from unittest.mock import ANY, MagicMock, patch
+
+import fixtures
+import pytest
+import requests
+import requests_mock
+from google.auth.credentials import AnonymousCredentials, Scoped
+from googleapiclient.discovery import build
+
+from chaosgcp import client, load_credentials
+from chaosgcp.discovery_cache import resource_cache
+from chaosgcp.transport import (
+    PooledHttp,
+    TransportSettings,
+    get_http,
+    get_transport_settings,
+    shutdown,
+)
+
+
+@pytest.fixture
+def http():
+    http = PooledHttp(AnonymousCredentials(), TransportSettings(pooled=True))
+    yield http
+    http.close()
+
+
+def test_transport_settings_from_configuration():
+    assert get_transport_settings(None) == TransportSettings()
+
+    settings = get_transport_settings(
+        {
+            "gcp_http_transport": "pooled",
+            "gcp_http_pool_size": "4",
+            "gcp_http_timeout": 5,
+            "gcp_http_keep_alive": "false",
+        }
+    )
+    assert settings == TransportSettings(
+        pooled=True, pool_size=4, timeout=5.0, keep_alive=False
+    )
+
+
+def test_pooled_http_responds_like_httplib2(http):
+    with requests_mock.Mocker(session=http.session) as m:
+        m.get(
+            "https://example.com/x",
+            status_code=404,
+            reason="Not Found",
+            headers={"Content-Type": "application/json"},
+            content=b"{}",
+        )
+        response, content = http.request("https://example.com/x")
+
+    assert response.status == 404
+    assert response.reason == "Not Found"
+    assert response["content-type"] == "application/json"
+    assert content == b"{}"
+
+
+def test_pooled_http_raises_builtin_network_errors(http):
+    with requests_mock.Mocker(session=http.session) as m:
+        m.get("https://example.com/slow", exc=requests.ReadTimeout)
+        m.get("https://example.com/down", exc=requests.ConnectionError)
+
+        with pytest.raises(socket.timeout):
+            http.request("https://example.com/slow")
+        with pytest.raises(ConnectionError):
+            http.request("https://example.com/down")
+
+
+def test_discovery_resource_runs_over_pooled_http(http):
+    service = build("dns", "v1", http=http, static_discovery=True)
+
+    with requests_mock.Mocker(session=http.session) as m:
+        m.get(
+            "https://dns.googleapis.com/dns/v1/projects/p/managedZones/z",
+            json={"name": "z"},
+        )
+        response = service.managedZones().get(project="p", managedZone="z")
+        assert response.execute() == {"name": "z"}
+
+
+@patch("chaosgcp.build", autospec=True)
+@patch("chaosgcp.Credentials", autospec=True)
+def test_client_shares_pooled_transport(Credentials, build):
+    credentials = MagicMock(expired=False, expiry=None)
+    Credentials.from_service_account_file.return_value = credentials
+    configuration = {"gcp_http_transport": "pooled"}
+    resource_cache.clear()
+
+    try:
+        with patch("chaosgcp.transport.PooledHttp", autospec=True) as Http:
+            client(
+                "sqladmin",
+                secrets=fixtures.secrets,
+                configuration=configuration,
+            )
+            client("dns", secrets=fixtures.secrets, configuration=configuration)
+
+        Http.assert_called_once()
+        http = Http.return_value
+        assert (
+            get_http(credentials, get_transport_settings(configuration)) is http
+        )
+        build.assert_called_with(
+            "dns",
+            version="v1",
+            http=http,
+            cache=ANY,
+            static_discovery=None,
+            requestBuilder=ANY,
+        )
+    finally:
+        shutdown()
+        resource_cache.clear()
+
+
+@patch("chaosgcp.Credentials", autospec=True)
+def test_pooled_transport_shares_the_cached_credentials(Credentials):
+    scoped = MagicMock(spec=Scoped, requires_scopes=False, expired=False)
+    scoped.expiry = None
+    unscoped = MagicMock(spec=Scoped, requires_scopes=True)
+    unscoped.with_scopes.return_value = scoped
+    Credentials.from_service_account_file.return_value = unscoped
+
+    credentials = load_credentials(fixtures.secrets)
+
+    try:
+        http = get_http(credentials, TransportSettings(pooled=True))
+        # the very object refreshed in the background by the cache
+        assert credentials is scoped
+        assert http.credentials is scoped
+    finally:
+        shutdown()